@@ -8,6 +8,7 @@ import sys
 import signal
 import time
 import argparse
+import threading
 from pathlib import Path
 
 # Add parent directory to path
@@ -23,6 +24,23 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
+def run_profile(orchestrator, seconds, rate, output):
+    """Profile the pipeline threads and write collapsed stacks to output"""
+    logger = get_logger()
+    if output is None:
+        output = Path(orchestrator.config.log_dir) / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.folded"
+    
+    try:
+        result = orchestrator.profile(seconds, rate)
+        Path(output).write_text(result['stacks'])
+        logger.info(
+            f"Profile written to {output} ({result['ticks']} ticks, "
+            f"{result['sample_cost_us']}us per sample)"
+        )
+    except Exception as e:
+        logger.error(f"Profiling failed: {e}")
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -58,6 +76,25 @@ def main():
         default=8080,
         help='API server port (default: 8080)'
     )
+    parser.add_argument(
+        '--profile',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Sample the processing and capture threads for SECONDS after start-up'
+    )
+    parser.add_argument(
+        '--profile-rate',
+        type=float,
+        default=None,
+        help='Profiler samples per second (default: profiler.rate_hz)'
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=str,
+        default=None,
+        help='Collapsed-stack output file (default: <log dir>/profile-<time>.folded)'
+    )
     
     args = parser.parse_args()
     
@@ -93,6 +130,15 @@ def main():
             api_server.start()
             logger.info(f"API available at http://localhost:{args.api_port}/api")
         
+        # Optional start-up profile, sampled from its own thread
+        if args.profile:
+            threading.Thread(
+                target=run_profile,
+                args=(orchestrator, args.profile, args.profile_rate, args.profile_output),
+                name="profiler",
+                daemon=True
+            ).start()
+        
         # Main status loop
         logger.info("System running. Press Ctrl+C to exit.")
         logger.info("-"*50)
@@ -132,6 +178,7 @@ def main():
         logger.info(f"  Uptime: {stats['detection']['uptime_seconds']:.1f}s")
         logger.info("="*50)
         logger.info("Shutdown complete")
+        logger.close()
     
     return 0
 
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Allocation regression check
+Runs frames through the real processing loop with a mocked camera and
+MediaPipe models, and fails when the steady state allocates per frame
+"""
+
+import gc
+import sys
+import argparse
+import tempfile
+import tracemalloc
+from array import array
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from visiondetect.core.config import get_config
+from visiondetect.core.orchestrator import SmartDormOrchestrator
+
+
+def landmark(x, y, z=0.0, visibility=0.99):
+    """One MediaPipe-like landmark"""
+    return SimpleNamespace(x=x, y=y, z=z, visibility=visibility)
+
+
+def pose_landmarks():
+    """33 visible pose landmarks of someone sitting mid-frame"""
+    points = [landmark(0.45 + 0.003 * i, 0.2 + 0.02 * i) for i in range(33)]
+    points[11] = landmark(0.38, 0.45)   # Left shoulder
+    points[12] = landmark(0.62, 0.45)   # Right shoulder
+    return SimpleNamespace(landmark=points)
+
+
+def victory_hand():
+    """21 hand landmarks showing a V sign"""
+    points = [landmark(0.5, 0.8)] * 21
+    for finger, (dx, bent) in enumerate([(-0.08, True), (-0.03, False), (0.03, False), (0.06, True), (0.09, True)]):
+        base = 1 + finger * 4
+        for joint in range(4):
+            if bent:
+                x, y = 0.5 + dx, 0.7 + 0.03 * (joint % 2)
+            else:
+                x, y = 0.5 + dx * (1 + joint), 0.7 - 0.06 * joint
+            points[base + joint] = landmark(x, y, -0.01 * joint)
+    return SimpleNamespace(landmark=points)
+
+
+class FakeModel:
+    """MediaPipe solution stand-in returning fixed results"""
+
+    def __init__(self, **results):
+        self.results = SimpleNamespace(**results)
+        self.masks = {}
+
+    def process(self, image):
+        # The real binding copies any non-contiguous input before inference
+        np.ascontiguousarray(image)
+        if hasattr(self.results, 'segmentation_mask'):
+            mask = self.masks.get(image.shape[:2])
+            if mask is None:
+                mask = self.masks[image.shape[:2]] = np.full(image.shape[:2], 0.8, dtype=np.float32)
+            self.results.segmentation_mask = mask
+        return self.results
+
+    def close(self):
+        pass
+
+
+class FrameMeter:
+    """Stands in for the watchdog heartbeat at the top of every loop iteration"""
+
+    def __init__(self, orchestrator, frames, warmup, width, height):
+        self.orchestrator = orchestrator
+        self.camera = orchestrator.camera
+        self.warmup = warmup
+        self.frames = frames
+        self.index = 0
+
+        # Read-only like the frames the capture thread publishes
+        self.images = []
+        for seed in range(3):
+            image = np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+            image.flags.writeable = False
+            self.images.append(image)
+
+        # Preallocated so measuring does not allocate
+        self.blocks = array('q', bytes(8 * (frames + 1)))
+        self.peaks = array('q', bytes(8 * frames))
+        self.traced = 0
+
+    def beat(self, name):
+        index = self.index
+        self.index += 1
+        if index > 2 * (self.warmup + self.frames):
+            self.orchestrator.stop_event.set()
+            return
+
+        # Pass 1: net block growth, untraced
+        blocks_start = self.warmup
+        if blocks_start <= index <= blocks_start + self.frames:
+            self.blocks[index - blocks_start] = sys.getallocatedblocks()
+
+        # Pass 2: per-frame transient peak, traced
+        trace_start = blocks_start + self.frames + self.warmup
+        if index == blocks_start + self.frames:
+            tracemalloc.start()
+        elif trace_start < index <= trace_start + self.frames:
+            self.peaks[index - trace_start - 1] = tracemalloc.get_traced_memory()[1] - self.traced
+        if trace_start <= index < trace_start + self.frames:
+            tracemalloc.reset_peak()
+            self.traced = tracemalloc.get_traced_memory()[0]
+        elif index == trace_start + self.frames:
+            tracemalloc.stop()
+
+        # New frame from the "capture thread"
+        self.camera.frame = self.images[index % len(self.images)]
+        self.camera.frame_seq += 1
+
+
+def build(log_dir):
+    """Orchestrator with mocked camera and models, steady-state settings"""
+    config = get_config()
+    config.set('system.log_dir', log_dir)
+    config.set('system.log_level', 'WARNING')
+    config.set('gpio.backend', 'simulated')
+    config.set('history.enabled', False)
+    config.set('memory.enabled', False)
+    config.set('idle.enabled', False)
+    config.set('features.enable_wol', False)
+    config.set('occupancy.path', str(Path(log_dir) / 'occupancy.json'))
+    # The loop's periodic FPS log line is not per-frame work
+    config.set('performance.fps_report_interval', 1e9)
+
+    orchestrator = SmartDormOrchestrator()
+    orchestrator.light_zones.initialize()
+
+    orchestrator.pose_detector.mp_pose = FakeModel(pose_landmarks=pose_landmarks(), segmentation_mask=None)
+    orchestrator.pose_detector._initialized = True
+    orchestrator.hand_detector.mp_hands = FakeModel(multi_hand_landmarks=[victory_hand()])
+    orchestrator.hand_detector._initialized = True
+    return orchestrator
+
+
+def main():
+    """Run check"""
+    parser = argparse.ArgumentParser(description="Check steady-state allocations of the processing loop")
+    parser.add_argument('--frames', type=int, default=2000, help='Measured frames per pass (default: 2000)')
+    parser.add_argument('--warmup', type=int, default=200, help='Frames before each pass (default: 200)')
+    # Counters passing 256 leave Python's small-int cache, a few blocks per
+    # histogram bucket until they all have; anything retained per frame is >= 1
+    parser.add_argument('--max-blocks', type=float, default=0.25,
+                        help='Allowed net new memory blocks per frame (default: 0.25)')
+    parser.add_argument('--max-peak-kb', type=float, default=16.0,
+                        help='Allowed transient allocation peak per frame in KiB (default: 16)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        orchestrator = build(log_dir)
+        width = orchestrator.config.camera_width
+        height = orchestrator.config.camera_height
+        meter = FrameMeter(orchestrator, args.frames, args.warmup, width, height)
+        orchestrator.watchdog.beat = meter.beat
+
+        gc.collect()
+        gc.disable()
+        try:
+            orchestrator.running = True
+            orchestrator._processing_loop(orchestrator._processing_generation)
+        finally:
+            gc.enable()
+            orchestrator.running = False
+            orchestrator.light_zones.cleanup()
+
+    blocks_per_frame = (meter.blocks[-1] - meter.blocks[0]) / args.frames
+    peaks = sorted(meter.peaks)
+    peak_kb = peaks[-1] / 1024
+    errors = orchestrator.stats.get_summary()['detection']['errors']
+
+    print(f"Allocation check: {args.frames} frames at {width}x{height}")
+    print("="*50)
+    print(f"  net blocks per frame     {blocks_per_frame:8.3f}   (limit {args.max_blocks:g})")
+    print(f"  transient peak median    {peaks[len(peaks) // 2] / 1024:8.1f} KiB")
+    print(f"  transient peak max       {peak_kb:8.1f} KiB (limit {args.max_peak_kb:g})")
+    print(f"  loop errors              {errors:8d}")
+    print("="*50)
+
+    failed = errors > 0 or blocks_per_frame > args.max_blocks or peak_kb > args.max_peak_kb
+    print("FAIL: steady-state allocations regressed" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+LED strip frame generation benchmark
+Measures vectorized effect rendering against the original per-pixel wheel()
+loop, using the mock pixel sink so no hardware is needed
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from visiondetect.core.config import get_config
+from visiondetect.capabilities.led_strip import LEDStripController, MockPixelSink
+
+
+def wheel(pos):
+    """Per-pixel colour wheel from other-work/WS2812.py"""
+    if pos < 0 or pos > 255:
+        r = g = b = 0
+    elif pos < 85:
+        r = int(pos * 3)
+        g = int(255 - pos * 3)
+        b = 0
+    elif pos < 170:
+        pos -= 85
+        r = int(255 - pos * 3)
+        g = 0
+        b = int(pos * 3)
+    else:
+        pos -= 170
+        r = 0
+        g = int(pos * 3)
+        b = int(255 - pos * 3)
+    return (r, g, b)
+
+
+def bench_loop(num_pixels, frames):
+    """Time the original nested-loop rainbow frame generation"""
+    pixels = [(0, 0, 0)] * num_pixels
+    start = time.perf_counter()
+    for j in range(frames):
+        for i in range(num_pixels):
+            pixels[i] = wheel(((i * 256 // num_pixels) + j) & 255)
+    return time.perf_counter() - start
+
+
+def bench_vectorized(controller, sink, effect, frames):
+    """Time vectorized rendering plus a push to the mock sink"""
+    controller.set_state({'effect': effect})
+    start = time.perf_counter()
+    for j in range(frames):
+        sink.show(controller.render(j / 256.0))
+    return time.perf_counter() - start
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark LED strip frame generation")
+    parser.add_argument('--pixels', type=int, default=60, help='Number of pixels (default: 60)')
+    parser.add_argument('--frames', type=int, default=2000, help='Frames per run (default: 2000)')
+    args = parser.parse_args()
+
+    config = get_config()
+    config.set('led_strip.num_pixels', args.pixels)
+    sink = MockPixelSink(args.pixels)
+    controller = LEDStripController(config, sink=sink)
+
+    print(f"LED strip benchmark: {args.pixels} pixels, {args.frames} frames")
+    print("="*50)
+
+    elapsed = bench_loop(args.pixels, args.frames)
+    print(f"  {'rainbow (per-pixel loop)':<26} {elapsed / args.frames * 1e6:9.1f} us/frame")
+
+    for effect in ('rainbow', 'breathe', 'solid'):
+        elapsed = bench_vectorized(controller, sink, effect, args.frames)
+        print(f"  {effect + ' (vectorized)':<26} {elapsed / args.frames * 1e6:9.1f} us/frame")
+
+    print("="*50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Statistics hot-path benchmark
+Measures the per-frame cost of the statistics and span calls made by the
+processing loop, alone and while API threads keep polling summaries
+"""
+
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from visiondetect.utils.statistics import StatisticsManager
+from visiondetect.utils.spans import SpanRecorder
+
+
+def frame_loop(stats, spans, frames):
+    """Run the processing loop's statistics calls, timing each frame"""
+    samples = []
+    for seq in range(1, frames + 1):
+        start = time.perf_counter()
+        stats.record_frame_delivered(seq)
+        spans.record('capture', 0.0004)
+        spans.record('pose', 0.021)
+        stats.increment_total_frames()
+        stats.record_person_detected(seq % 3 != 0)
+        spans.record('decide', 0.00002)
+        spans.record('light', 0.00005)
+        stats.record_frame_processed()
+        stats.performance.record_processing_time(0.025)
+        spans.record('frame', 0.025)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def poller(stats, spans, stop, interval, counter):
+    """Build API summaries until stopped, like /api/statistics and /api/spans"""
+    while not stop.is_set():
+        stats.get_summary()
+        spans.get_status()
+        counter[0] += 1
+        if interval:
+            stop.wait(interval)
+
+
+def run(frames, pollers, poll_hz):
+    """Measure one configuration, return per-frame samples and poll count"""
+    stats = StatisticsManager()
+    spans = SpanRecorder()
+    stop = threading.Event()
+    counter = [0]
+    interval = 1.0 / poll_hz if poll_hz else 0.0
+    threads = [
+        threading.Thread(target=poller, args=(stats, spans, stop, interval, counter), daemon=True)
+        for _ in range(pollers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    samples = frame_loop(stats, spans, frames)
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples, counter[0]
+
+
+def report(name, samples, polls):
+    """Print mean, median and p99 per-frame overhead"""
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    median = ordered[len(ordered) // 2]
+    p99 = ordered[int(len(ordered) * 0.99)]
+    print(f"  {name:<28} mean {mean * 1e6:7.2f}us   median {median * 1e6:7.2f}us   "
+          f"p99 {p99 * 1e6:8.2f}us   polls {polls}")
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark statistics overhead per frame")
+    parser.add_argument('--frames', type=int, default=50000, help='Frames per run (default: 50000)')
+    parser.add_argument('--pollers', type=int, default=2, help='API polling threads (default: 2)')
+    parser.add_argument('--poll-hz', type=float, default=20.0,
+                        help='Polls per second per thread, 0 for a tight loop (default: 20)')
+    args = parser.parse_args()
+
+    # Short switch interval so pollers really interleave with the loop
+    sys.setswitchinterval(0.0005)
+
+    print(f"Statistics hot-path benchmark: {args.frames} frames per run")
+    print("="*50)
+    report('no API polling', *run(args.frames, 0, args.poll_hz))
+    report(f'{args.pollers} pollers @ {args.poll_hz:g} Hz', *run(args.frames, args.pollers, args.poll_hz))
+    report(f'{args.pollers} pollers, tight loop', *run(args.frames, args.pollers, 0))
+    print("="*50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
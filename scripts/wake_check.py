@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Wake confirmation check
+Runs probe_tcp and the confirmation loop against a local listener socket
+standing in for the woken machine, and fails when an outcome is wrong
+"""
+
+import sys
+import socket
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from visiondetect.core.config import get_config
+from visiondetect.capabilities.wake_confirm import WakeConfirmer, probe_tcp
+
+
+class FakeTarget:
+    """Local port that is closed while 'asleep' and listening once 'awake'"""
+
+    def __init__(self):
+        # Reserve a free port, then close it so connections are refused
+        with socket.socket() as probe:
+            probe.bind(('127.0.0.1', 0))
+            self.port = probe.getsockname()[1]
+        self.listener = None
+
+    def wake(self):
+        """Start accepting connections on the port"""
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(('127.0.0.1', self.port))
+        listener.listen(8)
+        self.listener = listener
+
+    def close(self):
+        """Stop listening"""
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+
+
+class StatsRecorder:
+    """Stands in for StatisticsManager.record_wake_confirmation"""
+
+    def __init__(self):
+        self.outcomes = []
+
+    def record_wake_confirmation(self, target, awake):
+        self.outcomes.append((target, awake))
+
+
+def check(results, name, ok, detail=''):
+    """Record and print one check"""
+    results.append(ok)
+    print(f"  {'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+
+
+def check_probe(results):
+    """probe_tcp against a closed and a listening port"""
+    target = FakeTarget()
+    try:
+        check(results, "closed port, refused counts as asleep",
+              not probe_tcp('127.0.0.1', target.port, 0.5, accept_refused=False))
+        check(results, "closed port, refused counts as awake",
+              probe_tcp('127.0.0.1', target.port, 0.5, accept_refused=True))
+        target.wake()
+        check(results, "listening port", probe_tcp('127.0.0.1', target.port, 0.5, accept_refused=False))
+    finally:
+        target.close()
+
+
+def confirmer(deadline):
+    """WakeConfirmer with short timings probing localhost"""
+    config = get_config()
+    config.set('wol.confirm.enabled', True)
+    config.set('wol.confirm.method', 'tcp')
+    config.set('wol.confirm.probe_interval', 0.05)
+    config.set('wol.confirm.probe_timeout', 0.2)
+    config.set('wol.confirm.initial_backoff', 0.1)
+    config.set('wol.confirm.max_backoff', 0.4)
+    config.set('wol.confirm.deadline', deadline)
+    # A closed local port refuses; only a listener counts as awake
+    config.set('wol.confirm.accept_refused', False)
+    stats = StatsRecorder()
+    return WakeConfirmer(config, stats), stats
+
+
+def check_wakes(results, wake_after):
+    """Target starts listening after a few re-sends"""
+    target = FakeTarget()
+    wake_confirmer, stats = confirmer(deadline=5.0)
+    resends = []
+
+    def resend():
+        resends.append(1)
+        if len(resends) == wake_after:
+            target.wake()
+        return True
+
+    try:
+        check(results, "confirmation started",
+              wake_confirmer.start('desk', '127.0.0.1', resend, port=target.port))
+        wake_confirmer.active['desk'].join(timeout=10.0)
+        status = wake_confirmer.get_status('desk')
+        check(results, "target confirmed awake", status['state'] == 'awake', status['state'])
+        check(results, "re-sent until it woke", status['resends'] == wake_after,
+              f"{status['resends']} re-sends")
+        check(results, "time-to-wake recorded", status['histogram']['samples'] == 1)
+        check(results, "statistics counted the wake", stats.outcomes == [('desk', True)])
+    finally:
+        wake_confirmer.stop()
+        target.close()
+
+
+def check_timeout(results):
+    """Target never answers before the deadline"""
+    target = FakeTarget()
+    wake_confirmer, stats = confirmer(deadline=0.5)
+    try:
+        wake_confirmer.start('nas', '127.0.0.1', lambda: True, port=target.port)
+        wake_confirmer.active['nas'].join(timeout=5.0)
+        status = wake_confirmer.get_status('nas')
+        check(results, "silent target times out", status['state'] == 'timeout', status['state'])
+        check(results, "statistics counted the timeout", stats.outcomes == [('nas', False)])
+    finally:
+        wake_confirmer.stop()
+        target.close()
+
+
+def main():
+    """Run check"""
+    parser = argparse.ArgumentParser(description="Check wake confirmation against a local listener")
+    parser.add_argument('--wake-after', type=int, default=2,
+                        help='Re-sends before the fake target starts listening (default: 2)')
+    args = parser.parse_args()
+
+    results = []
+    print("Wake confirmation check")
+    print("="*50)
+    check_probe(results)
+    check_wakes(results, max(1, args.wake_after))
+    check_timeout(results)
+    print("="*50)
+
+    failed = not all(results)
+    print("FAIL: wake confirmation misbehaved" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
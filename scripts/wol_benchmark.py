@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Wake-on-LAN send benchmark
+Compares the native magic-packet sender against forking a WOL script,
+sending to a local UDP listener so no target machine is needed
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from visiondetect.capabilities.wol import MagicPacketSender, build_magic_packet
+
+
+def bench_native(mac, port, count):
+    """Time native UDP sends and check every packet arrives intact"""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', port))
+    receiver.settimeout(1.0)
+    expected = build_magic_packet(mac)
+
+    sender = MagicPacketSender(mac, broadcast='127.0.0.1', port=receiver.getsockname()[1], method='udp')
+    sender.open()
+
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        sender.send()
+        samples.append(time.perf_counter() - start)
+        if receiver.recv(256) != expected:
+            raise RuntimeError("Received packet does not match the magic packet")
+
+    sender.close()
+    receiver.close()
+    return samples
+
+
+def bench_script(script, count):
+    """Time forking the WOL script the way the old sender did"""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        os.system(script)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(name, samples):
+    """Print median and max of samples"""
+    ordered = sorted(samples)
+    median = ordered[len(ordered) // 2]
+    print(f"  {name:<24} median {median * 1000:8.3f}ms   max {ordered[-1] * 1000:8.3f}ms")
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark Wake-on-LAN send latency")
+    parser.add_argument('--mac', default='00:11:22:33:44:55', help='Target MAC address')
+    parser.add_argument('--count', type=int, default=200, help='Sends per method (default: 200)')
+    parser.add_argument('--port', type=int, default=0, help='Local listener port (default: any)')
+    parser.add_argument('--script', default='true',
+                        help='Command standing in for WOL.sh (default: true)')
+    args = parser.parse_args()
+
+    print(f"WOL send benchmark: {args.count} sends per method")
+    print("="*50)
+    report('native UDP', bench_native(args.mac, args.port, args.count))
+    report(f'script ({args.script})', bench_script(args.script, args.count))
+    print("="*50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
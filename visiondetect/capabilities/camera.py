@@ -3,7 +3,7 @@ Camera capture capability
 Handles video capture and frame management
 """
 
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 import cv2
 import numpy as np
 import time
@@ -33,6 +33,18 @@ class CameraCapture(Capability):
         self.capture_thread = None
         self.running = False
         self._initialized = False
+        
+        # Increases with every captured frame; the watchdog uses it to spot stalls
+        self.frame_seq = 0
+        self.read_failures = 0
+        self._generation = 0
+        # Generation of the capture thread still inside its read loop, if any;
+        # that thread owns self.cap until it leaves the loop
+        self._capture_generation = None
+        
+        # Seconds between published frames; raised while the system is idle
+        self.capture_interval = 0.0
+        self._probing = False
     
     def initialize(self) -> bool:
         """Initialize camera"""
@@ -45,7 +57,9 @@ class CameraCapture(Capability):
             self.cap = cv2.VideoCapture(device_id)
             
             if not self.cap.isOpened():
-                self.logger.error(f"Failed to open camera {device_id}")
+                # A missing camera fails every idle probe; keep those quiet
+                log = self.logger.debug if self._probing else self.logger.error
+                log(f"Failed to open camera {device_id}")
                 return False
             
             # Set camera properties
@@ -58,26 +72,27 @@ class CameraCapture(Capability):
             actual_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             actual_fps = int(self.cap.get(cv2.CAP_PROP_FPS))
             
-            self.logger.info(
-                f"Camera initialized: {actual_width}x{actual_height} @ {actual_fps}fps"
-            )
+            # Idle probes reopen the camera every few seconds; keep them quiet
+            log = self.logger.debug if self._probing else self.logger.info
+            log(f"Camera initialized: {actual_width}x{actual_height} @ {actual_fps}fps")
             
             self._initialized = True
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to initialize camera: {e}")
+            log = self.logger.debug if self._probing else self.logger.error
+            log(f"Failed to initialize camera: {e}")
             return False
     
     def cleanup(self):
         """Clean up camera resources"""
         self.stop_capture()
+        self._release_cap()
         
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        # Don't hand out a frame from before the release once capture restarts
+        with self.frame_lock:
+            self.frame = None
         
-        self._initialized = False
         self.logger.info("Camera cleaned up")
     
     def is_ready(self) -> bool:
@@ -95,7 +110,13 @@ class CameraCapture(Capability):
             return
         
         self.running = True
-        self.capture_thread = Thread(target=self._capture_loop, daemon=True)
+        self._capture_generation = self._generation
+        self.capture_thread = Thread(
+            target=self._capture_loop,
+            args=(self.cap, self._generation),
+            name="capture",
+            daemon=True
+        )
         self.capture_thread.start()
         self.logger.info("Camera capture started")
     
@@ -107,22 +128,117 @@ class CameraCapture(Capability):
                 self.capture_thread.join(timeout=2.0)
             self.logger.info("Camera capture stopped")
     
-    def _capture_loop(self):
+    def reopen(self) -> bool:
+        """
+        Release and reopen the camera in place, restarting capture if it was running
+        
+        A capture thread stuck inside cap.read() is abandoned rather than joined;
+        it releases the old handle itself once it notices the generation changed.
+        
+        Returns:
+            True if the camera was reopened
+        """
+        self.logger.warning("Reopening camera")
+        was_running = self.running
+        
+        self.running = False
+        self._release_cap()
+        
+        if not self.initialize():
+            return False
+        
+        if was_running:
+            self.start_capture()
+        return True
+    
+    def _release_cap(self):
+        """
+        Detach self.cap and release it, unless a capture thread is still using it
+        
+        VideoCapture is not safe to release while another thread is inside
+        read(); a capture thread still in its loop sees the generation change
+        and releases the handle on its own thread instead.
+        """
+        with self.frame_lock:
+            self._generation += 1
+            cap, self.cap = self.cap, None
+            in_use = self._capture_generation is not None
+        self._initialized = False
+        
+        if cap is not None and not in_use:
+            try:
+                cap.release()
+            except Exception as e:
+                self.logger.error(f"Error releasing camera: {e}")
+    
+    def _capture_loop(self, cap, generation: int):
         """Background thread for continuous frame capture"""
+        try:
+            self._read_frames(cap, generation)
+        finally:
+            with self.frame_lock:
+                if self._capture_generation == generation:
+                    self._capture_generation = None
+                orphaned = generation != self._generation
+            
+            # Handed over by _release_cap() while this thread was still reading
+            if orphaned:
+                try:
+                    cap.release()
+                except Exception as e:
+                    self.logger.error(f"Error releasing camera: {e}")
+    
+    def _read_frames(self, cap, generation: int):
+        """Read frames until capture stops or the camera is reopened"""
         frame_count = 0
         last_fps_time = time.time()
+        applied_interval = 0.0
+        next_retrieve = 0.0
         
-        while self.running and self.cap.isOpened():
-            ret, frame = self.cap.read()
+        while self.running and generation == self._generation and cap.isOpened():
+            interval = self.capture_interval
+            if interval != applied_interval:
+                # Changed on this thread, never while another call is using cap
+                self._apply_rate(cap, interval)
+                applied_interval = interval
+            
+            if interval > 0:
+                # Throttled: grab() keeps the driver's buffer drained without
+                # decoding, so the frame retrieved once per interval is current
+                ret = cap.grab()
+                if ret:
+                    now = time.monotonic()
+                    if now < next_retrieve:
+                        continue
+                    next_retrieve = now + interval
+                    ret, frame = cap.retrieve()
+            else:
+                ret, frame = cap.read()
             
             if not ret:
-                self.logger.warning("Failed to read frame")
+                # Warn on the first failure of a streak, then only occasionally;
+                # the watchdog reopens the camera if frames stop for too long
+                self.read_failures += 1
+                if self.read_failures == 1 or self.read_failures % 50 == 0:
+                    self.logger.warning(
+                        f"Failed to read frame ({self.read_failures} consecutive)"
+                    )
                 time.sleep(0.1)
                 continue
             
+            if generation != self._generation:
+                break
+            
+            self.read_failures = 0
+            
+            # cap.read() returns a new array per frame, so consumers can share
+            # it without copying as long as nobody writes into it
+            frame.flags.writeable = False
+            
             # Update frame with thread safety
             with self.frame_lock:
                 self.frame = frame
+                self.frame_seq += 1
             
             # FPS monitoring
             frame_count += 1
@@ -130,10 +246,78 @@ class CameraCapture(Capability):
             
             if current_time - last_fps_time >= 5.0:
                 fps = frame_count / (current_time - last_fps_time)
-                self.logger.debug(f"Camera capture FPS: {fps:.1f}")
+                self.logger.debug("Camera capture FPS: %.1f", fps)
                 frame_count = 0
                 last_fps_time = current_time
     
+    def _apply_rate(self, cap, interval: float):
+        """Ask the driver for the frame rate matching a capture interval"""
+        fps = 1.0 / interval if interval > 0 else self.config.get('camera.fps', 30)
+        try:
+            cap.set(cv2.CAP_PROP_FPS, fps)
+            self.logger.debug(
+                "Camera rate requested %.1ffps, driver reports %.1ffps",
+                fps, cap.get(cv2.CAP_PROP_FPS)
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to change camera rate: {e}")
+    
+    def set_capture_interval(self, interval: float):
+        """
+        Throttle the capture thread
+        
+        The capture thread requests the matching frame rate from the driver,
+        which may settle on its nearest supported rate or ignore it; frames
+        in between are grabbed and discarded without decoding.
+        
+        Args:
+            interval: Seconds between published frames (0 for full camera rate)
+        """
+        self.capture_interval = max(0.0, interval)
+    
+    def probe_frame(self, warmup_frames: int = 3) -> Optional[np.ndarray]:
+        """
+        Open the camera, read one settled frame and release it again
+        
+        Used while idle with the camera released; the first frames after
+        opening are discarded while auto-exposure settles.
+        
+        Args:
+            warmup_frames: Number of frames to read, the last good one is kept
+            
+        Returns:
+            Frame or None if the camera could not be read
+        """
+        if self.running:
+            return None
+        
+        self._probing = True
+        try:
+            opened = self.initialize()
+        finally:
+            self._probing = False
+        if not opened:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            return None
+        
+        frame = None
+        try:
+            for _ in range(max(1, warmup_frames)):
+                ret, candidate = self.cap.read()
+                if ret:
+                    frame = candidate
+            if frame is not None:
+                with self.frame_lock:
+                    self.frame_seq += 1
+        finally:
+            self.cap.release()
+            self.cap = None
+            self._initialized = False
+        
+        return frame
+    
     def get_frame(self) -> Optional[np.ndarray]:
         """
         Get latest frame
@@ -141,10 +325,20 @@ class CameraCapture(Capability):
         Returns:
             Latest frame or None if not available
         """
+        return self.get_frame_with_seq()[0]
+    
+    def get_frame_with_seq(self) -> Tuple[Optional[np.ndarray], int]:
+        """
+        Get latest frame together with its capture sequence number
+        
+        The frame is shared with the capture thread, not copied; it is
+        read-only, copy it before drawing on it.
+        
+        Returns:
+            Tuple of (frame or None, sequence number of that frame)
+        """
         with self.frame_lock:
-            if self.frame is not None:
-                return self.frame.copy()
-        return None
+            return self.frame, self.frame_seq
     
     def read_frame(self) -> Tuple[bool, Optional[np.ndarray]]:
         """
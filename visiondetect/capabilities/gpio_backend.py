@@ -0,0 +1,306 @@
+"""
+GPIO backend layer
+Pluggable pin output drivers: RPi.GPIO, libgpiod character device, and a
+simulator that records every pin write for tests and benchmarks
+"""
+
+import os
+import time
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+try:
+    import RPi.GPIO as GPIO
+    RPI_GPIO_AVAILABLE = True
+except (ImportError, RuntimeError):
+    RPI_GPIO_AVAILABLE = False
+
+try:
+    import gpiod
+    GPIOD_AVAILABLE = True
+except ImportError:
+    GPIOD_AVAILABLE = False
+
+
+class GPIOBackend(ABC):
+    """Output-only GPIO driver"""
+
+    name = 'base'
+    supports_pwm = False
+
+    @abstractmethod
+    def setup_output(self, pin: int, pwm_frequency: Optional[float] = None):
+        """
+        Configure pin as an output, driven low
+
+        Args:
+            pin: Pin number
+            pwm_frequency: Enable PWM at this frequency (Hz) if supported
+        """
+        pass
+
+    @abstractmethod
+    def write(self, pin: int, level: float):
+        """
+        Drive pin
+
+        Args:
+            pin: Pin number
+            level: 0 for low, 1 for high; values in between are a PWM duty
+                   cycle on backends that support it and high otherwise
+        """
+        pass
+
+    @abstractmethod
+    def release(self, pin: int):
+        """Release pin"""
+        pass
+
+
+class RPiGPIOBackend(GPIOBackend):
+    """Raspberry Pi GPIO through the RPi.GPIO library"""
+
+    name = 'rpi'
+    supports_pwm = True
+
+    def __init__(self, mode: str = 'BCM'):
+        """
+        Initialize RPi.GPIO backend
+
+        Args:
+            mode: Pin numbering, 'BCM' or 'BOARD'
+        """
+        GPIO.setwarnings(False)
+        GPIO.setmode(GPIO.BCM if mode.upper() == 'BCM' else GPIO.BOARD)
+        self.pwm: Dict[int, Any] = {}
+
+    def setup_output(self, pin: int, pwm_frequency: Optional[float] = None):
+        """Configure pin as a low output"""
+        GPIO.setup(pin, GPIO.OUT)
+        GPIO.output(pin, GPIO.LOW)
+        if pwm_frequency:
+            self.pwm[pin] = GPIO.PWM(pin, pwm_frequency)
+            self.pwm[pin].start(0)
+
+    def write(self, pin: int, level: float):
+        """Drive pin to level"""
+        pwm = self.pwm.get(pin)
+        if pwm is not None:
+            pwm.ChangeDutyCycle(min(max(level, 0.0), 1.0) * 100)
+        else:
+            GPIO.output(pin, GPIO.HIGH if level > 0 else GPIO.LOW)
+
+    def release(self, pin: int):
+        """Release pin"""
+        pwm = self.pwm.pop(pin, None)
+        if pwm is not None:
+            pwm.stop()
+        GPIO.cleanup(pin)
+
+
+class GpiodBackend(GPIOBackend):
+    """Linux GPIO character device (/dev/gpiochipN) through libgpiod"""
+
+    name = 'gpiod'
+
+    def __init__(self, chip: str = '/dev/gpiochip0', consumer: str = 'visiondetect'):
+        """
+        Initialize libgpiod backend
+
+        Args:
+            chip: GPIO chip device path
+            consumer: Consumer label shown by gpioinfo
+        """
+        self.chip_path = chip
+        self.consumer = consumer
+        self.lines: Dict[int, Any] = {}
+        # libgpiod 2.x replaced Chip.get_line() with request_lines()
+        self.v2 = hasattr(gpiod, 'request_lines')
+        self.chip = None if self.v2 else gpiod.Chip(chip)
+
+    def setup_output(self, pin: int, pwm_frequency: Optional[float] = None):
+        """Configure pin as a low output"""
+        if pwm_frequency:
+            get_logger().warning("gpiod backend has no PWM; brightness is ignored")
+
+        if self.v2:
+            from gpiod.line import Direction, Value
+            self.lines[pin] = gpiod.request_lines(
+                self.chip_path,
+                consumer=self.consumer,
+                config={pin: gpiod.LineSettings(
+                    direction=Direction.OUTPUT,
+                    output_value=Value.INACTIVE
+                )}
+            )
+        else:
+            line = self.chip.get_line(pin)
+            line.request(consumer=self.consumer, type=gpiod.LINE_REQ_DIR_OUT, default_vals=[0])
+            self.lines[pin] = line
+
+    def write(self, pin: int, level: float):
+        """Drive pin to level"""
+        if self.v2:
+            from gpiod.line import Value
+            self.lines[pin].set_value(pin, Value.ACTIVE if level > 0 else Value.INACTIVE)
+        else:
+            self.lines[pin].set_value(1 if level > 0 else 0)
+
+    def release(self, pin: int):
+        """Release pin"""
+        line = self.lines.pop(pin, None)
+        if line is not None:
+            line.release()
+
+
+class SimulatedGPIOBackend(GPIOBackend):
+    """In-memory GPIO that records every write with a monotonic timestamp"""
+
+    name = 'simulated'
+    supports_pwm = True
+
+    def __init__(self, capacity: int = 4096):
+        """
+        Initialize simulator
+
+        Args:
+            capacity: Writes kept in the ring buffer; older ones are overwritten
+        """
+        self.capacity = max(1, capacity)
+        self.timestamps = np.zeros(self.capacity, dtype=np.float64)
+        self.pins = np.zeros(self.capacity, dtype=np.int16)
+        self.levels = np.zeros(self.capacity, dtype=np.float32)
+        self.count = 0
+        self.state: Dict[int, float] = {}
+        self.lock = Lock()
+
+    def setup_output(self, pin: int, pwm_frequency: Optional[float] = None):
+        """Configure pin as a low output"""
+        self.write(pin, 0.0)
+
+    def write(self, pin: int, level: float):
+        """Drive pin to level"""
+        now = time.monotonic()
+        with self.lock:
+            index = self.count % self.capacity
+            self.timestamps[index] = now
+            self.pins[index] = pin
+            self.levels[index] = level
+            self.count += 1
+            self.state[pin] = level
+
+    def release(self, pin: int):
+        """Release pin"""
+        with self.lock:
+            self.state.pop(pin, None)
+
+    def level(self, pin: int) -> float:
+        """Current level of pin (0 if never written)"""
+        return self.state.get(pin, 0.0)
+
+    def records(self, pin: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Get recorded writes, oldest first
+
+        Args:
+            pin: Only return writes to this pin
+
+        Returns:
+            Dictionary of 'timestamp', 'pin' and 'level' arrays
+        """
+        with self.lock:
+            stored = min(self.count, self.capacity)
+            start = self.count - stored
+            order = (np.arange(start, self.count) % self.capacity)
+            records = {
+                'timestamp': self.timestamps[order],
+                'pin': self.pins[order],
+                'level': self.levels[order]
+            }
+
+        if pin is not None:
+            mask = records['pin'] == pin
+            records = {key: values[mask] for key, values in records.items()}
+        return records
+
+    def get_transitions(self, pin: Optional[int] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get the most recent writes as dictionaries
+
+        Args:
+            pin: Only return writes to this pin
+            limit: Maximum number of writes
+
+        Returns:
+            List of {'timestamp', 'pin', 'level'}, oldest first
+        """
+        records = self.records(pin)
+        return [
+            {'timestamp': float(ts), 'pin': int(p), 'level': round(float(lv), 3)}
+            for ts, p, lv in zip(
+                records['timestamp'][-limit:],
+                records['pin'][-limit:],
+                records['level'][-limit:]
+            )
+        ]
+
+    def clear(self):
+        """Forget recorded writes"""
+        with self.lock:
+            self.count = 0
+
+
+def create_backend(config: Optional[Any] = None) -> GPIOBackend:
+    """
+    Create the backend selected by gpio.backend
+
+    'auto' prefers RPi.GPIO, then a libgpiod chip if one exists, and falls
+    back to the simulator.
+
+    Args:
+        config: Configuration object (uses global if None)
+
+    Returns:
+        GPIO backend
+    """
+    config = config or get_config()
+    logger = get_logger()
+
+    backend = config.get('gpio.backend', 'auto')
+    chip = config.get('gpio.chip', '/dev/gpiochip0')
+
+    if backend == 'auto':
+        if RPI_GPIO_AVAILABLE:
+            backend = 'rpi'
+        elif GPIOD_AVAILABLE and os.path.exists(chip):
+            backend = 'gpiod'
+        else:
+            logger.warning("No GPIO library available, using simulated GPIO")
+            backend = 'simulated'
+
+    if backend == 'rpi':
+        return RPiGPIOBackend(config.get('gpio.mode', 'BCM'))
+    if backend == 'gpiod':
+        return GpiodBackend(chip)
+    if backend == 'simulated':
+        return SimulatedGPIOBackend(config.get('gpio.simulator_capacity', 4096))
+
+    raise ValueError(f"Unknown GPIO backend: {backend}")
+
+
+# Global backend instance shared by all light controllers
+_backend_instance = None
+
+
+def get_gpio_backend(config: Optional[Any] = None) -> GPIOBackend:
+    """Get global GPIO backend instance"""
+    global _backend_instance
+    if _backend_instance is None:
+        _backend_instance = create_backend(config)
+    return _backend_instance
@@ -3,14 +3,35 @@ Hand gesture recognition capability using MediaPipe
 Detects and recognizes hand gestures, specifically victory gesture
 """
 
-from typing import Dict, Any, Optional
+import math
+from typing import Dict, Any, List, Optional
 import numpy as np
 import mediapipe as mp
 from mediapipe.python.solutions import hands
 
 from ..core.interfaces import Detector
 from ..core.config import get_config
+from ..utils.buffers import RGBBuffer
 from ..utils.logger import get_logger
+from ..utils.spans import span, timed
+
+
+# Landmark indices of each finger's joints, thumb first
+FINGER_JOINTS = (
+    (1, 2, 3, 4),
+    (5, 6, 7, 8),
+    (9, 10, 11, 12),
+    (13, 14, 15, 16),
+    (17, 18, 19, 20)
+)
+
+
+def _unit_angle(ax: float, ay: float, az: float, bx: float, by: float, bz: float) -> float:
+    """Angle in radians between two vectors (normalized like np.linalg.norm + 1e-6)"""
+    na = math.sqrt(ax * ax + ay * ay + az * az) + 1e-6
+    nb = math.sqrt(bx * bx + by * by + bz * bz) + 1e-6
+    cosine = (ax * bx + ay * by + az * bz) / (na * nb)
+    return math.acos(min(max(cosine, -1.0), 1.0))
 
 
 class HandGestureDetector(Detector):
@@ -21,12 +42,13 @@ class HandGestureDetector(Detector):
     GESTURE_POSSIBLE = 1
     GESTURE_CONFIRMED = 2
     
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(self, config: Optional[Any] = None, timers: Optional[Any] = None):
         """
         Initialize hand gesture detector
         
         Args:
             config: Configuration object (uses global if None)
+            timers: TimerService that drops a held gesture when it stops being seen
         """
         self.config = config or get_config()
         self.logger = get_logger()
@@ -37,6 +59,26 @@ class HandGestureDetector(Detector):
         self.gesture_state = self.GESTURE_NONE
         self.gesture_start_time = 0
         self.gesture_confidence = 0
+        self.hold_time = self.config.get('gesture.hold_time', 1.5)
+        self.confidence_threshold = self.config.get('gesture.victory_confidence_threshold', 0.8)
+        
+        # Reused every frame: RGB input, finger angles and result
+        self.rgb = RGBBuffer()
+        self._angles: List[float] = [0.0] * len(FINGER_JOINTS)
+        self.result: Dict[str, Any] = {
+            'hand_landmarks': None,
+            'gesture_type': None,
+            'gesture_confidence': 0.0,
+            'gesture_state': self.GESTURE_NONE
+        }
+        
+        # A possible gesture expires if no frame supports it for this long,
+        # even when hand detection stops running
+        self.hold_timeout = self.config.get('gesture.hold_timeout', 1.0)
+        self.hold_timer = (
+            timers.create('gesture-hold', self._hold_expired)
+            if timers is not None else None
+        )
     
     def initialize(self) -> bool:
         """Initialize MediaPipe Hands model"""
@@ -81,7 +123,7 @@ class HandGestureDetector(Detector):
             frame: BGR image frame
             
         Returns:
-            Dictionary with detection results:
+            Dictionary with detection results, reused by the next call:
             {
                 'hand_landmarks': hand landmarks or None,
                 'gesture_type': detected gesture type,
@@ -90,19 +132,15 @@ class HandGestureDetector(Detector):
             }
         """
         if not self.is_ready():
-            return {
-                'hand_landmarks': None,
-                'gesture_type': None,
-                'gesture_confidence': 0.0,
-                'gesture_state': self.GESTURE_NONE
-            }
+            return self._set_result(None, None, 0.0, self.GESTURE_NONE)
         
         try:
-            # Convert BGR to RGB
-            frame_rgb = frame[:, :, ::-1]
+            # Convert BGR to RGB into the reused contiguous buffer
+            frame_rgb = self.rgb.convert(frame)
             
             # Process frame
-            results = self.mp_hands.process(frame_rgb)
+            with span('hand.inference'):
+                results = self.mp_hands.process(frame_rgb)
             
             # Detect gestures
             gesture_type = None
@@ -115,65 +153,56 @@ class HandGestureDetector(Detector):
                 if gesture_confidence > 0.5:
                     gesture_type = "victory"
             
-            return {
-                'hand_landmarks': results.multi_hand_landmarks,
-                'gesture_type': gesture_type,
-                'gesture_confidence': gesture_confidence,
-                'gesture_state': self.gesture_state
-            }
+            return self._set_result(
+                results.multi_hand_landmarks, gesture_type, gesture_confidence, self.gesture_state
+            )
             
         except Exception as e:
             self.logger.error(f"Error in hand gesture detection: {e}")
-            return {
-                'hand_landmarks': None,
-                'gesture_type': None,
-                'gesture_confidence': 0.0,
-                'gesture_state': self.GESTURE_NONE
-            }
+            return self._set_result(None, None, 0.0, self.GESTURE_NONE)
+    
+    def _set_result(self, landmarks, gesture_type, confidence: float, state: int) -> Dict[str, Any]:
+        """Fill the reused result dictionary"""
+        result = self.result
+        result['hand_landmarks'] = landmarks
+        result['gesture_type'] = gesture_type
+        result['gesture_confidence'] = confidence
+        result['gesture_state'] = state
+        return result
     
-    def _calculate_finger_angles(self, hand_landmarks):
+    def _calculate_finger_angles(self, hand_landmarks) -> List[float]:
         """
         Calculate finger bend angles
         
+        Plain float math: a handful of 3-vectors per finger is far cheaper
+        than allocating NumPy arrays for them.
+        
         Args:
             hand_landmarks: MediaPipe hand landmarks
             
         Returns:
-            List of bend angles for each finger (radians)
+            Bend angle of each finger in radians (reused list)
         """
-        # Finger joint indices
-        finger_bases = [1, 5, 9, 13, 17]
-        finger_pips = [2, 6, 10, 14, 18]
-        finger_dips = [3, 7, 11, 15, 19]
-        finger_tips = [4, 8, 12, 16, 20]
+        landmark = hand_landmarks.landmark
+        angles = self._angles
         
-        angles = []
-        
-        for f in range(5):  # For each finger
-            base = hand_landmarks.landmark[finger_bases[f]]
-            pip = hand_landmarks.landmark[finger_pips[f]]
-            dip = hand_landmarks.landmark[finger_dips[f]]
-            tip = hand_landmarks.landmark[finger_tips[f]]
-            
-            # Calculate vectors
-            v1 = np.array([pip.x - base.x, pip.y - base.y, pip.z - base.z])
-            v2 = np.array([dip.x - pip.x, dip.y - pip.y, dip.z - pip.z])
-            v3 = np.array([tip.x - dip.x, tip.y - dip.y, tip.z - dip.z])
-            
-            # Normalize vectors
-            v1 = v1 / (np.linalg.norm(v1) + 1e-6)
-            v2 = v2 / (np.linalg.norm(v2) + 1e-6)
-            v3 = v3 / (np.linalg.norm(v3) + 1e-6)
-            
-            # Calculate joint angles
-            angle1 = np.arccos(np.clip(np.dot(v1, v2), -1.0, 1.0))
-            angle2 = np.arccos(np.clip(np.dot(v2, v3), -1.0, 1.0))
-            
-            total_bend = angle1 + angle2
-            angles.append(total_bend)
+        for f, (b, p, d, t) in enumerate(FINGER_JOINTS):
+            base, pip, dip, tip = landmark[b], landmark[p], landmark[d], landmark[t]
+            
+            # Joint vectors base->pip, pip->dip, dip->tip
+            v1x, v1y, v1z = pip.x - base.x, pip.y - base.y, pip.z - base.z
+            v2x, v2y, v2z = dip.x - pip.x, dip.y - pip.y, dip.z - pip.z
+            v3x, v3y, v3z = tip.x - dip.x, tip.y - dip.y, tip.z - dip.z
+            
+            # Total bend is the sum of both joint angles
+            angles[f] = (
+                _unit_angle(v1x, v1y, v1z, v2x, v2y, v2z) +
+                _unit_angle(v2x, v2y, v2z, v3x, v3y, v3z)
+            )
         
         return angles
     
+    @timed('gesture.math')
     def _is_victory_gesture(self, hand_landmarks) -> float:
         """
         Detect victory gesture (V sign)
@@ -222,22 +251,11 @@ class HandGestureDetector(Detector):
                 (thumb_tip.x > middle_mcp.x)
             )
             
-            # Calculate angle between index and middle fingers
-            v_index = np.array([
-                index_tip.x - index_mcp.x,
-                index_tip.y - index_mcp.y
-            ])
-            v_middle = np.array([
-                middle_tip.x - middle_mcp.x,
-                middle_tip.y - middle_mcp.y
-            ])
-            
-            # Normalize and calculate angle
-            v_index = v_index / (np.linalg.norm(v_index) + 1e-6)
-            v_middle = v_middle / (np.linalg.norm(v_middle) + 1e-6)
-            
-            angle_between = np.arccos(np.clip(np.dot(v_index, v_middle), -1.0, 1.0))
-            angle_deg = np.degrees(angle_between)
+            # Calculate angle between index and middle fingers (image plane)
+            angle_deg = math.degrees(_unit_angle(
+                index_tip.x - index_mcp.x, index_tip.y - index_mcp.y, 0.0,
+                middle_tip.x - middle_mcp.x, middle_tip.y - middle_mcp.y, 0.0
+            ))
             
             # V gesture should have angle between 20-60 degrees
             good_angle = 20 < angle_deg < 60
@@ -275,20 +293,20 @@ class HandGestureDetector(Detector):
         Returns:
             True if gesture is confirmed
         """
-        hold_time = self.config.get('gesture.hold_time', 1.5)
-        threshold = self.config.get('gesture.victory_confidence_threshold', 0.8)
-        
-        if gesture_confidence > threshold:
+        if gesture_confidence > self.confidence_threshold:
             if self.gesture_state == self.GESTURE_NONE:
                 self.gesture_state = self.GESTURE_POSSIBLE
                 self.gesture_start_time = current_time
                 self.gesture_confidence = gesture_confidence
-                self.logger.debug(f"Possible gesture detected: {gesture_confidence:.2f}")
+                self._rearm_hold()
+                self.logger.debug("Possible gesture detected: %.2f", gesture_confidence)
             
             elif self.gesture_state == self.GESTURE_POSSIBLE:
                 self.gesture_confidence = max(self.gesture_confidence, gesture_confidence)
+                self._rearm_hold()
                 
-                if current_time - self.gesture_start_time >= hold_time:
+                if current_time - self.gesture_start_time >= self.hold_time:
+                    self._cancel_hold()
                     self.gesture_state = self.GESTURE_CONFIRMED
                     self.logger.info(f"Gesture confirmed: {self.gesture_confidence:.2f}")
                     return True
@@ -297,10 +315,12 @@ class HandGestureDetector(Detector):
             if self.gesture_state == self.GESTURE_POSSIBLE:
                 # Smooth update
                 self.gesture_confidence = 0.7 * self.gesture_confidence + 0.3 * gesture_confidence
+                self._rearm_hold()
         
         else:
             if self.gesture_state != self.GESTURE_NONE:
                 self.logger.debug("Gesture tracking lost")
+                self._cancel_hold()
                 self.gesture_state = self.GESTURE_NONE
                 self.gesture_confidence = 0
         
@@ -308,6 +328,25 @@ class HandGestureDetector(Detector):
     
     def reset_gesture_state(self):
         """Reset gesture tracking state"""
+        self._cancel_hold()
         self.gesture_state = self.GESTURE_NONE
         self.gesture_start_time = 0
         self.gesture_confidence = 0
+    
+    def _rearm_hold(self):
+        """Push the hold timeout back after a supporting observation"""
+        if self.hold_timer is not None:
+            self.hold_timer.arm(self.hold_timeout)
+    
+    def _cancel_hold(self):
+        """Stop the hold timeout"""
+        if self.hold_timer is not None:
+            self.hold_timer.cancel()
+    
+    def _hold_expired(self):
+        """Drop a possible gesture that stopped being seen (timer thread)"""
+        if self.gesture_state == self.GESTURE_POSSIBLE:
+            self.logger.debug("Gesture hold timed out")
+            self.gesture_state = self.GESTURE_NONE
+            self.gesture_start_time = 0
+            self.gesture_confidence = 0
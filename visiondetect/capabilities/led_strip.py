@@ -0,0 +1,345 @@
+"""
+WS2812 LED strip capability
+Renders vectorized NumPy animation frames on a dedicated thread and
+pushes them to a NeoPixel strip (or a mock sink for benchmarking)
+"""
+
+import time
+from threading import Thread, Lock, Event
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..core.interfaces import Controller
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+try:
+    import board
+    import neopixel
+    NEOPIXEL_AVAILABLE = True
+except (ImportError, NotImplementedError, RuntimeError):
+    NEOPIXEL_AVAILABLE = False
+
+
+def build_wheel_palette() -> np.ndarray:
+    """
+    Build the 256-entry colour wheel (r -> g -> b -> r) used by rainbow effects
+
+    Returns:
+        (256, 3) uint8 RGB palette
+    """
+    pos = np.arange(256, dtype=np.int32)
+    palette = np.zeros((256, 3), dtype=np.int32)
+
+    first = pos < 85
+    palette[first, 0] = pos[first] * 3
+    palette[first, 1] = 255 - pos[first] * 3
+
+    second = (pos >= 85) & (pos < 170)
+    shifted = pos[second] - 85
+    palette[second, 0] = 255 - shifted * 3
+    palette[second, 2] = shifted * 3
+
+    third = pos >= 170
+    shifted = pos[third] - 170
+    palette[third, 1] = shifted * 3
+    palette[third, 2] = 255 - shifted * 3
+
+    return palette.astype(np.uint8)
+
+
+class MockPixelSink:
+    """Pixel sink that keeps the last frame in memory, for tests and benchmarks"""
+
+    def __init__(self, num_pixels: int):
+        """
+        Initialize mock sink
+
+        Args:
+            num_pixels: Number of pixels on the virtual strip
+        """
+        self.frame = np.zeros((num_pixels, 3), dtype=np.uint8)
+        self.frames_shown = 0
+
+    def show(self, frame: np.ndarray):
+        """Store a copy of frame"""
+        np.copyto(self.frame, frame)
+        self.frames_shown += 1
+
+    def close(self):
+        """Nothing to release"""
+        pass
+
+
+class NeoPixelSink:
+    """Pixel sink driving a WS2812 strip through the Adafruit neopixel library"""
+
+    def __init__(self, num_pixels: int, pin: str = 'D18', pixel_order: str = 'GRB'):
+        """
+        Initialize NeoPixel strip
+
+        Args:
+            num_pixels: Number of pixels on the strip
+            pin: board pin name (D10, D12, D18 or D21)
+            pixel_order: Byte order of the strip (RGB or GRB)
+        """
+        # Brightness is applied to frames by the controller, not by the library
+        self.pixels = neopixel.NeoPixel(
+            getattr(board, pin),
+            num_pixels,
+            brightness=1.0,
+            auto_write=False,
+            pixel_order=getattr(neopixel, pixel_order)
+        )
+
+    def show(self, frame: np.ndarray):
+        """Push an RGB frame to the strip"""
+        self.pixels[:] = frame.tolist()
+        self.pixels.show()
+
+    def close(self):
+        """Turn the strip off and release it"""
+        self.pixels.fill((0, 0, 0))
+        self.pixels.show()
+        self.pixels.deinit()
+
+
+class LEDStripController(Controller):
+    """WS2812 strip with a fixed-rate, non-blocking animation thread"""
+
+    EFFECTS = ('off', 'solid', 'breathe', 'rainbow')
+
+    def __init__(self, config: Optional[Any] = None, sink: Optional[Any] = None):
+        """
+        Initialize LED strip controller
+
+        Args:
+            config: Configuration object (uses global if None)
+            sink: Pixel sink; a NeoPixel or mock sink is created if None
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+
+        self.num_pixels = self.config.get('led_strip.num_pixels', 60)
+        self.fps = max(1, self.config.get('led_strip.fps', 50))
+        self.cycle_seconds = self.config.get('led_strip.cycle_seconds', 5.0)
+        self.sink = sink
+
+        self.effect = self.config.get('led_strip.effect', 'rainbow')
+        self.brightness = self.config.get('led_strip.brightness', 0.2)
+        self.color = np.array(self.config.get('led_strip.color', [255, 0, 0]), dtype=np.uint16)
+
+        # Precomputed tables and reusable buffers, so rendering allocates nothing
+        self.palette = build_wheel_palette()
+        self.pixel_offsets = (np.arange(self.num_pixels) * 256 // self.num_pixels).astype(np.int32)
+        self._indices = np.zeros(self.num_pixels, dtype=np.int32)
+        self._raw = np.zeros((self.num_pixels, 3), dtype=np.uint8)
+        self._scaled = np.zeros((self.num_pixels, 3), dtype=np.uint16)
+        self.frame = np.zeros((self.num_pixels, 3), dtype=np.uint8)
+        self._brightness_lut = self._build_brightness_lut(self.brightness)
+
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+        self.frames_rendered = 0
+        self.overruns = 0
+        self.render_time = 0.0
+        self._initialized = False
+
+    @staticmethod
+    def _build_brightness_lut(brightness: float) -> np.ndarray:
+        """Lookup table mapping 0-255 to 0-255 * brightness"""
+        brightness = min(max(brightness, 0.0), 1.0)
+        return np.round(np.arange(256) * brightness).astype(np.uint8)
+
+    def initialize(self) -> bool:
+        """Open the pixel sink and start the animation thread"""
+        try:
+            if self.sink is None:
+                if NEOPIXEL_AVAILABLE:
+                    self.sink = NeoPixelSink(
+                        self.num_pixels,
+                        pin=self.config.get('led_strip.pin', 'D18'),
+                        pixel_order=self.config.get('led_strip.pixel_order', 'GRB')
+                    )
+                else:
+                    self.logger.warning("neopixel not available, using mock LED strip")
+                    self.sink = MockPixelSink(self.num_pixels)
+
+            self._initialized = True
+            self.stop_event.clear()
+            self.thread = Thread(target=self._animation_loop, name="led-strip", daemon=True)
+            self.thread.start()
+
+            self.logger.info(
+                f"LED strip initialized ({self.num_pixels} pixels @ {self.fps}fps, "
+                f"effect: {self.effect})"
+            )
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to initialize LED strip: {e}")
+            return False
+
+    def cleanup(self):
+        """Stop animation and release the strip"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+        if self.sink is not None:
+            try:
+                self.sink.close()
+            except Exception as e:
+                self.logger.error(f"Error closing LED strip: {e}")
+
+        self._initialized = False
+        self.logger.info("LED strip cleaned up")
+
+    def is_ready(self) -> bool:
+        """Check if strip is ready"""
+        return self._initialized
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Get current strip state
+
+        Returns:
+            Dictionary with effect, brightness and colour
+        """
+        return {
+            'effect': self.effect,
+            'brightness': self.brightness,
+            'color': self.color.tolist()
+        }
+
+    def set_state(self, state: Any) -> bool:
+        """
+        Set strip state
+
+        Args:
+            state: bool (on with configured effect / off) or dict with any of
+                   'effect', 'brightness', 'color'
+
+        Returns:
+            True if state accepted
+
+        Raises:
+            ValueError: 'color' is not three values in 0-255
+        """
+        if isinstance(state, bool):
+            state = {'effect': self.config.get('led_strip.effect', 'rainbow') if state else 'off'}
+
+        if not isinstance(state, dict):
+            return False
+
+        effect = state.get('effect', self.effect)
+        if effect not in self.EFFECTS:
+            self.logger.error(f"Unknown LED effect: {effect}")
+            return False
+
+        color = None
+        if 'color' in state:
+            color = self._parse_color(state['color'])
+
+        with self.lock:
+            self.effect = effect
+            if 'brightness' in state:
+                self.brightness = float(state['brightness'])
+                self._brightness_lut = self._build_brightness_lut(self.brightness)
+            if color is not None:
+                self.color = color
+
+        return True
+
+    @staticmethod
+    def _parse_color(value: Any) -> np.ndarray:
+        """
+        Validate an RGB colour before it reaches the uint8 frame buffer
+
+        Args:
+            value: RGB sequence; channels past the third are ignored
+
+        Returns:
+            uint16 array of the three channels
+
+        Raises:
+            ValueError: Fewer than three channels or one outside 0-255
+        """
+        try:
+            channels = [int(channel) for channel in value[:3]]
+        except (TypeError, ValueError):
+            raise ValueError(f"LED color must be three integers, got {value!r}")
+        if len(channels) != 3 or not all(0 <= channel <= 255 for channel in channels):
+            raise ValueError(f"LED color must be three values in 0-255, got {value!r}")
+        return np.array(channels, dtype=np.uint16)
+
+    def render(self, t: float) -> np.ndarray:
+        """
+        Render the frame for time t into the reusable frame buffer
+
+        Args:
+            t: Animation time in seconds
+
+        Returns:
+            (num_pixels, 3) uint8 RGB frame (reused between calls)
+        """
+        with self.lock:
+            effect = self.effect
+            color = self.color
+            lut = self._brightness_lut
+
+        phase = (t / self.cycle_seconds) % 1.0 if self.cycle_seconds > 0 else 0.0
+
+        if effect == 'rainbow':
+            np.add(self.pixel_offsets, int(phase * 256), out=self._indices)
+            np.bitwise_and(self._indices, 255, out=self._indices)
+            np.take(self.palette, self._indices, axis=0, out=self._raw)
+        elif effect == 'breathe':
+            level = int(127.5 * (1.0 - np.cos(2.0 * np.pi * phase)))
+            np.multiply(color, level, out=self._scaled[0])
+            self._scaled[0] >>= 8
+            self._raw[:] = self._scaled[0]
+        elif effect == 'solid':
+            self._raw[:] = color
+        else:
+            self._raw.fill(0)
+
+        np.take(lut, self._raw, out=self.frame)
+        return self.frame
+
+    def _animation_loop(self):
+        """Render and push frames at a fixed rate"""
+        interval = 1.0 / self.fps
+        start = time.perf_counter()
+        next_deadline = start
+
+        while not self.stop_event.is_set():
+            render_start = time.perf_counter()
+            frame = self.render(render_start - start)
+            try:
+                self.sink.show(frame)
+            except Exception as e:
+                self.logger.error(f"Error writing LED strip: {e}")
+            self.render_time = time.perf_counter() - render_start
+            self.frames_rendered += 1
+
+            next_deadline += interval
+            delay = next_deadline - time.perf_counter()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            else:
+                # Fell behind; skip ahead instead of bursting to catch up
+                self.overruns += 1
+                next_deadline = time.perf_counter()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get animation statistics"""
+        return {
+            'frames_rendered': self.frames_rendered,
+            'overruns': self.overruns,
+            'last_frame_ms': round(self.render_time * 1000, 3),
+            'target_fps': self.fps
+        }
@@ -1,70 +1,100 @@
 """
 GPIO light controller capability
-Controls lights via Raspberry Pi GPIO
+Controls lights through a pluggable GPIO backend (RPi.GPIO, libgpiod or simulated)
 """
 
-from typing import Optional, Any
+from collections import deque
+from threading import Thread, Lock, Event
+from typing import Optional, Any, Dict, List
 import time
 
 from ..core.interfaces import Controller
 from ..core.config import get_config
 from ..utils.logger import get_logger
-
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except ImportError:
-    GPIO_AVAILABLE = False
+from ..utils.statistics import get_statistics
+from ..utils.spans import timed
+from .gpio_backend import GPIOBackend, get_gpio_backend
+from .light_schedule import ScheduleEngine, ScheduleRule
 
 
 class LightController(Controller):
-    """Controls lights via GPIO"""
+    """Controls lights via GPIO through a single coalescing writer thread"""
     
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(
+        self,
+        config: Optional[Any] = None,
+        pin: Optional[int] = None,
+        name: str = 'light',
+        backend: Optional[GPIOBackend] = None
+    ):
         """
         Initialize light controller
         
         Args:
             config: Configuration object (uses global if None)
+            pin: GPIO pin (defaults to gpio.pin)
+            name: Light name used in logs
+            backend: GPIO backend (uses the global one selected by gpio.backend if None)
         """
         self.config = config or get_config()
         self.logger = get_logger()
+        self.stats = get_statistics()
         
-        self.gpio_pin = self.config.get('gpio.pin', 18)
-        self.gpio_mode_str = self.config.get('gpio.mode', 'BCM')
+        self.name = name
+        self.gpio_pin = pin if pin is not None else self.config.get('gpio.pin', 18)
+        self.backend = backend
+        self.min_dwell = self.config.get('light_control.min_dwell', 2.0)
+        self.pwm_frequency = self.config.get('gpio.pwm_frequency')
+        self.brightness = 1.0
+        # Level last written to the pin (writer thread only)
+        self._level = 0.0
         
         self.current_state = False
         self.target_state = False
+        self.target_cause = 'scheduler'
         self._initialized = False
         
-        if not GPIO_AVAILABLE:
-            self.logger.warning("RPi.GPIO not available - light control disabled")
+        # Latest requested state; the writer applies only the newest one
+        self._desired = False
+        self._desired_cause = 'init'
+        self._desired_force = False
+        self._requested_at = 0.0
+        self._request_lock = Lock()
+        self._wake = Event()
+        self._stop_event = Event()
+        self._writer_thread = None
+        self._last_transition = -float('inf')
+        
+        # Failed writes are retried after an exponential back-off, forced or not
+        self._retry_at = -float('inf')
+        self._consecutive_failures = 0
+        
+        self.requests = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.write_errors = 0
+        self.journal = deque(maxlen=self.config.get('light_control.journal_size', 64))
     
     def initialize(self) -> bool:
         """Initialize GPIO"""
-        if not GPIO_AVAILABLE:
-            self.logger.warning("GPIO not available, using mock mode")
-            self._initialized = True
-            return True
-        
         try:
-            # Set GPIO mode
-            GPIO.setwarnings(False)
-            
-            if self.gpio_mode_str.upper() == 'BCM':
-                GPIO.setmode(GPIO.BCM)
-            else:
-                GPIO.setmode(GPIO.BOARD)
+            if self.backend is None:
+                self.backend = get_gpio_backend(self.config)
             
-            # Setup pin
-            GPIO.setup(self.gpio_pin, GPIO.OUT)
-            GPIO.output(self.gpio_pin, GPIO.LOW)
+            # PWM lets schedule rules dim the light
+            self.backend.setup_output(self.gpio_pin, self.pwm_frequency)
             
             self.current_state = False
             self.target_state = False
+            self._desired = False
+            self._level = 0.0
             
             self._initialized = True
-            self.logger.info(f"GPIO light controller initialized (pin: {self.gpio_pin})")
+            self._start_writer()
+            self.logger.info(
+                f"GPIO light controller '{self.name}' initialized "
+                f"(pin: {self.gpio_pin}, backend: {self.backend.name})"
+            )
             return True
             
         except Exception as e:
@@ -73,10 +103,13 @@ class LightController(Controller):
     
     def cleanup(self):
         """Clean up GPIO resources"""
-        if GPIO_AVAILABLE and self._initialized:
+        self._stop_writer()
+        
+        if self.backend is not None and self._initialized:
             try:
-                GPIO.cleanup()
-                self.logger.info("GPIO cleaned up")
+                # Only release our pin; other zones may still be driving theirs
+                self.backend.release(self.gpio_pin)
+                self.logger.info(f"GPIO pin {self.gpio_pin} cleaned up")
             except Exception as e:
                 self.logger.error(f"Error cleaning up GPIO: {e}")
         
@@ -97,63 +130,232 @@ class LightController(Controller):
     
     def set_state(self, state: bool) -> bool:
         """
-        Set light state
+        Set light state (manual override, bypasses the dwell time)
         
         Args:
             state: True to turn on, False to turn off
             
         Returns:
-            True if state change successful
+            True if the request was accepted
         """
-        if not self.is_ready():
-            return False
+        return self.request_state(state, cause='manual', force=True)
+    
+    def request_state(self, state: bool, cause: str = 'scheduler', force: bool = False) -> bool:
+        """
+        Ask the writer thread to drive the light to state
         
-        try:
-            if state != self.current_state:
-                if GPIO_AVAILABLE:
-                    GPIO.output(self.gpio_pin, GPIO.HIGH if state else GPIO.LOW)
-                
-                self.current_state = state
-                self.logger.info(f"Light {'ON' if state else 'OFF'}")
-                return True
-            
-            return True
+        Requests arriving before the writer gets to them are coalesced, and
+        non-forced transitions wait until min_dwell has passed since the
+        previous one so the light cannot chatter.
+        
+        Args:
+            state: True to turn on, False to turn off
+            cause: Reason recorded in the transition journal
+            force: Apply without waiting for the dwell time
             
-        except Exception as e:
-            self.logger.error(f"Error setting GPIO state: {e}")
+        Returns:
+            True if the request was accepted
+        """
+        if not self.is_ready():
             return False
+        
+        with self._request_lock:
+            self.requests += 1
+            if self._desired != self.current_state:
+                # A pending request is superseded before it was written
+                self.coalesced += 1
+            self._desired = state
+            self._desired_cause = cause
+            self._desired_force = force
+            self._requested_at = time.monotonic()
+        
+        self._wake.set()
+        return True
     
-    def set_target_state(self, state: bool):
+    def set_target_state(self, state: bool, cause: str = 'scheduler'):
         """
         Set target state (may be applied later)
         
         Args:
             state: Target state
+            cause: Reason recorded when the target is applied
         """
         self.target_state = state
+        self.target_cause = cause
     
     def apply_target_state(self) -> bool:
         """
-        Apply target state to actual GPIO
+        Request the target state from the writer if it is not already pending
         
         Returns:
-            True if state changed
+            True if a new request was made
         """
-        if self.target_state != self.current_state:
-            return self.set_state(self.target_state)
+        if self.target_state != self._desired:
+            return self.request_state(self.target_state, cause=self.target_cause)
         return False
+    
+    def set_brightness(self, brightness: float):
+        """
+        Set brightness used while the light is on (needs gpio.pwm_frequency)
+        
+        The writer thread applies it, so it never races an on/off write.
+        
+        Args:
+            brightness: 0-1
+        """
+        self.brightness = min(max(brightness, 0.0), 1.0)
+        if self.pwm_frequency and self._initialized:
+            self._wake.set()
+    
+    @timed('gpio.write')
+    def _drive(self, state: bool):
+        """Drive the pin, at the scheduled brightness when PWM is enabled"""
+        if not state:
+            level = 0.0
+        else:
+            level = self.brightness if self.pwm_frequency else 1.0
+        self.backend.write(self.gpio_pin, level)
+        self._level = level
+    
+    def _brightness_pending(self) -> bool:
+        """Check if the light is on at a level other than the current brightness"""
+        return bool(self.pwm_frequency) and self.current_state and self._level != self.brightness
+    
+    def get_journal(self) -> List[Dict[str, Any]]:
+        """
+        Get recent transitions, oldest first
+        
+        Returns:
+            List of transition records
+        """
+        return list(self.journal)
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Get writer counters"""
+        return {
+            'requests': self.requests,
+            'coalesced': self.coalesced,
+            'writes': self.writes,
+            'write_errors': self.write_errors,
+            'min_dwell': self.min_dwell,
+            'pending': self._desired != self.current_state
+        }
+    
+    def _start_writer(self):
+        """Start the GPIO writer thread"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self._writer_thread = Thread(target=self._writer_loop, name="light-writer", daemon=True)
+        self._writer_thread.start()
+    
+    def _stop_writer(self):
+        """Stop the GPIO writer thread"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._writer_thread:
+            self._writer_thread.join(timeout=2.0)
+            self._writer_thread = None
+    
+    def _writer_loop(self):
+        """Apply the newest requested state, respecting the dwell time"""
+        while not self._stop_event.is_set():
+            with self._request_lock:
+                desired = self._desired
+                cause = self._desired_cause
+                force = self._desired_force
+                requested_at = self._requested_at
+            
+            transition = desired != self.current_state
+            if not transition and not self._brightness_pending():
+                self._wake.wait(1.0)
+                self._wake.clear()
+                continue
+            
+            # Brightness changes skip the dwell time, failed writes never do
+            now = time.monotonic()
+            remaining = self._retry_at - now
+            if transition and not force:
+                remaining = max(remaining, self.min_dwell - (now - self._last_transition))
+            if remaining > 0:
+                # Newer requests wake us early and are re-read above
+                self._wake.wait(remaining)
+                self._wake.clear()
+                continue
+            
+            if transition:
+                self._write(desired, cause, requested_at)
+            else:
+                self._write_brightness()
+    
+    def _write_failed(self, error: Exception):
+        """Schedule a retry after a failed write"""
+        # Back off before retrying: at least a dwell period, doubling
+        # with each consecutive failure
+        self.write_errors += 1
+        self._consecutive_failures += 1
+        backoff = min(
+            max(self.min_dwell, 0.5) * 2 ** (self._consecutive_failures - 1),
+            60.0
+        )
+        self._retry_at = time.monotonic() + backoff
+        self.logger.error(f"Error setting GPIO state: {error} (retrying in {backoff:.1f}s)")
+    
+    def _write_brightness(self):
+        """Re-drive the lit pin at the current brightness"""
+        try:
+            self._drive(True)
+        except Exception as e:
+            self._write_failed(e)
+            return
+        self._consecutive_failures = 0
+    
+    def _write(self, state: bool, cause: str, requested_at: float):
+        """Drive the GPIO pin and journal the transition"""
+        try:
+            self._drive(state)
+        except Exception as e:
+            self._write_failed(e)
+            return
+        
+        now = time.monotonic()
+        self._consecutive_failures = 0
+        self.current_state = state
+        self._last_transition = now
+        self.writes += 1
+        
+        with self._request_lock:
+            if self._desired == state:
+                self._desired_force = False
+        
+        self.journal.append({
+            'timestamp': time.time(),
+            'state': state,
+            'cause': cause,
+            'latency_ms': round((now - requested_at) * 1000, 2)
+        })
+        self.stats.record_light_change(state)
+        self.logger.info(f"Light '{self.name}' {'ON' if state else 'OFF'} ({cause})")
 
 
 class LightScheduler:
     """Manages light control logic with timing"""
     
-    def __init__(self, controller: LightController, config: Optional[Any] = None):
+    def __init__(
+        self,
+        controller: LightController,
+        config: Optional[Any] = None,
+        timers: Optional[Any] = None
+    ):
         """
         Initialize light scheduler
         
         Args:
             controller: Light controller instance
             config: Configuration object
+            timers: TimerService owning the off deadline; without one the
+                    deadline is only checked when update() is called
         """
         self.controller = controller
         self.config = config or get_config()
@@ -162,21 +364,46 @@ class LightScheduler:
         self.last_detection_time = 0
         self.person_present = False
         
-        # Load delays from config
-        self.day_start = self.config.get('light_control.day_start_hour', 8)
-        self.day_end = self.config.get('light_control.day_end_hour', 22)
-        self.day_delay = self.config.get('light_control.off_delay.day', 300)
-        self.night_delay = self.config.get('light_control.off_delay.night', 180)
+        # Calendar rules choose off delay and brightness
+        self.schedule = ScheduleEngine.from_config(self.config)
+        self.active_rule: Optional[ScheduleRule] = None
+        
+        # Off deadline fires on the timer thread even if frames stop coming
+        self.off_timer = (
+            timers.create(f'light-off:{controller.name}', self._off_deadline)
+            if timers is not None else None
+        )
     
-    def is_daytime(self) -> bool:
-        """Check if current time is daytime"""
-        from datetime import datetime
-        current_hour = datetime.now().hour
-        return self.day_start <= current_hour < self.day_end
+    def get_active_rule(self, current_time: Optional[float] = None) -> ScheduleRule:
+        """
+        Get the schedule rule in force, applying its brightness on change
+        
+        Args:
+            current_time: Current timestamp (uses time.time() if None)
+            
+        Returns:
+            Active schedule rule
+        """
+        rule = self.schedule.active(current_time if current_time is not None else time.time())
+        
+        if rule is not self.active_rule:
+            self.active_rule = rule
+            self.controller.set_brightness(rule.brightness)
+            
+            # A pending deadline follows the new rule's off delay
+            if self.off_timer is not None and self.off_timer.active and not self.person_present:
+                now = current_time if current_time is not None else time.time()
+                self.off_timer.arm(self.last_detection_time + rule.off_delay - now)
+            self.logger.info(
+                f"Light schedule '{rule.name}': off delay {rule.off_delay}s, "
+                f"brightness {rule.brightness:.0%}"
+            )
+        
+        return rule
     
-    def get_off_delay(self) -> int:
-        """Get current off delay based on time of day"""
-        return self.day_delay if self.is_daytime() else self.night_delay
+    def get_off_delay(self, current_time: Optional[float] = None) -> float:
+        """Get current off delay from the active schedule rule"""
+        return self.get_active_rule(current_time).off_delay
     
     def update(self, person_detected: bool, current_time: Optional[float] = None):
         """
@@ -189,23 +416,28 @@ class LightScheduler:
         if current_time is None:
             current_time = time.time()
         
+        # One comparison unless a calendar boundary has been crossed
+        rule = self.get_active_rule(current_time)
+        
         if person_detected:
             # Person detected - turn light on
             self.last_detection_time = current_time
             self.person_present = True
-            self.controller.set_target_state(True)
+            self.controller.set_target_state(True, cause='presence')
+            
+            if self.off_timer is not None:
+                self.off_timer.arm(rule.off_delay)
         else:
             # No person detected
             self.person_present = False
             
-            # Check if we should turn off
+            # Check if we should turn off (the timer does this when present)
             time_since_detection = current_time - self.last_detection_time
-            off_delay = self.get_off_delay()
             
-            if time_since_detection > off_delay:
-                self.controller.set_target_state(False)
+            if self.off_timer is None and time_since_detection > rule.off_delay:
+                self.controller.set_target_state(False, cause='off_delay')
         
-        # Apply the target state
+        # Apply the target state (non-blocking, the writer thread owns GPIO)
         self.controller.apply_target_state()
     
     def get_time_until_off(self) -> float:
@@ -218,8 +450,17 @@ class LightScheduler:
         if self.person_present:
             return float('inf')
         
-        time_since = time.time() - self.last_detection_time
-        off_delay = self.get_off_delay()
+        if self.off_timer is not None:
+            return self.off_timer.remaining()
+        
+        now = time.time()
+        time_since = now - self.last_detection_time
+        off_delay = self.schedule.active(now).off_delay
         remaining = off_delay - time_since
         
         return max(0, remaining)
+    
+    def _off_deadline(self):
+        """Turn the light off when the off deadline expires (timer thread)"""
+        self.controller.set_target_state(False, cause='off_delay')
+        self.controller.apply_target_state()
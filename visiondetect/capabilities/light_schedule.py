@@ -0,0 +1,211 @@
+"""
+Light schedule engine
+Calendar rules (weekday/weekend, exam periods, quiet hours) selecting the
+light off-delay and brightness, with the next transition precomputed
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+from ..core.config import get_config
+
+
+WEEKDAYS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+
+def parse_time_of_day(value: Any) -> int:
+    """
+    Parse 'HH:MM' (or an hour number) into minutes after midnight
+
+    Args:
+        value: Time string such as '07:30', or an integer hour 0-24
+
+    Returns:
+        Minutes after midnight
+
+    Raises:
+        ValueError: Not a valid time of day
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        # YAML 1.1 reads an unquoted 23:30 as the sexagesimal integer 1410
+        if not 0 <= value <= 24:
+            raise ValueError(
+                f"Invalid time of day {value!r}; write times as quoted \"HH:MM\" strings"
+            )
+        return (value % 24) * 60
+
+    try:
+        hours, minutes = (int(part) for part in str(value).split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid time of day {value!r}, expected \"HH:MM\"")
+    if not (0 <= hours <= 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time of day {value!r}, expected \"HH:MM\"")
+    return (hours % 24) * 60 + minutes
+
+
+@dataclass
+class ScheduleRule:
+    """One calendar rule; every condition that is set must match"""
+    name: str
+    off_delay: float
+    brightness: float = 1.0
+    days: Optional[FrozenSet[int]] = None           # 0 = Monday
+    start: Optional[int] = None                     # Minutes after midnight
+    end: Optional[int] = None                       # Exclusive, may wrap past midnight
+    date_ranges: List[Tuple[date, date]] = field(default_factory=list)
+
+    def matches(self, moment: datetime) -> bool:
+        """Check whether the rule applies at moment (local time)"""
+        if self.days is not None and moment.weekday() not in self.days:
+            return False
+
+        if self.date_ranges:
+            today = moment.date()
+            if not any(first <= today <= last for first, last in self.date_ranges):
+                return False
+
+        if self.start is not None and self.end is not None:
+            minute = moment.hour * 60 + moment.minute
+            if self.start <= self.end:
+                return self.start <= minute < self.end
+            # Window wraps past midnight, e.g. 23:00-07:00
+            return minute >= self.start or minute < self.end
+
+        return True
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> 'ScheduleRule':
+        """
+        Build a rule from its configuration entry
+
+        Raises:
+            ValueError: Invalid time, or only one of start/end given
+        """
+        if ('start' in raw) != ('end' in raw):
+            raise ValueError(
+                f"Schedule rule '{raw.get('name', 'rule')}' needs both start and end"
+            )
+
+        days = raw.get('days')
+        if days is not None:
+            days = frozenset(
+                WEEKDAYS[day.lower()[:3]] if isinstance(day, str) else int(day)
+                for day in days
+            )
+
+        date_ranges = []
+        for first, last in raw.get('dates', []) or []:
+            date_ranges.append((
+                date.fromisoformat(str(first)),
+                date.fromisoformat(str(last))
+            ))
+
+        return cls(
+            name=raw.get('name', 'rule'),
+            off_delay=raw.get('off_delay', 300),
+            brightness=raw.get('brightness', 1.0),
+            days=days,
+            start=parse_time_of_day(raw['start']) if 'start' in raw else None,
+            end=parse_time_of_day(raw['end']) if 'end' in raw else None,
+            date_ranges=date_ranges
+        )
+
+
+class ScheduleEngine:
+    """Selects the active rule, re-evaluating only at calendar boundaries"""
+
+    def __init__(self, rules: List[ScheduleRule], fallback: ScheduleRule):
+        """
+        Initialize schedule engine
+
+        Args:
+            rules: Rules in priority order, the first match wins
+            fallback: Rule used when nothing matches
+        """
+        self.rules = rules
+        self.fallback = fallback
+
+        # Rules can only change outcome at midnight or at one of their edges
+        edges = {0}
+        for rule in rules:
+            if rule.start is not None and rule.end is not None:
+                edges.update((rule.start, rule.end))
+        self.edges = sorted(edges)
+
+        self._active = fallback
+        self._valid_until = float('-inf')
+        self.evaluations = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Any] = None) -> 'ScheduleEngine':
+        """
+        Build engine from light_control.schedule
+
+        Without a schedule the legacy day/night split is used.
+
+        Args:
+            config: Configuration object (uses global if None)
+        """
+        config = config or get_config()
+        raw_rules = config.get('light_control.schedule')
+
+        if not raw_rules:
+            raw_rules = [
+                {
+                    'name': 'day',
+                    'start': config.get('light_control.day_start_hour', 8),
+                    'end': config.get('light_control.day_end_hour', 22),
+                    'off_delay': config.get('light_control.off_delay.day', 300)
+                },
+                {
+                    'name': 'night',
+                    'off_delay': config.get('light_control.off_delay.night', 180)
+                }
+            ]
+
+        rules = [ScheduleRule.from_dict(raw) for raw in raw_rules]
+        fallback = ScheduleRule(
+            name='default',
+            off_delay=config.get('light_control.off_delay.night', 180)
+        )
+        return cls(rules, fallback)
+
+    def active(self, now: float) -> ScheduleRule:
+        """
+        Get the rule in force at now
+
+        Args:
+            now: Unix timestamp
+
+        Returns:
+            Active schedule rule
+        """
+        if now < self._valid_until:
+            return self._active
+
+        moment = datetime.fromtimestamp(now)
+        self._active = next(
+            (rule for rule in self.rules if rule.matches(moment)),
+            self.fallback
+        )
+        self._valid_until = self._next_boundary(moment).timestamp()
+        self.evaluations += 1
+        return self._active
+
+    @property
+    def next_transition(self) -> float:
+        """Timestamp at which the active rule is next re-evaluated"""
+        return self._valid_until
+
+    def _next_boundary(self, moment: datetime) -> datetime:
+        """First rule edge strictly after moment"""
+        for day_offset in (0, 1):
+            day = moment.date() + timedelta(days=day_offset)
+            for minute in self.edges:
+                candidate = datetime.combine(day, dt_time(minute // 60, minute % 60))
+                if candidate > moment:
+                    return candidate
+
+        # Unreachable: midnight tomorrow is always an edge
+        return datetime.combine(moment.date() + timedelta(days=1), dt_time())
@@ -0,0 +1,280 @@
+"""
+Multi-zone light control capability
+Maps regions of the camera frame to independently timed lights
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+from .light_control import LightController, LightScheduler
+
+
+# Landmarks below this visibility are ignored when locating a person
+LANDMARK_VISIBILITY_THRESHOLD = 0.5
+
+FULL_FRAME = [(0.0, 0.0), (1.0, 0.0), (1.0, 1.0), (0.0, 1.0)]
+
+
+def rasterize_polygon(
+    polygon: Sequence[Tuple[float, float]],
+    width: int,
+    height: int
+) -> np.ndarray:
+    """
+    Rasterize a polygon in normalized image coordinates
+
+    Args:
+        polygon: Vertices as (x, y) in 0-1 image coordinates
+        width: Grid width in cells
+        height: Grid height in cells
+
+    Returns:
+        Boolean (height, width) mask of cells whose centre lies inside
+    """
+    xs = (np.arange(width, dtype=np.float32) + 0.5) / width
+    ys = (np.arange(height, dtype=np.float32) + 0.5) / height
+    px, py = np.meshgrid(xs, ys)
+
+    inside = np.zeros((height, width), dtype=bool)
+    vertices = np.asarray(polygon, dtype=np.float32)
+    count = len(vertices)
+
+    # Even-odd rule, one vectorized pass per edge
+    for i in range(count):
+        x1, y1 = vertices[i]
+        x2, y2 = vertices[(i + 1) % count]
+        if y1 == y2:
+            continue
+        crosses = (y1 > py) != (y2 > py)
+        x_at = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        inside ^= crosses & (px < x_at)
+
+    return inside
+
+
+class ZoneMap:
+    """Lookup grid from image position to a bitmask of zones"""
+
+    def __init__(
+        self,
+        polygons: List[Sequence[Tuple[float, float]]],
+        width: int,
+        height: int
+    ):
+        """
+        Rasterize zone polygons once
+
+        Args:
+            polygons: One polygon per zone, in zone order
+            width: Grid width (inference resolution)
+            height: Grid height (inference resolution)
+        """
+        if len(polygons) > 32:
+            raise ValueError("At most 32 light zones are supported")
+
+        self.width = width
+        self.height = height
+        dtype = np.uint8 if len(polygons) <= 8 else np.uint32
+        self.grid = np.zeros((height, width), dtype=dtype)
+
+        for index, polygon in enumerate(polygons):
+            mask = rasterize_polygon(polygon, width, height)
+            self.grid[mask] |= dtype(1 << index)
+        self.flat_grid = self.grid.ravel()
+
+        # Scratch arrays for locate(), sized to the point count on first use
+        self._ix = np.empty(0, dtype=np.intp)
+        self._iy = np.empty(0, dtype=np.intp)
+        self._cells = np.empty(0, dtype=dtype)
+
+    def locate(self, xs: np.ndarray, ys: np.ndarray, where: Optional[np.ndarray] = None) -> int:
+        """
+        Get the zones containing any of the given points
+
+        Args:
+            xs: Normalized x coordinates
+            ys: Normalized y coordinates
+            where: Boolean mask of the points to consider (all if None)
+
+        Returns:
+            Bitmask with bit i set if zone i contains a point
+        """
+        count = xs.size
+        if count == 0:
+            return 0
+        if self._ix.size != count:
+            self._ix = np.empty(count, dtype=np.intp)
+            self._iy = np.empty(count, dtype=np.intp)
+            self._cells = np.empty(count, dtype=self.grid.dtype)
+
+        # Cell index per point, computed in place
+        ix, iy = self._ix, self._iy
+        np.multiply(xs, self.width, out=ix, casting='unsafe')
+        np.clip(ix, 0, self.width - 1, out=ix)
+        np.multiply(ys, self.height, out=iy, casting='unsafe')
+        np.clip(iy, 0, self.height - 1, out=iy)
+        iy *= self.width
+        iy += ix
+
+        np.take(self.flat_grid, iy, out=self._cells)
+        if where is None:
+            return int(np.bitwise_or.reduce(self._cells))
+        return int(np.bitwise_or.reduce(self._cells, where=where, initial=0))
+
+
+@dataclass
+class LightZone:
+    """A named light bound to a region of the frame"""
+    name: str
+    pin: int
+    polygon: List[Tuple[float, float]]
+    controller: LightController
+    scheduler: LightScheduler
+    present: bool = False
+
+
+class LightZoneManager:
+    """Drives one light per zone from where the person is in the frame"""
+
+    def __init__(self, config: Optional[Any] = None, timers: Optional[Any] = None):
+        """
+        Initialize zones from light_control.zones
+
+        Without configured zones a single full-frame zone on gpio.pin is
+        used, which behaves exactly like the single-light setup.
+
+        Args:
+            config: Configuration object (uses global if None)
+            timers: TimerService for the zones' off deadlines
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+
+        raw_zones = self.config.get('light_control.zones') or [{
+            'name': 'main',
+            'pin': self.config.get('gpio.pin', 18),
+            'polygon': FULL_FRAME
+        }]
+
+        self.zones: List[LightZone] = []
+        for index, raw in enumerate(raw_zones):
+            name = raw.get('name', f'zone{index}')
+            pin = raw.get('pin', self.config.get('gpio.pin', 18))
+            polygon = [tuple(point) for point in raw.get('polygon', FULL_FRAME)]
+            controller = LightController(self.config, pin=pin, name=name)
+            self.zones.append(LightZone(
+                name=name,
+                pin=pin,
+                polygon=polygon,
+                controller=controller,
+                scheduler=LightScheduler(controller, self.config, timers)
+            ))
+
+        width = self.config.get('light_control.zone_grid.width', self.config.camera_width)
+        height = self.config.get('light_control.zone_grid.height', self.config.camera_height)
+        self.zone_map = ZoneMap([zone.polygon for zone in self.zones], width, height)
+        self.all_zones_mask = (1 << len(self.zones)) - 1
+        self.last_mask = 0
+
+        # Landmark coordinates, refilled in place every frame
+        self._xs = np.empty(0, dtype=np.float32)
+        self._ys = np.empty(0, dtype=np.float32)
+        self._visible = np.empty(0, dtype=bool)
+
+    @property
+    def primary(self) -> LightZone:
+        """First zone, used where a single light is expected"""
+        return self.zones[0]
+
+    def initialize(self) -> bool:
+        """Initialize every zone controller"""
+        results = [zone.controller.initialize() for zone in self.zones]
+        return all(results)
+
+    def cleanup(self):
+        """Clean up every zone controller"""
+        for zone in self.zones:
+            zone.controller.cleanup()
+
+    def is_ready(self) -> bool:
+        """Check if all zone controllers are ready"""
+        return all(zone.controller.is_ready() for zone in self.zones)
+
+    def any_light_on(self) -> bool:
+        """Check if any zone light is on"""
+        return any(zone.controller.get_state() for zone in self.zones)
+
+    def any_present(self) -> bool:
+        """Check if a person is present in any zone"""
+        return any(zone.present for zone in self.zones)
+
+    def locate_landmarks(self, pose_landmarks) -> Optional[int]:
+        """
+        Map pose landmarks to a zone bitmask
+
+        Args:
+            pose_landmarks: MediaPipe pose landmarks or None
+
+        Returns:
+            Zone bitmask, or None if there are no usable landmarks
+        """
+        if pose_landmarks is None:
+            return None
+
+        landmarks = pose_landmarks.landmark
+        count = len(landmarks)
+        if self._xs.size != count:
+            self._xs = np.empty(count, dtype=np.float32)
+            self._ys = np.empty(count, dtype=np.float32)
+            self._visible = np.empty(count, dtype=bool)
+
+        xs, ys, visible = self._xs, self._ys, self._visible
+        for index, lm in enumerate(landmarks):
+            xs[index] = lm.x
+            ys[index] = lm.y
+            visible[index] = lm.visibility > LANDMARK_VISIBILITY_THRESHOLD
+        if not visible.any():
+            return None
+
+        return self.zone_map.locate(xs, ys, where=visible)
+
+    def update(self, person_present: bool, pose_landmarks=None, current_time: Optional[float] = None):
+        """
+        Update each zone scheduler
+
+        Args:
+            person_present: Smoothed presence decision
+            pose_landmarks: MediaPipe pose landmarks for this frame, if any
+            current_time: Current timestamp (uses time.time() if None)
+        """
+        if person_present:
+            mask = self.locate_landmarks(pose_landmarks)
+            if mask is not None:
+                self.last_mask = mask
+            elif len(self.zones) == 1:
+                self.last_mask = self.all_zones_mask
+            # Otherwise keep the last known zones through detection flicker
+        else:
+            self.last_mask = 0
+
+        for index, zone in enumerate(self.zones):
+            zone.present = bool(self.last_mask & (1 << index))
+            zone.scheduler.update(zone.present, current_time)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-zone status"""
+        return {
+            zone.name: {
+                'pin': zone.pin,
+                'light_on': zone.controller.get_state(),
+                'person_present': zone.present,
+                'time_until_off': zone.scheduler.get_time_until_off(),
+                'schedule_rule': zone.scheduler.active_rule.name if zone.scheduler.active_rule else None,
+                'next_schedule_change': zone.scheduler.schedule.next_transition
+            }
+            for zone in self.zones
+        }
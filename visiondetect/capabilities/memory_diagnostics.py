@@ -0,0 +1,242 @@
+"""
+Memory diagnostics capability
+Samples process RSS and Python heap usage into the statistics, and takes
+tracemalloc snapshots diffed against a baseline to find allocating sites
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from ..core.interfaces import Capability
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+SNAPSHOT_KEYS = ('lineno', 'filename', 'traceback')
+
+
+def read_rss() -> int:
+    """
+    Resident set size of this process in bytes
+
+    Reads /proc/self/statm; elsewhere falls back to the peak RSS from
+    getrusage, which only ever grows.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class MemoryDiagnostics(Capability):
+    """Periodic memory sampling and on-demand allocation diffs"""
+
+    def __init__(
+        self,
+        config: Optional[Any] = None,
+        stats: Optional[Any] = None,
+        timers: Optional[Any] = None
+    ):
+        """
+        Initialize memory diagnostics
+
+        Args:
+            config: Configuration object (uses global if None)
+            stats: StatisticsManager receiving memory samples
+            timers: TimerService scheduling the samples
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+        self.stats = stats
+
+        self.enabled = self.config.get('memory.enabled', True)
+        self.sample_interval = self.config.get('memory.sample_interval', 30.0)
+        self.trace_frames = self.config.get('memory.trace_frames', 10)
+        self.trace_on_start = self.config.get('memory.trace_on_start', False)
+        self.top = self.config.get('memory.top', 20)
+
+        self.sample_timer = timers.create('memory-sample', self._sample_deadline) if timers is not None else None
+        self.lock = Lock()
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.baseline_time: Optional[float] = None
+        self.started_tracing = False
+        self._initialized = False
+
+    def initialize(self) -> bool:
+        """Take a first sample, arm periodic sampling and optionally start tracing"""
+        if not self.enabled:
+            return True
+
+        if self.trace_on_start:
+            self.start_tracing()
+
+        self.sample()
+        if self.sample_timer is not None:
+            self.sample_timer.arm(self.sample_interval)
+
+        self._initialized = True
+        return True
+
+    def cleanup(self):
+        """Stop sampling and any tracing this capability started"""
+        if self.sample_timer is not None:
+            self.sample_timer.cancel()
+        if self.started_tracing:
+            self.stop_tracing()
+        self._initialized = False
+
+    def is_ready(self) -> bool:
+        """Check if sampling is running"""
+        return self._initialized
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Sample RSS, allocated Python blocks and traced memory once
+
+        Returns:
+            The sampled values
+        """
+        rss = read_rss()
+        blocks = sys.getallocatedblocks()
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        if self.stats is not None:
+            self.stats.record_memory(rss, blocks, traced)
+        return {'rss_bytes': rss, 'python_blocks': blocks, 'traced_bytes': traced}
+
+    def _sample_deadline(self):
+        """Periodic sample (timer thread), then re-arm"""
+        try:
+            self.sample()
+        except Exception as e:
+            self.logger.error(f"Memory sample failed: {e}")
+        self.sample_timer.arm(self.sample_interval)
+
+    def start_tracing(self, frames: Optional[int] = None) -> bool:
+        """
+        Start tracemalloc and take a baseline
+
+        Tracing slows every allocation down, so it stays off until asked for.
+
+        Args:
+            frames: Traceback depth kept per allocation (uses memory.trace_frames if None)
+
+        Returns:
+            True if tracing was started, False if it was already running
+        """
+        with self.lock:
+            if tracemalloc.is_tracing():
+                return False
+            tracemalloc.start(frames or self.trace_frames)
+            self.started_tracing = True
+        self.logger.info(f"tracemalloc started ({frames or self.trace_frames} frames)")
+        self.take_baseline()
+        return True
+
+    def stop_tracing(self):
+        """Stop tracemalloc and drop the baseline"""
+        with self.lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self.started_tracing = False
+            self.baseline = None
+            self.baseline_time = None
+        self.logger.info("tracemalloc stopped")
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        """Snapshot without the tracer's own and import machinery allocations"""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>')
+        ))
+
+    def take_baseline(self):
+        """
+        Replace the baseline with a fresh snapshot
+
+        Raises:
+            RuntimeError: tracemalloc is not tracing
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+        snapshot = self._snapshot()
+        with self.lock:
+            self.baseline = snapshot
+            self.baseline_time = time.time()
+
+    def top_allocations(self, top: Optional[int] = None, key: str = 'lineno') -> Dict[str, Any]:
+        """
+        Diff a new snapshot against the baseline
+
+        Args:
+            top: Number of sites to return (uses memory.top if None)
+            key: Group by 'lineno', 'filename' or 'traceback'
+
+        Returns:
+            Dictionary with the sites that grew most since the baseline
+
+        Raises:
+            RuntimeError: tracemalloc is not tracing
+            ValueError: Unknown key
+        """
+        if key not in SNAPSHOT_KEYS:
+            raise ValueError(f"key must be one of {', '.join(SNAPSHOT_KEYS)}")
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing")
+
+        snapshot = self._snapshot()
+        with self.lock:
+            baseline = self.baseline
+            baseline_time = self.baseline_time
+            if baseline is None:
+                self.baseline = snapshot
+                self.baseline_time = baseline_time = time.time()
+
+        if baseline is None:
+            stats = snapshot.statistics(key)
+        else:
+            stats = snapshot.compare_to(baseline, key)
+
+        sites: List[Dict[str, Any]] = []
+        for stat in stats[:top or self.top]:
+            frames = stat.traceback.format() if key == 'traceback' else None
+            # Frames run oldest to most recent; the last one allocated
+            site = stat.traceback[-1]
+            sites.append({
+                'site': f"{site.filename}:{site.lineno}" if key != 'filename' else site.filename,
+                'size_kb': round(stat.size / 1024, 1),
+                'count': stat.count,
+                'size_diff_kb': round(getattr(stat, 'size_diff', stat.size) / 1024, 1),
+                'count_diff': getattr(stat, 'count_diff', stat.count),
+                'traceback': frames
+            })
+
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            'key': key,
+            'baseline_age_seconds': round(time.time() - baseline_time, 1),
+            'traced_mb': round(current / (1024 * 1024), 2),
+            'traced_peak_mb': round(peak / (1024 * 1024), 2),
+            'sites': sites
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get memory statistics and tracing state"""
+        status = self.stats.get_memory().to_dict() if self.stats is not None else {}
+        status.update({
+            'tracing': tracemalloc.is_tracing(),
+            'baseline_age_seconds': (
+                round(time.time() - self.baseline_time, 1) if self.baseline_time else None
+            ),
+            'sample_interval': self.sample_interval
+        })
+        return status
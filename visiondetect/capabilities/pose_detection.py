@@ -10,7 +10,9 @@ from mediapipe.python.solutions import pose
 
 from ..core.interfaces import Detector
 from ..core.config import get_config
+from ..utils.buffers import RGBBuffer
 from ..utils.logger import get_logger
+from ..utils.spans import span, timed
 
 
 class PoseDetector(Detector):
@@ -26,7 +28,19 @@ class PoseDetector(Detector):
         self.config = config or get_config()
         self.logger = get_logger()
         self.mp_pose = None
+        self.model_complexity = self.config.get('pose_detection.model_complexity', 1)
+        self.segmentation_threshold = self.config.get('presence.segmentation_threshold', 0.5)
         self._initialized = False
+        
+        # Reused every frame: RGB input, thresholded segmentation mask and result
+        self.rgb = RGBBuffer()
+        self._mask_buffer: Optional[np.ndarray] = None
+        self.result: Dict[str, Any] = {
+            'pose_landmarks': None,
+            'segmentation_mask': None,
+            'confidence': 0.0,
+            'present': False
+        }
     
     def initialize(self) -> bool:
         """Initialize MediaPipe Pose model"""
@@ -40,11 +54,15 @@ class PoseDetector(Detector):
                 min_detection_confidence=min_detection,
                 min_tracking_confidence=min_tracking,
                 enable_segmentation=enable_seg,
-                static_image_mode=static_mode
+                static_image_mode=static_mode,
+                model_complexity=self.model_complexity
             )
             
             self._initialized = True
-            self.logger.info(f"Pose detector initialized (confidence: {min_detection})")
+            self.logger.info(
+                f"Pose detector initialized (confidence: {min_detection}, "
+                f"complexity: {self.model_complexity})"
+            )
             return True
             
         except Exception as e:
@@ -63,6 +81,35 @@ class PoseDetector(Detector):
         """Check if detector is ready"""
         return self._initialized and self.mp_pose is not None
     
+    def set_model_complexity(self, complexity: int) -> bool:
+        """
+        Switch MediaPipe Pose model complexity, rebuilding the model if needed
+        
+        Args:
+            complexity: 0 (lite), 1 (full) or 2 (heavy)
+            
+        Returns:
+            True if the detector is ready with the requested complexity; on
+            failure the previous model is rebuilt and kept
+        """
+        if complexity == self.model_complexity and self.is_ready():
+            return True
+        
+        previous = self.model_complexity
+        if self.mp_pose:
+            self.mp_pose.close()
+            self.mp_pose = None
+        self._initialized = False
+        
+        self.model_complexity = complexity
+        if self.initialize():
+            return True
+        
+        # Only commit the new complexity once it loaded
+        self.model_complexity = previous
+        self.initialize()
+        return False
+    
     def detect(self, frame: np.ndarray) -> Dict[str, Any]:
         """
         Detect human pose in frame
@@ -71,7 +118,7 @@ class PoseDetector(Detector):
             frame: BGR image frame
             
         Returns:
-            Dictionary with detection results:
+            Dictionary with detection results, reused by the next call:
             {
                 'pose_landmarks': pose landmarks object or None,
                 'segmentation_mask': segmentation mask or None,
@@ -80,39 +127,35 @@ class PoseDetector(Detector):
             }
         """
         if not self.is_ready():
-            return {
-                'pose_landmarks': None,
-                'segmentation_mask': None,
-                'confidence': 0.0,
-                'present': False
-            }
+            return self._set_result(None, None, 0.0)
         
         try:
-            # Convert BGR to RGB
-            frame_rgb = frame[:, :, ::-1]  # Faster than cv2.cvtColor
+            # Convert BGR to RGB into the reused contiguous buffer
+            frame_rgb = self.rgb.convert(frame)
             
             # Process frame
-            results = self.mp_pose.process(frame_rgb)
+            with span('pose.inference'):
+                results = self.mp_pose.process(frame_rgb)
             
             # Calculate confidence
             confidence = self._calculate_confidence(results)
             
-            return {
-                'pose_landmarks': results.pose_landmarks,
-                'segmentation_mask': results.segmentation_mask,
-                'confidence': confidence,
-                'present': confidence > 0.5
-            }
+            return self._set_result(results.pose_landmarks, results.segmentation_mask, confidence)
             
         except Exception as e:
             self.logger.error(f"Error in pose detection: {e}")
-            return {
-                'pose_landmarks': None,
-                'segmentation_mask': None,
-                'confidence': 0.0,
-                'present': False
-            }
+            return self._set_result(None, None, 0.0)
+    
+    def _set_result(self, landmarks, mask, confidence: float) -> Dict[str, Any]:
+        """Fill the reused result dictionary"""
+        result = self.result
+        result['pose_landmarks'] = landmarks
+        result['segmentation_mask'] = mask
+        result['confidence'] = confidence
+        result['present'] = confidence > 0.5
+        return result
     
+    @timed('pose.confidence')
     def _calculate_confidence(self, pose_results) -> float:
         """
         Calculate confidence score for person presence
@@ -158,11 +201,12 @@ class PoseDetector(Detector):
         # Segmentation score
         segmentation_score = 0.0
         if pose_results.segmentation_mask is not None:
-            seg_threshold = self.config.get('presence.segmentation_threshold', 0.5)
             mask = pose_results.segmentation_mask
-            total_pixels = mask.shape[0] * mask.shape[1]
-            human_pixels = np.sum(mask > seg_threshold)
-            segmentation_score = min(human_pixels / total_pixels / 0.3, 1.0)
+            if self._mask_buffer is None or self._mask_buffer.shape != mask.shape:
+                self._mask_buffer = np.empty(mask.shape, dtype=bool)
+            np.greater(mask, self.segmentation_threshold, out=self._mask_buffer)
+            human_pixels = np.count_nonzero(self._mask_buffer)
+            segmentation_score = min(human_pixels / mask.size / 0.3, 1.0)
         
         # Weighted combination
         position_score = (0.4 if in_center else 0.0) + (0.3 if is_close else 0.0)
@@ -0,0 +1,294 @@
+"""
+Wake confirmation capability
+Probes a woken machine until it answers, re-sending the magic packet with
+exponential backoff, and keeps time-to-wake histograms
+"""
+
+import os
+import socket
+import struct
+import time
+from bisect import bisect_left
+from threading import Thread, Lock, Event
+from typing import Any, Callable, Dict, Optional
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+# Upper bounds (seconds) of the time-to-wake histogram buckets
+WAKE_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+def probe_tcp(host: str, port: int, timeout: float, accept_refused: bool = True) -> bool:
+    """
+    Check whether host answers on a TCP port
+
+    Args:
+        host: Hostname or IP address
+        port: TCP port
+        timeout: Seconds to wait
+        accept_refused: Count a refused connection as an answer; it proves
+                        the machine's network stack is up
+
+    Returns:
+        True if the host answered
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except ConnectionRefusedError:
+        return accept_refused
+    except OSError:
+        return False
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 Internet checksum"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def probe_icmp(host: str, timeout: float) -> bool:
+    """
+    Send one ICMP echo request through an unprivileged datagram socket
+
+    Needs net.ipv4.ping_group_range to include the process group; returns
+    False if the socket cannot be opened.
+
+    Args:
+        host: Hostname or IP address
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        True if an echo reply arrived
+    """
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError:
+        return False
+
+    with sock:
+        sock.settimeout(timeout)
+        # The kernel rewrites the identifier for datagram ICMP sockets
+        header = struct.pack('!BBHHH', 8, 0, 0, os.getpid() & 0xffff, 1)
+        payload = b'visiondetect'
+        checksum = _icmp_checksum(header + payload)
+        packet = struct.pack('!BBHHH', 8, 0, checksum, os.getpid() & 0xffff, 1) + payload
+        try:
+            sock.sendto(packet, (host, 0))
+            reply = sock.recv(1024)
+        except OSError:
+            return False
+        return len(reply) > 0 and reply[0] == 0
+
+
+class WakeHistogram:
+    """Fixed-bucket histogram of time-to-wake"""
+
+    def __init__(self, bounds=WAKE_BUCKETS):
+        """
+        Initialize histogram
+
+        Args:
+            bounds: Ascending bucket upper bounds in seconds
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.samples = 0
+
+    def record(self, seconds: float):
+        """Add one time-to-wake sample"""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.samples += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Cumulative bucket counts keyed by upper bound"""
+        buckets = {}
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            buckets[f'le_{bound}s'] = running
+        buckets['le_inf'] = running + self.counts[-1]
+        return {
+            'samples': self.samples,
+            'avg_seconds': round(self.total / self.samples, 2) if self.samples else 0.0,
+            'buckets': buckets
+        }
+
+
+class WakeConfirmer:
+    """Background wake confirmation with retry and exponential backoff"""
+
+    def __init__(self, config: Optional[Any] = None, stats: Optional[Any] = None):
+        """
+        Initialize wake confirmer
+
+        Args:
+            config: Configuration object (uses global if None)
+            stats: StatisticsManager counting confirmations
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+        self.stats = stats
+
+        self.enabled = self.config.get('wol.confirm.enabled', True)
+        self.method = self.config.get('wol.confirm.method', 'tcp')
+        self.port = self.config.get('wol.confirm.port', 22)
+        self.probe_interval = self.config.get('wol.confirm.probe_interval', 1.0)
+        self.probe_timeout = self.config.get('wol.confirm.probe_timeout', 0.5)
+        self.initial_backoff = self.config.get('wol.confirm.initial_backoff', 2.0)
+        self.max_backoff = self.config.get('wol.confirm.max_backoff', 30.0)
+        self.deadline = self.config.get('wol.confirm.deadline', 120.0)
+        self.accept_refused = self.config.get('wol.confirm.accept_refused', True)
+
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.active: Dict[str, Thread] = {}
+        self.state: Dict[str, Dict[str, Any]] = {}
+        self.histograms: Dict[str, WakeHistogram] = {}
+
+    def probe(self, host: str, port: Optional[int] = None, method: Optional[str] = None) -> bool:
+        """
+        Probe host once
+
+        Args:
+            host: Hostname or IP address
+            port: TCP port (uses wol.confirm.port if None)
+            method: 'tcp' or 'icmp' (uses wol.confirm.method if None)
+
+        Returns:
+            True if the host answered
+        """
+        if (method or self.method) == 'icmp':
+            return probe_icmp(host, self.probe_timeout)
+        return probe_tcp(host, port or self.port, self.probe_timeout, self.accept_refused)
+
+    def start(
+        self,
+        name: str,
+        host: str,
+        resend: Callable[[], bool],
+        port: Optional[int] = None,
+        method: Optional[str] = None
+    ) -> bool:
+        """
+        Start confirming that a target woke up
+
+        Args:
+            name: Target name
+            host: Address to probe
+            resend: Sends the magic packet again, returns success
+            port: Probe port override
+            method: Probe method override
+
+        Returns:
+            True if a confirmation was started, False if one is already running
+        """
+        if not self.enabled:
+            return False
+
+        with self.lock:
+            running = self.active.get(name)
+            if running is not None and running.is_alive():
+                return False
+
+            self.stop_event.clear()
+            self.state[name] = {'state': 'confirming', 'resends': 0, 'time_to_wake': None}
+            thread = Thread(
+                target=self._confirm_loop,
+                args=(name, host, resend, port, method),
+                name=f"wake-confirm-{name}",
+                daemon=True
+            )
+            self.active[name] = thread
+            thread.start()
+        return True
+
+    def stop(self):
+        """Abandon running confirmations"""
+        self.stop_event.set()
+        with self.lock:
+            threads = list(self.active.values())
+        for thread in threads:
+            thread.join(timeout=self.probe_timeout + 1.0)
+
+    def _confirm_loop(
+        self,
+        name: str,
+        host: str,
+        resend: Callable[[], bool],
+        port: Optional[int],
+        method: Optional[str]
+    ):
+        """Probe until the target answers, re-sending on a backoff schedule"""
+        start = time.monotonic()
+        backoff = self.initial_backoff
+        next_resend = start + backoff
+        resends = 0
+
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if now - start >= self.deadline:
+                self._finish(name, False, now - start, resends)
+                return
+
+            if self.probe(host, port, method):
+                self._finish(name, True, time.monotonic() - start, resends)
+                return
+
+            now = time.monotonic()
+            if now >= next_resend:
+                resends += 1
+                with self.lock:
+                    self.state[name]['resends'] = resends
+                self.logger.info(f"'{name}' not awake yet, re-sending WOL (attempt {resends + 1})")
+                try:
+                    resend()
+                except Exception as e:
+                    self.logger.error(f"WOL re-send to '{name}' failed: {e}")
+                backoff = min(backoff * 2, self.max_backoff)
+                next_resend = now + backoff
+
+            self.stop_event.wait(self.probe_interval)
+
+    def _finish(self, name: str, awake: bool, elapsed: float, resends: int):
+        """Record the outcome of a confirmation"""
+        with self.lock:
+            self.state[name] = {
+                'state': 'awake' if awake else 'timeout',
+                'resends': resends,
+                'time_to_wake': round(elapsed, 2) if awake else None
+            }
+            if awake:
+                self.histograms.setdefault(name, WakeHistogram()).record(elapsed)
+
+        if awake:
+            self.logger.info(f"'{name}' is awake after {elapsed:.1f}s ({resends} re-sends)")
+        else:
+            self.logger.warning(f"'{name}' did not answer within {self.deadline:g}s")
+
+        if self.stats is not None:
+            self.stats.record_wake_confirmation(name, awake)
+
+    def get_status(self, name: str) -> Dict[str, Any]:
+        """
+        Get confirmation state and time-to-wake histogram of a target
+
+        Args:
+            name: Target name
+
+        Returns:
+            Dictionary with last state and histogram
+        """
+        with self.lock:
+            state = dict(self.state.get(name, {'state': 'idle', 'resends': 0, 'time_to_wake': None}))
+            histogram = self.histograms.get(name)
+            state['histogram'] = histogram.to_dict() if histogram else WakeHistogram().to_dict()
+        return state
@@ -4,23 +4,180 @@ Sends WOL magic packets to wake target computers
 """
 
 import os
+import socket
 import time
-from typing import Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Any, Dict, List, Sequence
 
 from ..core.interfaces import Notifier
 from ..core.config import get_config
 from ..utils.logger import get_logger
+from ..utils.statistics import get_statistics
+from .wake_confirm import WakeConfirmer
+
+
+ETHERTYPE_WOL = 0x0842
+
+
+def parse_mac(mac: str) -> bytes:
+    """
+    Parse a MAC address such as 'aa:bb:cc:dd:ee:ff' or 'AA-BB-CC-DD-EE-FF'
+    
+    Args:
+        mac: MAC address string
+        
+    Returns:
+        6 raw bytes
+    """
+    digits = mac.replace(':', '').replace('-', '').replace('.', '')
+    if len(digits) != 12:
+        raise ValueError(f"Invalid MAC address: {mac}")
+    return bytes.fromhex(digits)
+
+
+def build_magic_packet(mac: str) -> bytes:
+    """
+    Build a 102-byte magic packet: 6 x 0xFF followed by the MAC 16 times
+    
+    Args:
+        mac: Target MAC address
+        
+    Returns:
+        Packet payload
+    """
+    return b'\xff' * 6 + parse_mac(mac) * 16
+
+
+class MagicPacketSender:
+    """Sends a prebuilt magic packet over a reusable raw or UDP socket"""
+    
+    def __init__(
+        self,
+        mac: str,
+        broadcast: str = '255.255.255.255',
+        port: int = 9,
+        interface: Optional[str] = None,
+        method: str = 'auto'
+    ):
+        """
+        Initialize sender; the packet is built once here
+        
+        Args:
+            mac: Target MAC address
+            broadcast: UDP broadcast address
+            port: UDP port (7 or 9)
+            interface: Network interface; required for raw sends
+            method: 'raw' (Ethernet frame like etherwake), 'udp', or 'auto'
+                    (raw if permitted, otherwise UDP)
+        """
+        self.mac = mac
+        self.payload = build_magic_packet(mac)
+        self.address = (broadcast, port)
+        self.interface = interface
+        self.method = method
+        self.frame: Optional[bytes] = None
+        self.sock: Optional[socket.socket] = None
+        self.transport: Optional[str] = None
+    
+    def open(self):
+        """Open the socket, preferring a raw Ethernet socket when allowed"""
+        if self.method in ('auto', 'raw') and self.interface and hasattr(socket, 'AF_PACKET'):
+            try:
+                sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW)
+                sock.bind((self.interface, 0))
+                source = parse_mac(self._interface_mac())
+                self.frame = b'\xff' * 6 + source + ETHERTYPE_WOL.to_bytes(2, 'big') + self.payload
+                self.sock = sock
+                self.transport = 'raw'
+                return
+            except (OSError, ValueError):
+                # Raw sockets need CAP_NET_RAW; fall through to UDP
+                if self.method == 'raw':
+                    raise
+        
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if self.interface and hasattr(socket, 'SO_BINDTODEVICE'):
+            try:
+                sock.setsockopt(
+                    socket.SOL_SOCKET, socket.SO_BINDTODEVICE, self.interface.encode()
+                )
+            except OSError:
+                pass
+        self.sock = sock
+        self.transport = 'udp'
+    
+    def _interface_mac(self) -> str:
+        """Read the interface's own MAC address from sysfs"""
+        with open(f'/sys/class/net/{self.interface}/address') as f:
+            return f.read().strip()
+    
+    def send(self):
+        """Send the packet, reopening the socket once if it went bad"""
+        for attempt in (0, 1):
+            if self.sock is None:
+                self.open()
+            try:
+                if self.transport == 'raw':
+                    self.sock.send(self.frame)
+                else:
+                    self.sock.sendto(self.payload, self.address)
+                return
+            except OSError:
+                self.close()
+                if attempt:
+                    raise
+    
+    def close(self):
+        """Close the socket"""
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+@dataclass
+class WOLTarget:
+    """A machine that can be woken, with its own cooldown"""
+    name: str
+    mac: Optional[str]
+    cooldown: float
+    broadcast: str = '255.255.255.255'
+    port: int = 9
+    interface: Optional[str] = None
+    method: str = 'auto'
+    gestures: List[str] = field(default_factory=lambda: ['victory'])
+    script_path: Optional[str] = None
+    host: Optional[str] = None
+    probe_port: Optional[int] = None
+    probe_method: Optional[str] = None
+    sender: Optional[MagicPacketSender] = None
+    cooldown_timer: Optional[Any] = None
+    last_wol_time: float = 0.0
+    sends: int = 0
+    failures: int = 0
+    
+    def cooldown_remaining(self) -> float:
+        """Seconds left in this target's cooldown"""
+        if self.cooldown_timer is not None:
+            return self.cooldown_timer.remaining()
+        return max(0.0, self.cooldown - (time.time() - self.last_wol_time))
 
 
 class WOLNotifier(Notifier):
-    """Wake-on-LAN notification sender"""
+    """Wake-on-LAN notification sender for one or more targets"""
     
-    def __init__(self, config: Optional[Any] = None):
+    def __init__(self, config: Optional[Any] = None, timers: Optional[Any] = None):
         """
         Initialize WOL notifier
         
+        Targets come from wol.targets. Without it a single 'default' target
+        is built from wol.mac (or TARGET_MAC, which WOL.sh reads from .env)
+        with WOL.sh as its fallback.
+        
         Args:
             config: Configuration object (uses global if None)
+            timers: TimerService owning the cooldown expiries
         """
         self.config = config or get_config()
         self.logger = get_logger()
@@ -28,21 +185,86 @@ class WOLNotifier(Notifier):
         self.script_path = self.config.get('wol.script_path', './WOL.sh')
         self.cooldown = self.config.get('wol.cooldown', 90)
         self.last_wol_time = 0
+        self.max_parallel = max(1, self.config.get('wol.max_parallel', 4))
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._initialized = False
+        
+        raw_targets = self.config.get('wol.targets') or [{
+            'name': 'default',
+            'mac': self.config.get('wol.mac') or os.environ.get('TARGET_MAC'),
+            'script_path': self.script_path
+        }]
+        
+        self.targets: Dict[str, WOLTarget] = {}
+        for index, raw in enumerate(raw_targets):
+            target = WOLTarget(
+                name=raw.get('name', f'target{index}'),
+                mac=raw.get('mac'),
+                cooldown=raw.get('cooldown', self.cooldown),
+                broadcast=raw.get('broadcast', self.config.get('wol.broadcast', '255.255.255.255')),
+                port=raw.get('port', self.config.get('wol.port', 9)),
+                interface=raw.get('interface', self.config.get('wol.interface')),
+                method=raw.get('method', self.config.get('wol.method', 'auto')),
+                gestures=list(raw.get('gestures', ['victory'])),
+                script_path=raw.get('script_path'),
+                host=raw.get('host', self.config.get('wol.confirm.host') if index == 0 else None),
+                probe_port=raw.get('probe_port'),
+                probe_method=raw.get('probe_method')
+            )
+            if timers is not None:
+                target.cooldown_timer = timers.create(
+                    f'wol-cooldown:{target.name}',
+                    lambda name=target.name: self._cooldown_expired(name)
+                )
+            self.targets[target.name] = target
+        
+        # Targets with a host are probed until they answer
+        self.confirmer = WakeConfirmer(self.config, get_statistics())
+        
+        # Gesture-to-packet latency
+        self.sends = 0
+        self.script_sends = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.latency_samples = 0
+        self.last_send_time = 0.0
     
     def initialize(self) -> bool:
         """Initialize WOL notifier"""
         try:
-            # Check if WOL script exists
-            if os.path.exists(self.script_path):
-                self.logger.info(f"WOL notifier initialized (script: {self.script_path})")
-                self._initialized = True
-                return True
-            else:
-                self.logger.warning(f"WOL script not found: {self.script_path}")
-                # Still initialize but with warning
-                self._initialized = True
-                return True
+            for target in self.targets.values():
+                if target.mac:
+                    target.sender = MagicPacketSender(
+                        target.mac,
+                        broadcast=target.broadcast,
+                        port=target.port,
+                        interface=target.interface,
+                        method=target.method
+                    )
+                    target.sender.open()
+                    self.logger.info(
+                        f"WOL target '{target.name}': {target.sender.transport} magic packet "
+                        f"to {target.mac} (cooldown {target.cooldown}s)"
+                    )
+                elif target.script_path and os.path.exists(target.script_path):
+                    self.logger.info(f"WOL target '{target.name}': script {target.script_path}")
+                else:
+                    # Still initialize but with warning
+                    self.logger.warning(
+                        f"WOL target '{target.name}' has no MAC and no script "
+                        f"({target.script_path or 'none'})"
+                    )
+            
+            if len(self.targets) > 1:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=min(self.max_parallel, len(self.targets)),
+                    thread_name_prefix='wol'
+                )
+            
+            self.logger.info(f"WOL notifier initialized ({len(self.targets)} targets)")
+            self._initialized = True
+            return True
                 
         except Exception as e:
             self.logger.error(f"Failed to initialize WOL notifier: {e}")
@@ -50,6 +272,14 @@ class WOLNotifier(Notifier):
     
     def cleanup(self):
         """Clean up resources"""
+        self.confirmer.stop()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        for target in self.targets.values():
+            if target.sender is not None:
+                target.sender.close()
+                target.sender = None
         self._initialized = False
         self.logger.info("WOL notifier cleaned up")
     
@@ -57,57 +287,146 @@ class WOLNotifier(Notifier):
         """Check if notifier is ready"""
         return self._initialized
     
+    def select_targets(
+        self,
+        names: Optional[Sequence[str]] = None,
+        gesture: Optional[str] = None
+    ) -> List[WOLTarget]:
+        """
+        Resolve target names and/or a gesture to targets
+        
+        Args:
+            names: Target names (all targets if None)
+            gesture: Only targets bound to this gesture
+            
+        Returns:
+            Matching targets
+        """
+        if names is None:
+            targets = list(self.targets.values())
+        else:
+            unknown = [name for name in names if name not in self.targets]
+            if unknown:
+                raise KeyError(f"Unknown WOL target(s): {', '.join(unknown)}")
+            targets = [self.targets[name] for name in names]
+        
+        if gesture is not None:
+            targets = [target for target in targets if gesture in target.gestures]
+        return targets
+    
     def notify(self, message: str = "WOL", **kwargs) -> bool:
         """
         Send WOL notification
         
         Args:
             message: Optional message (not used for WOL)
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters:
+                      targets - target names (all targets if omitted)
+                      gesture - only wake targets bound to this gesture
+                      requested_at - monotonic trigger time (e.g. gesture
+                      confirmation) used to measure trigger-to-packet latency
             
         Returns:
-            True if WOL sent successfully
+            True if WOL was sent to at least one target
         """
         if not self.is_ready():
             self.logger.error("WOL notifier not ready")
             return False
         
-        # Check cooldown
-        current_time = time.time()
-        time_since_last = current_time - self.last_wol_time
+        targets = self.select_targets(kwargs.get('targets'), kwargs.get('gesture'))
+        
+        # Check cooldowns
+        ready = []
+        for target in targets:
+            remaining = target.cooldown_remaining()
+            if remaining > 0:
+                self.logger.info(
+                    f"WOL cooldown active for '{target.name}'. {int(remaining)}s remaining"
+                )
+            else:
+                ready.append(target)
         
-        if time_since_last < self.cooldown:
-            remaining = int(self.cooldown - time_since_last)
-            self.logger.info(f"WOL cooldown active. {remaining}s remaining")
+        if not ready:
             return False
         
-        # Send WOL
-        success = self._send_wol()
+        # Send to every ready target at once
+        if len(ready) == 1 or self._pool is None:
+            results = [self._send_target(target) for target in ready]
+        else:
+            results = list(self._pool.map(self._send_target, ready))
         
+        success = any(results)
         if success:
-            self.last_wol_time = current_time
-            self.logger.info("WOL packet sent successfully")
+            self.last_wol_time = time.time()
+            self._record_latency(kwargs.get('requested_at'))
+        return success
+    
+    def _send_target(self, target: WOLTarget) -> bool:
+        """Send to one target and start its cooldown"""
+        success = self._send_wol(target)
+        
+        if success:
+            target.last_wol_time = time.time()
+            target.sends += 1
+            if target.cooldown_timer is not None:
+                target.cooldown_timer.arm(target.cooldown)
+            self.logger.info(f"WOL packet sent to '{target.name}'")
+            
+            if target.host:
+                self.confirmer.start(
+                    target.name,
+                    target.host,
+                    resend=lambda: self._send_wol(target),
+                    port=target.probe_port,
+                    method=target.probe_method
+                )
         else:
-            self.logger.error("Failed to send WOL packet")
+            target.failures += 1
+            self.logger.error(f"Failed to send WOL packet to '{target.name}'")
         
         return success
     
-    def _send_wol(self) -> bool:
+    def _send_wol(self, target: WOLTarget) -> bool:
+        """
+        Send the magic packet natively, falling back to the target's script
+        
+        Args:
+            target: Target to wake
+            
+        Returns:
+            True if the packet was sent
+        """
+        if target.sender is not None:
+            try:
+                target.sender.send()
+                return True
+            except OSError as e:
+                self.logger.error(f"Native WOL send to '{target.name}' failed: {e}")
+        
+        if target.script_path:
+            return self._run_script(target.script_path)
+        return False
+    
+    def _run_script(self, script_path: str) -> bool:
         """
         Execute WOL script
         
+        Args:
+            script_path: Script to run
+            
         Returns:
             True if script executed successfully
         """
         try:
-            if not os.path.exists(self.script_path):
-                self.logger.error(f"WOL script not found: {self.script_path}")
+            if not os.path.exists(script_path):
+                self.logger.error(f"WOL script not found: {script_path}")
                 return False
             
             # Execute script
-            result = os.system(self.script_path)
+            result = os.system(script_path)
             
             if result == 0:
+                self.script_sends += 1
                 return True
             else:
                 self.logger.error(f"WOL script failed with exit code: {result}")
@@ -117,25 +436,76 @@ class WOLNotifier(Notifier):
             self.logger.error(f"Error executing WOL script: {e}")
             return False
     
-    def can_send(self) -> bool:
+    def can_send(self, target: Optional[str] = None) -> bool:
         """
         Check if WOL can be sent (not in cooldown)
         
+        Args:
+            target: Target name; any target if None
+            
         Returns:
             True if can send
         """
-        current_time = time.time()
-        return (current_time - self.last_wol_time) >= self.cooldown
+        targets = self.select_targets([target] if target else None)
+        return any(t.cooldown_remaining() <= 0 for t in targets)
     
-    def get_cooldown_remaining(self) -> int:
+    def get_cooldown_remaining(self, target: Optional[str] = None) -> int:
         """
         Get remaining cooldown time
         
+        Args:
+            target: Target name; the soonest-ready target if None
+            
         Returns:
             Seconds remaining in cooldown, or 0 if ready
         """
-        current_time = time.time()
-        elapsed = current_time - self.last_wol_time
-        remaining = self.cooldown - elapsed
+        targets = self.select_targets([target] if target else None)
+        if not targets:
+            return 0
+        return int(min(t.cooldown_remaining() for t in targets))
+    
+    def _cooldown_expired(self, name: str):
+        """Cooldown timer callback (timer thread)"""
+        self.logger.info(f"WOL cooldown for '{name}' expired, ready to send")
+    
+    def _record_latency(self, requested_at: Optional[float]):
+        """Record trigger-to-packet latency of a successful send"""
+        now = time.monotonic()
+        self.sends += 1
+        self.last_send_time = now
         
-        return max(0, int(remaining))
+        if requested_at is None:
+            return
+        
+        latency = now - requested_at
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+        self.latency_samples += 1
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-target cooldowns, sender and latency status"""
+        avg = self.total_latency / self.latency_samples if self.latency_samples else 0.0
+        return {
+            'sends': self.sends,
+            'script_sends': self.script_sends,
+            'cooldown_remaining': self.get_cooldown_remaining(),
+            'last_latency_ms': round(self.last_latency * 1000, 2),
+            'avg_latency_ms': round(avg * 1000, 2),
+            'max_latency_ms': round(self.max_latency * 1000, 2),
+            'targets': {
+                target.name: {
+                    'mac': target.mac,
+                    'transport': target.sender.transport if target.sender is not None else 'script',
+                    'gestures': target.gestures,
+                    'cooldown': target.cooldown,
+                    'cooldown_remaining': int(target.cooldown_remaining()),
+                    'ready': target.cooldown_remaining() <= 0,
+                    'sends': target.sends,
+                    'failures': target.failures,
+                    'host': target.host,
+                    'wake': self.confirmer.get_status(target.name)
+                }
+                for target in self.targets.values()
+            }
+        }
@@ -0,0 +1,337 @@
+"""
+Action executor module
+Runs side effects (light, WOL, notifiers) on a small fixed worker pool
+so slow actions never block detection or the HTTP server
+"""
+
+import time
+from dataclasses import dataclass, field
+from queue import Queue, Full, Empty
+from threading import Thread, Lock, Event
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+@dataclass
+class Action:
+    """A queued side effect"""
+    name: str
+    func: Callable[..., Any]
+    args: tuple = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    key: Hashable = None
+    timeout: float = 10.0
+    submitted_at: float = 0.0
+
+
+@dataclass
+class ActionMetrics:
+    """Per-action counters and latency"""
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    deduplicated: int = 0
+    dropped: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    last_latency: float = 0.0
+
+    def to_dict(self) -> Dict:
+        """Convert metrics to dictionary"""
+        finished = self.completed + self.failed
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'timed_out': self.timed_out,
+            'deduplicated': self.deduplicated,
+            'dropped': self.dropped,
+            'avg_latency_ms': round(self.total_latency / finished * 1000, 2) if finished else 0.0,
+            'max_latency_ms': round(self.max_latency * 1000, 2),
+            'last_latency_ms': round(self.last_latency * 1000, 2)
+        }
+
+
+class _WorkerSlot:
+    """Book-keeping for one worker thread"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.thread: Optional[Thread] = None
+        self.action: Optional[Action] = None
+        self.started_at = 0.0
+        self.timed_out = False
+        self.abandoned = False
+
+
+class ActionExecutor:
+    """Bounded, deduplicating worker pool for side-effect actions"""
+
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Initialize action executor
+
+        Args:
+            config: Configuration object (uses global if None)
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+
+        self.num_workers = max(1, self.config.get('actions.workers', 2))
+        self.queue_size = max(1, self.config.get('actions.queue_size', 16))
+        self.default_timeout = self.config.get('actions.default_timeout', 10.0)
+        self.timeouts = self.config.get('actions.timeouts', {}) or {}
+        self.max_abandoned = max(0, self.config.get('actions.max_abandoned', 4))
+
+        self.queue: Queue = Queue(maxsize=self.queue_size)
+        self.pending: set = set()
+        self.metrics: Dict[str, ActionMetrics] = {}
+        self.lock = Lock()
+
+        self.slots: List[_WorkerSlot] = []
+        # Replaced workers still stuck in an action; threads cannot be killed
+        self.abandoned: List[_WorkerSlot] = []
+        self.stop_event = Event()
+        self.supervisor_thread: Optional[Thread] = None
+        self.running = False
+
+    def start(self):
+        """Start worker and supervisor threads"""
+        if self.running:
+            return
+
+        self.running = True
+        self.stop_event.clear()
+        self.slots = [_WorkerSlot(i) for i in range(self.num_workers)]
+        for slot in self.slots:
+            self._spawn_worker(slot)
+
+        self.supervisor_thread = Thread(target=self._supervise, daemon=True)
+        self.supervisor_thread.start()
+
+        self.logger.info(
+            f"Action executor started ({self.num_workers} workers, queue {self.queue_size})"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop executor after running the actions already queued
+
+        New submissions are refused right away; whatever is still queued
+        when the timeout runs out is discarded and counted as dropped.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain and workers to exit
+        """
+        if not self.running:
+            return
+
+        self.running = False
+        self.stop_event.set()
+
+        deadline = time.monotonic() + timeout
+        for slot in self.slots:
+            if slot.thread:
+                slot.thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        if self.supervisor_thread:
+            self.supervisor_thread.join(timeout=max(0.0, deadline - time.monotonic()))
+
+        # Never carry leftovers or late workers over into a later start()
+        with self.lock:
+            for slot in self.slots:
+                slot.abandoned = True
+            leftover = 0
+            while True:
+                try:
+                    action = self.queue.get_nowait()
+                except Empty:
+                    break
+                self._metrics_for(action.name).dropped += 1
+                leftover += 1
+            self.pending.clear()
+
+        if leftover:
+            self.logger.warning(f"Action executor stopped, dropped {leftover} queued actions")
+        else:
+            self.logger.info("Action executor stopped")
+
+    def submit(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        *args,
+        key: Hashable = None,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Queue an action
+
+        Args:
+            name: Action name used for metrics and timeouts
+            func: Callable performing the side effect
+            *args: Positional arguments for func
+            key: Deduplication key (defaults to name and args)
+            timeout: Seconds before the action counts as timed out
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            True if queued, False if deduplicated, dropped or not running
+        """
+        if key is None:
+            key = (name,) + args
+
+        if timeout is None:
+            timeout = self.timeouts.get(name, self.default_timeout)
+
+        action = Action(
+            name=name,
+            func=func,
+            args=args,
+            kwargs=kwargs,
+            key=key,
+            timeout=timeout,
+            submitted_at=time.perf_counter()
+        )
+
+        with self.lock:
+            metrics = self._metrics_for(name)
+
+            if not self.running:
+                metrics.dropped += 1
+                return False
+
+            if key in self.pending:
+                metrics.deduplicated += 1
+                return False
+
+            try:
+                self.queue.put_nowait(action)
+            except Full:
+                metrics.dropped += 1
+                self.logger.warning(f"Action queue full, dropped '{name}'")
+                return False
+
+            self.pending.add(key)
+            metrics.submitted += 1
+
+        return True
+
+    def _metrics_for(self, name: str) -> ActionMetrics:
+        """Get metrics entry for action name (caller holds lock)"""
+        metrics = self.metrics.get(name)
+        if metrics is None:
+            metrics = self.metrics[name] = ActionMetrics()
+        return metrics
+
+    def _spawn_worker(self, slot: _WorkerSlot):
+        """Start a worker thread for slot"""
+        slot.action = None
+        slot.timed_out = False
+        slot.abandoned = False
+        slot.thread = Thread(
+            target=self._worker_loop,
+            args=(slot,),
+            name=f"action-worker-{slot.index}",
+            daemon=True
+        )
+        slot.thread.start()
+
+    def _worker_loop(self, slot: _WorkerSlot):
+        """Take actions from the queue and run them until stopped and drained"""
+        while not slot.abandoned:
+            try:
+                action = self.queue.get(timeout=0.5)
+            except Empty:
+                if self.stop_event.is_set():
+                    return
+                continue
+
+            with self.lock:
+                self.pending.discard(action.key)
+                slot.action = action
+                slot.started_at = time.perf_counter()
+
+            success = True
+            try:
+                action.func(*action.args, **action.kwargs)
+            except Exception as e:
+                success = False
+                self.logger.error(f"Action '{action.name}' failed: {e}")
+
+            latency = time.perf_counter() - action.submitted_at
+
+            with self.lock:
+                # A timed-out action was already counted as such
+                if not slot.timed_out:
+                    metrics = self._metrics_for(action.name)
+                    if success:
+                        metrics.completed += 1
+                    else:
+                        metrics.failed += 1
+                    metrics.total_latency += latency
+                    metrics.last_latency = latency
+                    metrics.max_latency = max(metrics.max_latency, latency)
+
+                if slot.abandoned:
+                    # Supervisor already replaced this worker
+                    return
+                slot.action = None
+                slot.timed_out = False
+
+    def _supervise(self):
+        """Replace workers stuck in an action past its timeout, up to max_abandoned"""
+        while not self.stop_event.wait(0.5):
+            now = time.perf_counter()
+
+            with self.lock:
+                self.abandoned = [slot for slot in self.abandoned if slot.thread.is_alive()]
+
+                for slot in self.slots:
+                    action = slot.action
+                    if (action is None or slot.timed_out or
+                            now - slot.started_at <= action.timeout):
+                        continue
+
+                    slot.timed_out = True
+                    self._metrics_for(action.name).timed_out += 1
+
+                    if len(self.abandoned) >= self.max_abandoned:
+                        # Stop leaking threads; the slot stays busy until
+                        # the action returns and the pool runs degraded
+                        self.logger.warning(
+                            f"Action '{action.name}' exceeded {action.timeout}s timeout; "
+                            f"{len(self.abandoned)} workers already abandoned, "
+                            f"worker {slot.index} is not replaced"
+                        )
+                        continue
+
+                    self.logger.warning(
+                        f"Action '{action.name}' exceeded {action.timeout}s timeout, "
+                        f"replacing worker {slot.index}"
+                    )
+
+                    # The stuck thread cannot be killed; detach it and keep
+                    # pool capacity with a fresh worker in the same slot
+                    slot.abandoned = True
+                    self.abandoned.append(slot)
+                    replacement = _WorkerSlot(slot.index)
+                    self.slots[slot.index] = replacement
+                    self._spawn_worker(replacement)
+
+    def get_stats(self) -> Dict:
+        """Get executor statistics"""
+        with self.lock:
+            return {
+                'running': self.running,
+                'workers': self.num_workers,
+                'busy_workers': sum(1 for slot in self.slots if slot.action is not None),
+                'abandoned_workers': len(self.abandoned),
+                'degraded': any(slot.timed_out for slot in self.slots),
+                'queue_depth': self.queue.qsize(),
+                'queue_size': self.queue_size,
+                'actions': {name: m.to_dict() for name, m in self.metrics.items()}
+            }
@@ -0,0 +1,189 @@
+"""
+Deep-idle module
+Switches the pipeline to a low-FPS thumbnail motion watch when the room
+has been empty for a while, and measures how fast it wakes up again
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ..core.config import get_config
+
+
+class MotionDetector:
+    """Frame-difference motion detector on small grayscale thumbnails"""
+
+    def __init__(
+        self,
+        thumbnail_width: int = 64,
+        pixel_threshold: int = 25,
+        area_threshold: float = 0.01
+    ):
+        """
+        Initialize motion detector
+
+        Args:
+            thumbnail_width: Approximate thumbnail width in pixels
+            pixel_threshold: Gray-level change that marks a pixel as changed
+            area_threshold: Fraction of changed pixels that counts as motion
+        """
+        self.thumbnail_width = max(8, thumbnail_width)
+        self.pixel_threshold = pixel_threshold
+        self.area_threshold = area_threshold
+        self.previous: Optional[np.ndarray] = None
+        self.last_score = 0.0
+
+    def thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Downsample a BGR frame to a small int16 grayscale image"""
+        stride = max(1, frame.shape[1] // self.thumbnail_width)
+        small = frame[::stride, ::stride]
+        # Integer approximation of BT.601 luma; the weights sum to 256 so
+        # the weighted sum fits in uint16
+        gray = (
+            small[:, :, 0].astype(np.uint16) * 29 +
+            small[:, :, 1].astype(np.uint16) * 150 +
+            small[:, :, 2].astype(np.uint16) * 77
+        ) >> 8
+        return gray.astype(np.int16)
+
+    def detect(self, frame: np.ndarray) -> bool:
+        """
+        Compare frame against the previous thumbnail
+
+        Args:
+            frame: BGR image frame
+
+        Returns:
+            True if enough of the image changed
+        """
+        thumb = self.thumbnail(frame)
+
+        if self.previous is None or self.previous.shape != thumb.shape:
+            self.previous = thumb
+            return False
+
+        changed = np.count_nonzero(np.abs(thumb - self.previous) > self.pixel_threshold)
+        self.last_score = changed / thumb.size
+        self.previous = thumb
+
+        return self.last_score >= self.area_threshold
+
+    def reset(self):
+        """Forget the reference thumbnail"""
+        self.previous = None
+        self.last_score = 0.0
+
+
+class IdleStateMachine:
+    """Tracks active / deep-idle / resuming states and resume latency"""
+
+    ACTIVE = 'active'
+    DEEP_IDLE = 'deep_idle'
+    RESUMING = 'resuming'
+
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Initialize idle state machine
+
+        Args:
+            config: Configuration object (uses global if None)
+        """
+        self.config = config or get_config()
+
+        self.enabled = self.config.get('idle.enabled', True)
+        self.quiet_period = self.config.get('idle.quiet_period', 600)
+        self.require_light_off = self.config.get('idle.require_light_off', True)
+        self.idle_fps = max(0.1, self.config.get('idle.fps', 2))
+        self.release_camera = self.config.get('idle.release_camera', False)
+        self.probe_interval = self.config.get('idle.probe_interval', 5.0)
+        self.unload_hand_detector = self.config.get('idle.unload_hand_detector', True)
+
+        self.state = self.ACTIVE
+        self.last_activity = time.monotonic()
+        self.idle_since = 0.0
+        self.resume_started = 0.0
+
+        self.idle_entries = 0
+        self.resumes = 0
+        self.idle_seconds = 0.0
+        self.last_resume_latency = 0.0
+        self.max_resume_latency = 0.0
+        self.total_resume_latency = 0.0
+
+    @property
+    def watch_interval(self) -> float:
+        """Seconds between motion checks while idle"""
+        return self.probe_interval if self.release_camera else 1.0 / self.idle_fps
+
+    def should_enter_idle(self, person_present: bool, light_on: bool, now: float) -> bool:
+        """
+        Update activity and decide whether to enter deep idle
+
+        Args:
+            person_present: Smoothed presence decision
+            light_on: Current light state
+            now: Monotonic timestamp
+
+        Returns:
+            True if the quiet period has elapsed
+        """
+        if person_present or (self.require_light_off and light_on):
+            self.last_activity = now
+            return False
+
+        return (
+            self.enabled and
+            self.state == self.ACTIVE and
+            now - self.last_activity >= self.quiet_period
+        )
+
+    def enter_idle(self, now: float):
+        """Switch to deep idle"""
+        self.state = self.DEEP_IDLE
+        self.idle_since = now
+        self.idle_entries += 1
+
+    def motion_detected(self, now: float):
+        """Leave deep idle; resume latency is measured from now"""
+        self.state = self.RESUMING
+        self.resume_started = now
+        self.idle_seconds += now - self.idle_since
+
+    def full_detection_done(self, now: float) -> Optional[float]:
+        """
+        Mark the first full detection after motion
+
+        Args:
+            now: Monotonic timestamp
+
+        Returns:
+            Resume latency in seconds if this completed a resume, else None
+        """
+        if self.state != self.RESUMING:
+            return None
+
+        latency = now - self.resume_started
+        self.state = self.ACTIVE
+        self.last_activity = now
+        self.resumes += 1
+        self.last_resume_latency = latency
+        self.total_resume_latency += latency
+        self.max_resume_latency = max(self.max_resume_latency, latency)
+        return latency
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get idle state machine status"""
+        avg = self.total_resume_latency / self.resumes if self.resumes else 0.0
+        return {
+            'enabled': self.enabled,
+            'state': self.state,
+            'seconds_since_activity': round(time.monotonic() - self.last_activity, 1),
+            'idle_entries': self.idle_entries,
+            'resumes': self.resumes,
+            'idle_seconds': round(self.idle_seconds, 1),
+            'last_resume_latency_ms': round(self.last_resume_latency * 1000, 1),
+            'avg_resume_latency_ms': round(avg * 1000, 1),
+            'max_resume_latency_ms': round(self.max_resume_latency * 1000, 1)
+        }
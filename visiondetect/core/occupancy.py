@@ -0,0 +1,332 @@
+"""
+Occupancy analytics module
+Bins smoothed per-zone presence into an hour-of-week occupancy matrix and
+tracks sessions, updated in O(1) per decision and persisted to disk
+"""
+
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import get_config
+from ..utils.histogram import LogHistogram
+from ..utils.logger import get_logger
+
+
+DAYS_PER_WEEK = 7
+STATE_VERSION = 1
+
+
+@dataclass
+class ZoneOccupancy:
+    """Occupancy matrix and session state of one zone"""
+    occupied: List[float]
+    observed: List[float]
+    session_starts: List[int]
+    durations: LogHistogram = field(default_factory=LogHistogram)
+    gaps: LogHistogram = field(default_factory=LogHistogram)
+    recent: Deque[Tuple[float, float]] = field(default_factory=deque)
+    present: bool = False
+    session_start: Optional[float] = None
+    last_end: Optional[float] = None
+    last_update: Optional[float] = None
+
+
+class OccupancyTracker:
+    """Hour-of-week occupancy and session statistics per light zone"""
+
+    def __init__(self, config: Optional[Any] = None, timers: Optional[Any] = None):
+        """
+        Initialize occupancy tracker
+
+        Args:
+            config: Configuration object (uses global if None)
+            timers: TimerService that schedules periodic saves
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+
+        self.enabled = self.config.get('occupancy.enabled', True)
+        self.path = Path(self.config.get('occupancy.path', 'data/occupancy.json'))
+        bins_per_hour = self.config.get('occupancy.bins_per_hour', 1)
+        if not isinstance(bins_per_hour, int) or bins_per_hour < 1 or 60 % bins_per_hour:
+            self.logger.warning(f"occupancy.bins_per_hour {bins_per_hour} is not a positive divisor of 60, using 1")
+            bins_per_hour = 1
+        self.bins_per_hour = bins_per_hour
+        self.bin_minutes = 60 // bins_per_hour
+        self.bins_per_day = 24 * bins_per_hour
+        self.num_bins = DAYS_PER_WEEK * self.bins_per_day
+        # A gap never spans more than one bin boundary
+        self.max_gap = min(self.config.get('occupancy.max_gap', 120.0), self.bin_minutes * 60)
+        self.save_interval = self.config.get('occupancy.save_interval', 300.0)
+        self.recent_sessions = self.config.get('occupancy.recent_sessions', 50)
+
+        self.zones: Dict[str, ZoneOccupancy] = {}
+        self.lock = Lock()
+
+        # Current hour-of-week bin and its wall-clock bounds
+        self.bin_index = 0
+        self.bin_start = 0.0
+        self.bin_end = 0.0
+
+        self.save_timer = timers.create('occupancy-save', self._save_deadline) if timers is not None else None
+        self.saves = 0
+
+        if self.enabled:
+            self.load()
+
+    def _new_zone(self) -> ZoneOccupancy:
+        """Empty zone state"""
+        return ZoneOccupancy(
+            occupied=[0.0] * self.num_bins,
+            observed=[0.0] * self.num_bins,
+            session_starts=[0] * self.num_bins,
+            recent=deque(maxlen=self.recent_sessions)
+        )
+
+    def _rebin(self, now: float):
+        """Find the bin holding now (once per bin, not per decision)"""
+        local = time.localtime(now)
+        minute_of_week = (local.tm_wday * 24 + local.tm_hour) * 60 + local.tm_min
+        self.bin_index = minute_of_week // self.bin_minutes
+        into_bin = (minute_of_week % self.bin_minutes) * 60 + local.tm_sec + now % 1
+        self.bin_start = now - into_bin
+        self.bin_end = self.bin_start + self.bin_minutes * 60
+
+    def update(self, zones: Iterable[Any], now: Optional[float] = None):
+        """
+        Account for one presence decision of every zone
+
+        Args:
+            zones: Objects with name and present (e.g. LightZone)
+            now: Unix timestamp of the decision (uses current time if None)
+        """
+        if not self.enabled:
+            return
+
+        now = time.time() if now is None else now
+        with self.lock:
+            if not self.bin_start <= now < self.bin_end:
+                self._rebin(now)
+            for zone in zones:
+                state = self.zones.get(zone.name)
+                if state is None:
+                    state = self.zones[zone.name] = self._new_zone()
+                self._update_zone(state, zone.present, now)
+
+    def _update_zone(self, state: ZoneOccupancy, present: bool, now: float):
+        """Fold the time since the last decision into the matrix (lock held)"""
+        last = state.last_update
+        state.last_update = now
+
+        if last is not None:
+            elapsed = now - last
+            if 0.0 < elapsed <= self.max_gap:
+                self._accumulate(state, last, now)
+            elif elapsed > self.max_gap and state.present:
+                # Nobody was watching (stopped or stalled): end the session where observation ended
+                self._end_session(state, last)
+
+        if present and not state.present:
+            if state.last_end is not None:
+                state.gaps.record(now - state.last_end)
+            state.session_start = now
+            state.session_starts[self.bin_index] += 1
+            state.present = True
+        elif not present and state.present:
+            self._end_session(state, now)
+
+    def _accumulate(self, state: ZoneOccupancy, start: float, end: float):
+        """Add [start, end) to the current bin, splitting at its start (lock held)"""
+        if start < self.bin_start:
+            previous = (self.bin_index - 1) % self.num_bins
+            before = self.bin_start - start
+            state.observed[previous] += before
+            if state.present:
+                state.occupied[previous] += before
+            start = self.bin_start
+
+        elapsed = end - start
+        state.observed[self.bin_index] += elapsed
+        if state.present:
+            state.occupied[self.bin_index] += elapsed
+
+    def _end_session(self, state: ZoneOccupancy, end: float):
+        """Close the open session (lock held)"""
+        if state.session_start is not None:
+            state.durations.record(end - state.session_start)
+            state.recent.append((state.session_start, end))
+        state.session_start = None
+        state.last_end = end
+        state.present = False
+
+    def _matrix(self, values: List[Any]) -> List[List[Any]]:
+        """Split a flat bin list into one row per weekday (Monday first)"""
+        return [
+            values[day * self.bins_per_day:(day + 1) * self.bins_per_day]
+            for day in range(DAYS_PER_WEEK)
+        ]
+
+    def get_zone_status(self, name: str) -> Dict[str, Any]:
+        """
+        Get heatmap and session statistics of one zone
+
+        Args:
+            name: Zone name
+
+        Returns:
+            Dictionary with occupancy ratios per weekday and bin (None where
+            never observed), session start counts and duration summaries
+
+        Raises:
+            KeyError: Zone has no data yet
+        """
+        with self.lock:
+            state = self.zones.get(name)
+            if state is None:
+                raise KeyError(f"No occupancy data for zone '{name}'")
+
+            ratios = [
+                round(occupied / observed, 3) if observed > 0 else None
+                for occupied, observed in zip(state.occupied, state.observed)
+            ]
+            current = (
+                round(time.time() - state.session_start, 1)
+                if state.session_start is not None else None
+            )
+            return {
+                'bins_per_hour': self.bins_per_hour,
+                'heatmap': self._matrix(ratios),
+                'session_starts': self._matrix(list(state.session_starts)),
+                'observed_hours': round(sum(state.observed) / 3600, 2),
+                'occupied_hours': round(sum(state.occupied) / 3600, 2),
+                'present': state.present,
+                'current_session_seconds': current,
+                'sessions': {
+                    'count': state.durations.count,
+                    'duration_seconds': state.durations.summary(scale=1.0, digits=1),
+                    # Short gaps are what light_control.off_delay has to bridge
+                    'gap_seconds': state.gaps.summary(scale=1.0, digits=1),
+                    'recent': [
+                        {'start': round(start, 1), 'end': round(end, 1), 'seconds': round(end - start, 1)}
+                        for start, end in state.recent
+                    ]
+                }
+            }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get occupancy statistics of every zone"""
+        with self.lock:
+            names = sorted(self.zones)
+        return {name: self.get_zone_status(name) for name in names}
+
+    def start(self):
+        """Arm periodic saving"""
+        if self.enabled and self.save_timer is not None:
+            self.save_timer.arm(self.save_interval)
+
+    def stop(self):
+        """Stop periodic saving and save once more"""
+        if self.save_timer is not None:
+            self.save_timer.cancel()
+        if self.enabled:
+            self.save()
+
+    def _save_deadline(self):
+        """Periodic save (timer thread), then re-arm"""
+        self.save()
+        self.save_timer.arm(self.save_interval)
+
+    def _to_state(self) -> Dict[str, Any]:
+        """Serializable copy of every zone (lock held)"""
+        return {
+            'version': STATE_VERSION,
+            'bins_per_hour': self.bins_per_hour,
+            'saved_at': time.time(),
+            'zones': {
+                name: {
+                    'occupied': state.occupied,
+                    'observed': state.observed,
+                    'session_starts': state.session_starts,
+                    'durations': state.durations.to_state(),
+                    'gaps': state.gaps.to_state(),
+                    'recent': list(state.recent),
+                    'session_start': state.session_start,
+                    'last_end': state.last_end,
+                    'last_update': state.last_update
+                }
+                for name, state in self.zones.items()
+            }
+        }
+
+    def save(self) -> bool:
+        """
+        Write state to disk atomically
+
+        Returns:
+            True if saved
+        """
+        with self.lock:
+            payload = json.dumps(self._to_state(), separators=(',', ':'))
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.error(f"Failed to save occupancy to {self.path}: {e}")
+            return False
+
+        self.saves += 1
+        return True
+
+    def load(self) -> bool:
+        """
+        Restore state saved by a previous run
+
+        Returns:
+            True if state was loaded
+        """
+        if not self.path.exists():
+            return False
+
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Cannot read occupancy state {self.path}: {e}")
+            return False
+
+        if saved.get('version') != STATE_VERSION or saved.get('bins_per_hour') != self.bins_per_hour:
+            self.logger.warning("Occupancy state has a different layout, starting fresh")
+            return False
+
+        with self.lock:
+            for name, data in saved.get('zones', {}).items():
+                state = self._new_zone()
+                state.occupied = [float(v) for v in data['occupied']]
+                state.observed = [float(v) for v in data['observed']]
+                state.session_starts = [int(v) for v in data['session_starts']]
+                state.durations = LogHistogram.from_state(data['durations'])
+                state.gaps = LogHistogram.from_state(data['gaps'])
+                state.recent.extend(tuple(item) for item in data['recent'])
+                # A session still open at shutdown ends where observation stopped
+                if data.get('session_start') is not None and data.get('last_update') is not None:
+                    state.session_start = data['session_start']
+                    state.present = True
+                    self._end_session(state, data['last_update'])
+                else:
+                    state.last_end = data.get('last_end')
+                self.zones[name] = state
+
+        self.logger.info(f"Loaded occupancy state for {len(self.zones)} zone(s)")
+        return True
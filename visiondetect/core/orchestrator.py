@@ -4,17 +4,28 @@ Coordinates all capabilities and manages the main detection loop
 """
 
 import time
-from typing import Optional
-from collections import deque
+from typing import List, Optional
 from threading import Thread, Event
 
 from ..core.config import get_config
+from ..core.executor import ActionExecutor
+from ..core.idle import IdleStateMachine, MotionDetector
+from ..core.occupancy import OccupancyTracker
+from ..core.presence import PresenceFilter
+from ..core.scheduler import DetectorScheduler
+from ..core.timers import TimerService
+from ..core.watchdog import Watchdog
+from ..utils.history import HistoryStore
 from ..utils.logger import get_logger
+from ..utils.profiler import SamplingProfiler
+from ..utils.spans import get_spans
 from ..utils.statistics import get_statistics
 from ..capabilities.camera import CameraCapture
 from ..capabilities.pose_detection import PoseDetector
 from ..capabilities.hand_gesture import HandGestureDetector
-from ..capabilities.light_control import LightController, LightScheduler
+from ..capabilities.light_zones import LightZoneManager
+from ..capabilities.led_strip import LEDStripController
+from ..capabilities.memory_diagnostics import MemoryDiagnostics
 from ..capabilities.wol import WOLNotifier
 
 
@@ -32,28 +43,86 @@ class SmartDormOrchestrator:
         self.config = get_config(config_path)
         self.logger = get_logger(
             log_dir=self.config.log_dir,
-            log_level=self.config.log_level
+            log_level=self.config.log_level,
+            queue_size=self.config.get('system.log_queue_size', 10000)
         )
         self.stats = get_statistics()
         
+        # Per-stage timing histograms
+        self.spans = get_spans()
+        self.spans.enabled = self.config.get('performance.spans', True)
+        
+        # On-demand stack sampling of the pipeline threads
+        self.profiler = SamplingProfiler(
+            rate_hz=self.config.get('profiler.rate_hz', 100),
+            max_seconds=self.config.get('profiler.max_seconds', 60)
+        )
+        
+        # Side effects run on a bounded worker pool
+        self.executor = ActionExecutor(self.config)
+        
+        # Deadlines (light off, WOL cooldown, gesture hold) fire off the frame loop
+        self.timers = TimerService(self.config)
+        
         # Initialize capabilities
         self.camera = CameraCapture(self.config)
         self.pose_detector = PoseDetector(self.config)
-        self.hand_detector = HandGestureDetector(self.config)
-        self.light_controller = LightController(self.config)
-        self.light_scheduler = LightScheduler(self.light_controller, self.config)
-        self.wol_notifier = WOLNotifier(self.config)
+        self.hand_detector = HandGestureDetector(self.config, self.timers)
+        self.light_zones = LightZoneManager(self.config, self.timers)
+        # Primary zone keeps the single-light API working
+        self.light_controller = self.light_zones.primary.controller
+        self.light_scheduler = self.light_zones.primary.scheduler
+        self.wol_notifier = WOLNotifier(self.config, self.timers)
+        self.led_strip = (
+            LEDStripController(self.config)
+            if self.config.get('features.enable_led_strip', False) else None
+        )
+        self.scheduler = DetectorScheduler(self.config, self.stats)
+        self.memory = MemoryDiagnostics(self.config, self.stats, self.timers)
         
         # Detection state
-        self.presence_buffer = deque(
-            maxlen=self.config.get('presence.buffer_size', 5)
+        self.presence_filter = PresenceFilter(self.config)
+        self.occupancy = OccupancyTracker(self.config, self.timers)
+        
+        # Deep-idle motion watch
+        self.idle = IdleStateMachine(self.config)
+        self.motion_detector = MotionDetector(
+            thumbnail_width=self.config.get('idle.motion.thumbnail_width', 64),
+            pixel_threshold=self.config.get('idle.motion.pixel_threshold', 25),
+            area_threshold=self.config.get('idle.motion.area_threshold', 0.01)
         )
-        self.presence_threshold = self.config.get('presence.threshold', 0.7)
+        self._idle_frame_seq = -1
+        self._resume_frame_seq = -1
+        
+        # Frame accounting reads the capture count straight from the camera
+        self.stats.set_capture_source(lambda: self.camera.frame_seq)
+        
+        # Statistics history on disk
+        self.history = HistoryStore(self.config, self.stats)
+        self.history.add_gauge('person_present', self.light_zones.any_present)
+        self.history.add_gauge('light_on', self.light_zones.any_light_on)
+        self.history.add_gauge('rss_mb', lambda: self.stats.get_memory().rss_bytes / (1024 * 1024))
         
         # Control flags
         self.running = False
         self.stop_event = Event()
         self.processing_thread = None
+        self._processing_generation = 0
+        self._stage = 'idle'
+        
+        # Stall detection with in-place recovery
+        self.watchdog = Watchdog(self.config, self.stats)
+        self.watchdog.register(
+            'camera',
+            timeout=self.config.get('watchdog.capture_timeout', 5.0),
+            recover=self.camera.reopen,
+            progress=lambda: self.camera.frame_seq
+        )
+        self.watchdog.register(
+            'processing',
+            timeout=self.config.get('watchdog.processing_timeout', 10.0),
+            recover=self._recover_processing
+        )
         
         self.logger.info("SmartDorm Orchestrator initialized")
     
@@ -70,9 +139,12 @@ class SmartDormOrchestrator:
             'camera': self.camera.initialize(),
             'pose_detector': self.pose_detector.initialize(),
             'hand_detector': self.hand_detector.initialize(),
-            'light_controller': self.light_controller.initialize(),
-            'wol_notifier': self.wol_notifier.initialize()
+            'light_controller': self.light_zones.initialize(),
+            'wol_notifier': self.wol_notifier.initialize(),
+            'memory_diagnostics': self.memory.initialize()
         }
+        if self.led_strip is not None:
+            results['led_strip'] = self.led_strip.initialize()
         
         # Log results
         for name, success in results.items():
@@ -95,8 +167,11 @@ class SmartDormOrchestrator:
         self.camera.cleanup()
         self.pose_detector.cleanup()
         self.hand_detector.cleanup()
-        self.light_controller.cleanup()
+        self.light_zones.cleanup()
         self.wol_notifier.cleanup()
+        self.memory.cleanup()
+        if self.led_strip is not None:
+            self.led_strip.cleanup()
         
         self.logger.info("Cleanup complete")
     
@@ -108,14 +183,20 @@ class SmartDormOrchestrator:
         
         self.logger.info("Starting SmartDorm system...")
         
-        # Start camera capture
+        # Start action workers, timers and camera capture
+        self.executor.start()
+        self.timers.start()
+        self.occupancy.start()
         self.camera.start_capture()
         
         # Start processing thread
         self.running = True
         self.stop_event.clear()
-        self.processing_thread = Thread(target=self._processing_loop, daemon=True)
-        self.processing_thread.start()
+        self._start_processing_thread()
+        
+        # Supervise capture and processing
+        self.watchdog.start()
+        self.history.start()
         
         self.logger.info("SmartDorm system started")
     
@@ -128,6 +209,7 @@ class SmartDormOrchestrator:
         
         self.running = False
         self.stop_event.set()
+        self.watchdog.stop()
         
         # Stop camera
         self.camera.stop_capture()
@@ -136,9 +218,60 @@ class SmartDormOrchestrator:
         if self.processing_thread:
             self.processing_thread.join(timeout=5.0)
         
+        # Run the actions already queued; leftovers past the timeout are dropped
+        self.executor.stop()
+        self.timers.stop()
+        self.occupancy.stop()
+        self.history.stop()
+        
         self.logger.info("SmartDorm system stopped")
     
-    def _processing_loop(self):
+    def _start_processing_thread(self):
+        """Start a processing thread for the current generation"""
+        self.processing_thread = Thread(
+            target=self._processing_loop,
+            args=(self._processing_generation,),
+            name="processing",
+            daemon=True
+        )
+        self.processing_thread.start()
+    
+    def _recover_processing(self) -> bool:
+        """
+        Recover a stalled processing loop without restarting the process
+        
+        The stuck thread is abandoned, the detector it was blocked in is
+        re-created, and a fresh processing thread takes over.
+        
+        Returns:
+            True if processing was restarted
+        """
+        stage = self._stage
+        self.logger.error(f"Processing loop stalled in stage '{stage}'")
+        
+        # Abandon the stuck thread; it closes the replaced detector and
+        # exits if it ever returns
+        self._processing_generation += 1
+        
+        if stage == 'pose':
+            self.pose_detector = PoseDetector(self.config)
+            if not self.pose_detector.initialize():
+                return False
+            self._apply_scheduler_level()
+            self.stats.record_recovery('pose_detector', True)
+        elif stage == 'hand':
+            self.hand_detector.reset_gesture_state()
+            self.hand_detector = HandGestureDetector(self.config, self.timers)
+            if not self.hand_detector.initialize():
+                return False
+            self.stats.record_recovery('hand_detector', True)
+        
+        self._stage = 'idle'
+        if self.running:
+            self._start_processing_thread()
+        return True
+    
+    def _processing_loop(self, generation: int):
         """Main processing loop"""
         self.logger.info("Processing loop started")
         
@@ -146,39 +279,78 @@ class SmartDormOrchestrator:
         enable_hand_gesture = self.config.get('features.enable_hand_gesture', True)
         enable_wol = self.config.get('features.enable_wol', True)
         
-        while self.running and not self.stop_event.is_set():
+        while (self.running and not self.stop_event.is_set() and
+               generation == self._processing_generation):
             try:
+                self.watchdog.beat('processing')
+                
+                # Deep idle: only watch thumbnails for motion
+                if self.idle.state == IdleStateMachine.DEEP_IDLE:
+                    self._idle_step()
+                    continue
+                
+                self._stage = 'capture'
                 start_time = time.time()
                 
                 # Get frame
-                frame = self.camera.get_frame()
+                with self.spans.span('capture'):
+                    frame, frame_seq = self.camera.get_frame_with_seq()
                 
                 if frame is None:
                     time.sleep(0.01)
                     continue
                 
+                self.stats.record_frame_delivered(frame_seq)
+                
+                # Select detectors and resolution for this frame
+                plan = self.scheduler.plan()
+                
                 # Perform pose detection
-                pose_results = self.pose_detector.detect(frame)
+                self._stage = 'pose'
+                pose_start = time.perf_counter()
+                pose_detector = self.pose_detector
+                pose_results = pose_detector.detect(plan.pose_frame(frame))
+                if self._abandoned(generation, pose_detector):
+                    break
+                pose_time = time.perf_counter() - pose_start
+                self.scheduler.record_cost('pose', pose_time)
+                self.spans.record('pose', pose_time)
                 pose_confidence = pose_results['confidence']
                 person_detected = pose_results['present']
                 
-                # Update presence buffer for smoothing
-                self.presence_buffer.append(person_detected)
-                presence_ratio = sum(self.presence_buffer) / len(self.presence_buffer)
+                # First full detection on a frame captured after waking closes
+                # the resume measurement
+                if frame_seq > self._resume_frame_seq:
+                    resume_latency = self.idle.full_detection_done(time.monotonic())
+                    if resume_latency is not None:
+                        self.logger.info("Resumed from deep idle in %.0fms", resume_latency * 1000)
                 
-                # Determine if person is present
-                person_present = presence_ratio >= self.presence_threshold
+                self._stage = 'decide'
                 
-                # Update statistics
-                self.stats.increment_total_frames()
-                self.stats.record_person_detected(person_present)
+                with self.spans.span('decide'):
+                    # Smooth detections into a present/absent decision
+                    person_present = self.presence_filter.update(person_detected, time.time())
+                    
+                    # Update statistics
+                    self.stats.increment_total_frames()
+                    self.stats.record_person_detected(person_present)
                 
                 # Perform hand gesture detection if person present and enabled
-                if enable_hand_gesture and person_present:
-                    hand_results = self.hand_detector.detect(frame)
+                if enable_hand_gesture and person_present and plan.run_hand:
+                    self._stage = 'hand'
+                    hand_start = time.perf_counter()
+                    hand_detector = self.hand_detector
+                    hand_results = hand_detector.detect(frame)
+                    if self._abandoned(generation, hand_detector):
+                        break
+                    hand_time = time.perf_counter() - hand_start
+                    self.scheduler.record_cost('hand', hand_time)
+                    self.spans.record('hand', hand_time)
+                    self._stage = 'gesture'
                     gesture_confidence = hand_results['gesture_confidence']
                     
                     # Update gesture state
+                    gesture_start = time.perf_counter()
                     if gesture_confidence > 0:
                         gesture_confirmed = self.hand_detector.update_gesture_state(
                             gesture_confidence,
@@ -189,25 +361,49 @@ class SmartDormOrchestrator:
                         if gesture_confirmed and enable_wol:
                             self.stats.record_gesture_detection()
                             
-                            # Send WOL in separate thread
-                            Thread(target=self._trigger_wol, daemon=True).start()
+                            # Send WOL on the action executor
+                            self.request_wol(
+                                gesture=hand_results['gesture_type'],
+                                requested_at=time.monotonic()
+                            )
                             
                             # Reset gesture state
                             self.hand_detector.reset_gesture_state()
+                    self.spans.record('gesture', time.perf_counter() - gesture_start)
                 
                 # Update light control
-                self.light_scheduler.update(person_present)
+                self._stage = 'light'
+                with self.spans.span('light'):
+                    self.light_zones.update(person_present, pose_results['pose_landmarks'])
+                    self.occupancy.update(self.light_zones.zones)
+                    
+                    # Drop to deep idle after a quiet period with the light off
+                    enter_idle = self.idle.should_enter_idle(
+                        person_present,
+                        self.light_zones.any_light_on(),
+                        time.monotonic()
+                    )
+                if enter_idle:
+                    self._enter_deep_idle()
                 
                 # Record processing time
                 processing_time = time.time() - start_time
+                self.stats.record_frame_processed()
                 self.stats.performance.record_processing_time(processing_time)
+                self.spans.record('frame', processing_time)
+                
+                # Let the scheduler degrade or recover against the frame budget
+                if self.scheduler.end_frame(processing_time):
+                    self._apply_scheduler_level()
                 
                 # Report FPS periodically
                 if self.stats.performance.should_report_fps(fps_report_interval):
                     perf_stats = self.stats.performance.get_stats()
                     self.logger.info(
-                        f"Performance: Processing FPS={perf_stats['processing_fps']}, "
-                        f"Avg Time={perf_stats['avg_processing_time_ms']:.1f}ms"
+                        "Performance: Processing FPS=%s, Avg Time=%.1fms, p99=%.1fms",
+                        perf_stats['processing_fps'],
+                        perf_stats['avg_processing_time_ms'],
+                        perf_stats['p99_processing_time_ms']
                     )
                 
             except Exception as e:
@@ -217,16 +413,200 @@ class SmartDormOrchestrator:
         
         self.logger.info("Processing loop stopped")
     
-    def _trigger_wol(self):
-        """Trigger WOL notification (runs in separate thread)"""
+    def _abandoned(self, generation: int, detector) -> bool:
+        """
+        Check whether recovery replaced this loop while it was blocked in detector
+        
+        Recovery cannot close a detector a thread is still inside, so the
+        abandoned thread closes it here once it returns, before touching
+        any state the new loop owns.
+        
+        Returns:
+            True if this loop must stop
+        """
+        if generation == self._processing_generation:
+            return False
+        
+        if detector is not self.pose_detector and detector is not self.hand_detector:
+            detector.cleanup()
+        self.logger.warning("Abandoned processing loop returned, exiting")
+        return True
+    
+    def _enter_deep_idle(self):
+        """Switch to thumbnail-only motion watch and release heavy resources"""
+        self.logger.info(
+            f"No activity for {self.idle.quiet_period}s, entering deep idle"
+        )
+        self.idle.enter_idle(time.monotonic())
+        self.stats.record_idle_transition(True)
+        self.motion_detector.reset()
+        self._idle_frame_seq = -1
+        
+        if self.idle.release_camera:
+            self.watchdog.set_active('camera', False)
+            self.camera.cleanup()
+        else:
+            self.camera.set_capture_interval(1.0 / self.idle.idle_fps)
+        
+        if self.idle.unload_hand_detector:
+            self.hand_detector.cleanup()
+        self.hand_detector.reset_gesture_state()
+    
+    def _idle_step(self):
+        """Check one thumbnail for motion while in deep idle"""
+        self._stage = 'idle_watch'
+        
+        if self.idle.release_camera:
+            frame = self.camera.probe_frame(
+                self.config.get('idle.warmup_frames', 3)
+            )
+            self._idle_frame_seq = self.camera.frame_seq
+        elif self.camera.frame_seq != self._idle_frame_seq:
+            frame, self._idle_frame_seq = self.camera.get_frame_with_seq()
+        else:
+            frame = None
+        
+        if frame is not None:
+            self.stats.record_frame_delivered(self._idle_frame_seq, gated=True)
+        
+        # Idle time still counts as observed, unoccupied time
+        self.occupancy.update(self.light_zones.zones)
+        
+        if frame is not None and self.motion_detector.detect(frame):
+            self._resume_from_idle()
+            return
+        
+        self.stop_event.wait(self.idle.watch_interval)
+    
+    def _resume_from_idle(self):
+        """Restore full operation after motion"""
+        self.idle.motion_detected(time.monotonic())
+        self._resume_frame_seq = self.camera.frame_seq
+        self.stats.record_idle_transition(False)
+        self.logger.info(
+            f"Motion detected ({self.motion_detector.last_score:.1%} changed), "
+            "resuming full detection"
+        )
+        
+        if self.idle.release_camera:
+            if self.camera.initialize():
+                self.camera.start_capture()
+            self.watchdog.set_active('camera', True)
+        else:
+            self.camera.set_capture_interval(0.0)
+        
+        # Reload hands off the processing thread so pose runs right away
+        if (self.config.get('features.enable_hand_gesture', True) and
+                not self.hand_detector.is_ready()):
+            self.executor.submit('hand_reload', self.hand_detector.initialize)
+    
+    def _apply_scheduler_level(self):
+        """Apply model settings of the scheduler's current level"""
+        complexity = self.scheduler.current_level.pose_model_complexity
+        if complexity is None:
+            complexity = self.config.get('pose_detection.model_complexity', 1)
+        
+        if complexity != self.pose_detector.model_complexity:
+            self.logger.info(f"Switching pose model complexity to {complexity}")
+            if not self.pose_detector.set_model_complexity(complexity):
+                # Retried on the next level change
+                self.scheduler.model_switch_failures += 1
+                self.logger.warning(
+                    f"Pose model complexity {complexity} failed to load, "
+                    f"keeping {self.pose_detector.model_complexity}"
+                )
+    
+    def request_wol(
+        self,
+        targets: Optional[List[str]] = None,
+        gesture: Optional[str] = None,
+        requested_at: Optional[float] = None
+    ) -> bool:
+        """
+        Queue a WOL notification on the action executor
+        
+        Args:
+            targets: Target names (all targets if None)
+            gesture: Only wake targets bound to this gesture
+            requested_at: Monotonic trigger time, for latency measurement
+            
+        Returns:
+            True if queued, False if one is already pending or queue is full
+        """
+        return self.executor.submit(
+            'wol',
+            self._trigger_wol,
+            targets,
+            gesture,
+            requested_at or time.monotonic(),
+            key=('wol', tuple(targets) if targets else None, gesture)
+        )
+    
+    def request_light(self, state: bool) -> bool:
+        """
+        Queue a manual light state change on the light writer
+        
+        Args:
+            state: True to turn on, False to turn off
+            
+        Returns:
+            True if queued
+        """
+        return self.light_controller.set_state(state)
+    
+    def _trigger_wol(
+        self,
+        targets: Optional[List[str]] = None,
+        gesture: Optional[str] = None,
+        requested_at: Optional[float] = None
+    ):
+        """Trigger WOL notification (runs on the action executor)"""
         try:
             if self.wol_notifier.can_send():
-                success = self.wol_notifier.notify()
+                success = self.wol_notifier.notify(
+                    targets=targets,
+                    gesture=gesture,
+                    requested_at=requested_at
+                )
                 if success:
                     self.stats.record_wol_trigger()
         except Exception as e:
             self.logger.error(f"Error triggering WOL: {e}")
     
+    def profile(
+        self,
+        seconds: float,
+        rate_hz: Optional[float] = None,
+        threads: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Sample the pipeline threads' stacks (blocks for the duration)
+        
+        Args:
+            seconds: Profile duration
+            rate_hz: Samples per second (uses profiler.rate_hz if None)
+            threads: Names among 'processing' and 'capture' (default both)
+            
+        Returns:
+            Profile result with collapsed stacks
+            
+        Raises:
+            KeyError: Unknown thread name
+            ValueError: Non-finite duration or rate
+            ProfilerBusy: Another profile is running
+        """
+        available = {
+            'processing': self.processing_thread,
+            'capture': self.camera.capture_thread
+        }
+        for name in threads or []:
+            if name not in available:
+                raise KeyError(f"Unknown thread '{name}'")
+        
+        selected = {name: available[name] for name in threads} if threads else available
+        self.logger.info(f"Profiling {', '.join(selected)} for {seconds:g}s")
+        return self.profiler.profile(selected, seconds, rate_hz)
+    
     def get_status(self) -> dict:
         """
         Get current system status
@@ -239,11 +619,29 @@ class SmartDormOrchestrator:
             'camera_ready': self.camera.is_ready(),
             'pose_detector_ready': self.pose_detector.is_ready(),
             'hand_detector_ready': self.hand_detector.is_ready(),
-            'light_controller_ready': self.light_controller.is_ready(),
+            'light_controller_ready': self.light_zones.is_ready(),
             'light_state': self.light_controller.get_state(),
+            'light_writer': self.light_controller.get_writer_stats(),
             'person_present': self.light_scheduler.person_present,
+            'presence': self.presence_filter.get_status(),
             'time_until_light_off': self.light_scheduler.get_time_until_off(),
+            'light_zones': self.light_zones.get_status(),
             'wol_cooldown_remaining': self.wol_notifier.get_cooldown_remaining(),
+            'wol': self.wol_notifier.get_status(),
+            'scheduler': self.scheduler.get_status(),
+            'actions': self.executor.get_stats(),
+            'timers': self.timers.get_status(),
+            'spans': self.spans.get_status(),
+            'watchdog': self.watchdog.get_status(),
+            'history': self.history.get_status(),
+            'occupancy': self.occupancy.get_status(),
+            'memory': self.memory.get_status(),
+            'logging': self.logger.get_stats(),
+            'idle': self.idle.get_status(),
+            'led_strip': (
+                dict(self.led_strip.get_state(), **self.led_strip.get_stats())
+                if self.led_strip is not None else None
+            ),
             'statistics': self.stats.get_summary()
         }
     
@@ -0,0 +1,261 @@
+"""
+Presence filter module
+Smooths per-frame person detections into a stable present/absent decision
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Optional
+
+from ..core.config import get_config
+
+
+class PresenceStrategy(ABC):
+    """Base class for presence smoothing strategies"""
+
+    @abstractmethod
+    def update(self, detected: bool, dt: float) -> float:
+        """
+        Feed one detection sample
+
+        Args:
+            detected: Whether a person was detected in the frame
+            dt: Seconds since the previous sample
+
+        Returns:
+            Presence score (0-1)
+        """
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Forget all history"""
+        pass
+
+
+class MajorityVoteStrategy(PresenceStrategy):
+    """Time-weighted vote over the last N samples with running sums"""
+
+    RESYNC_INTERVAL = 10000
+
+    def __init__(self, buffer_size: int = 5):
+        """
+        Initialize majority vote
+
+        Args:
+            buffer_size: Number of samples in the voting window
+        """
+        self.samples = deque(maxlen=max(1, buffer_size))
+        self.weight_sum = 0.0
+        self.positive_sum = 0.0
+        self.updates = 0
+
+    def update(self, detected: bool, dt: float) -> float:
+        """Add sample, evicting the oldest one from the running sums"""
+        # A sample stands for the time since the previous one, so frames
+        # arriving after a gap count for more than back-to-back frames
+        if len(self.samples) == self.samples.maxlen:
+            old_detected, old_weight = self.samples[0]
+            self.weight_sum -= old_weight
+            if old_detected:
+                self.positive_sum -= old_weight
+
+        self.samples.append((detected, dt))
+        self.weight_sum += dt
+        if detected:
+            self.positive_sum += dt
+
+        # Re-sum occasionally so float error from add/subtract cannot accumulate
+        self.updates += 1
+        if self.updates % self.RESYNC_INTERVAL == 0:
+            self.weight_sum = sum(weight for _, weight in self.samples)
+            self.positive_sum = sum(weight for hit, weight in self.samples if hit)
+
+        if self.weight_sum <= 0:
+            return 1.0 if detected else 0.0
+        return self.positive_sum / self.weight_sum
+
+    def reset(self):
+        """Forget all history"""
+        self.samples.clear()
+        self.weight_sum = 0.0
+        self.positive_sum = 0.0
+
+
+class EMAStrategy(PresenceStrategy):
+    """Exponential moving average with a time constant in seconds"""
+
+    def __init__(self, time_constant: float = 0.5):
+        """
+        Initialize EMA
+
+        Args:
+            time_constant: Seconds for the average to move ~63% toward a new value
+        """
+        self.time_constant = max(time_constant, 1e-3)
+        self.value: Optional[float] = None
+
+    def update(self, detected: bool, dt: float) -> float:
+        """Move toward sample by an amount based on elapsed time"""
+        sample = 1.0 if detected else 0.0
+
+        if self.value is None:
+            self.value = sample
+        else:
+            alpha = 1.0 - math.exp(-dt / self.time_constant)
+            self.value += alpha * (sample - self.value)
+
+        return self.value
+
+    def reset(self):
+        """Forget all history"""
+        self.value = None
+
+
+class BayesStrategy(PresenceStrategy):
+    """Two-state hidden Markov model filtered with the forward algorithm"""
+
+    def __init__(
+        self,
+        enter_rate: float = 0.5,
+        leave_rate: float = 0.2,
+        hit_rate: float = 0.9,
+        false_alarm_rate: float = 0.1
+    ):
+        """
+        Initialize Bayes filter
+
+        Args:
+            enter_rate: Expected transitions absent -> present per second
+            leave_rate: Expected transitions present -> absent per second
+            hit_rate: P(detected | present)
+            false_alarm_rate: P(detected | absent)
+        """
+        self.enter_rate = enter_rate
+        self.leave_rate = leave_rate
+        self.hit_rate = hit_rate
+        self.false_alarm_rate = false_alarm_rate
+        self.stationary = enter_rate / (enter_rate + leave_rate)
+        self.probability = self.stationary
+
+    def update(self, detected: bool, dt: float) -> float:
+        """Predict over dt, then apply the detection likelihood"""
+        # Predict: closed-form two-state continuous-time Markov chain
+        decay = math.exp(-(self.enter_rate + self.leave_rate) * dt)
+        prior = self.stationary + (self.probability - self.stationary) * decay
+
+        # Correct with the detection likelihood
+        if detected:
+            like_present, like_absent = self.hit_rate, self.false_alarm_rate
+        else:
+            like_present, like_absent = 1.0 - self.hit_rate, 1.0 - self.false_alarm_rate
+
+        numerator = prior * like_present
+        denominator = numerator + (1.0 - prior) * like_absent
+        self.probability = numerator / denominator if denominator > 0 else prior
+
+        return self.probability
+
+    def reset(self):
+        """Forget all history"""
+        self.probability = self.stationary
+
+
+class PresenceFilter:
+    """Presence decision with pluggable smoothing and on/off hysteresis"""
+
+    STRATEGIES = ('majority', 'ema', 'hmm')
+
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Initialize presence filter
+
+        Args:
+            config: Configuration object (uses global if None)
+        """
+        self.config = config or get_config()
+
+        threshold = self.config.get('presence.threshold', 0.7)
+        self.on_threshold = self.config.get('presence.on_threshold', threshold)
+        self.off_threshold = min(
+            self.config.get('presence.off_threshold', threshold),
+            self.on_threshold
+        )
+        self.nominal_interval = self.config.get('presence.nominal_interval', 1 / 30)
+        self.max_interval = self.config.get('presence.max_interval', 2.0)
+
+        self.strategy_name = self.config.get('presence.strategy', 'majority')
+        self.strategy = self._create_strategy(self.strategy_name)
+
+        self.present = False
+        self.score = 0.0
+        self.last_timestamp: Optional[float] = None
+        self.transitions = 0
+
+    def _create_strategy(self, name: str) -> PresenceStrategy:
+        """Build the configured smoothing strategy"""
+        if name == 'ema':
+            return EMAStrategy(self.config.get('presence.ema.time_constant', 0.5))
+
+        if name == 'hmm':
+            return BayesStrategy(
+                enter_rate=self.config.get('presence.hmm.enter_rate', 0.5),
+                leave_rate=self.config.get('presence.hmm.leave_rate', 0.2),
+                hit_rate=self.config.get('presence.hmm.hit_rate', 0.9),
+                false_alarm_rate=self.config.get('presence.hmm.false_alarm_rate', 0.1)
+            )
+
+        if name != 'majority':
+            raise ValueError(
+                f"Unknown presence strategy '{name}', expected one of {self.STRATEGIES}"
+            )
+
+        return MajorityVoteStrategy(self.config.get('presence.buffer_size', 5))
+
+    def update(self, detected: bool, timestamp: float) -> bool:
+        """
+        Feed one detection and return the smoothed decision
+
+        Args:
+            detected: Whether a person was detected in the frame
+            timestamp: Sample time in seconds (frames may be skipped or gated)
+
+        Returns:
+            True if a person is considered present
+        """
+        if self.last_timestamp is None:
+            dt = self.nominal_interval
+        else:
+            dt = min(max(timestamp - self.last_timestamp, 0.0), self.max_interval)
+        self.last_timestamp = timestamp
+
+        self.score = self.strategy.update(detected, dt)
+
+        if self.present:
+            if self.score <= self.off_threshold:
+                self.present = False
+                self.transitions += 1
+        elif self.score >= self.on_threshold:
+            self.present = True
+            self.transitions += 1
+
+        return self.present
+
+    def reset(self):
+        """Reset filter state to absent"""
+        self.strategy.reset()
+        self.present = False
+        self.score = 0.0
+        self.last_timestamp = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get presence filter status"""
+        return {
+            'strategy': self.strategy_name,
+            'present': self.present,
+            'score': round(self.score, 3),
+            'on_threshold': self.on_threshold,
+            'off_threshold': self.off_threshold,
+            'transitions': self.transitions
+        }
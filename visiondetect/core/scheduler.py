@@ -0,0 +1,313 @@
+"""
+Deadline-aware detector scheduler
+Chooses which detectors run on each frame, and at which resolution or
+model complexity, so per-frame processing stays inside a latency budget
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+@dataclass
+class SchedulerLevel:
+    """One step on the degradation ladder"""
+    name: str
+    pose_stride: int = 1                          # Take every Nth pixel for pose
+    hand_interval: int = 1                        # Run hands every Nth frame, 0 disables
+    pose_model_complexity: Optional[int] = None   # None keeps the configured value
+
+
+@dataclass
+class FramePlan:
+    """Work selected for a single frame"""
+    level: int
+    name: str
+    pose_stride: int
+    run_hand: bool
+
+    def pose_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Return the (possibly downscaled) view of frame used for pose"""
+        if self.pose_stride <= 1:
+            return frame
+        return frame[::self.pose_stride, ::self.pose_stride]
+
+
+DEFAULT_LEVELS = [
+    SchedulerLevel('full', pose_stride=1, hand_interval=1),
+    SchedulerLevel('reduced', pose_stride=2, hand_interval=2),
+    SchedulerLevel('pose_only', pose_stride=2, hand_interval=0),
+    SchedulerLevel('minimal', pose_stride=2, hand_interval=0, pose_model_complexity=0),
+]
+
+
+class DetectorScheduler:
+    """Degrades and recovers the detector pipeline against a frame budget"""
+
+    DETECTORS = ('pose', 'hand')
+
+    def __init__(self, config: Optional[Any] = None, stats: Optional[Any] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            config: Configuration object (uses global if None)
+            stats: StatisticsManager used to count level changes
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+        self.stats = stats
+
+        self.enabled = self.config.get('scheduler.enabled', True)
+        self.budget = self.config.get('scheduler.frame_budget_ms', 120) / 1000.0
+        self.degrade_after = self.config.get('scheduler.degrade_after', 5)
+        self.recover_after = self.config.get('scheduler.recover_after', 30)
+        self.recover_headroom = self.config.get('scheduler.recover_headroom', 0.7)
+        self.smoothing = self.config.get('scheduler.smoothing', 0.2)
+        self.levels = self._load_levels()
+
+        self.level = 0
+        self.degrade_count = 0
+        self.recover_count = 0
+        self.model_switch_failures = 0
+        self.last_change_time = 0.0
+
+        # EWMA cost per (detector, level), per-frame detector share and frame total
+        self._costs: Dict[Tuple[str, int], float] = {}
+        self._detector_share: Dict[str, float] = {name: 0.0 for name in self.DETECTORS}
+        self._frame_costs: Dict[str, float] = {name: 0.0 for name in self.DETECTORS}
+        self._frame_cost: Optional[float] = None
+        self._frame_index = 0
+        self._level_samples = 0
+        self._over_count = 0
+        self._under_count = 0
+        self._skip_frames = 0
+
+        # Cost of level N-1 relative to level N, learned right after degrading
+        # while both ran under the same CPU pressure
+        self._exit_cost: Dict[int, float] = {}
+        self._level_ratio: Dict[int, float] = {}
+
+        # Refilled by every plan() instead of allocating a new one per frame
+        self._plan = FramePlan(level=0, name=self.levels[0].name, pose_stride=1, run_hand=True)
+
+    def _load_levels(self) -> List[SchedulerLevel]:
+        """Load degradation levels from configuration"""
+        raw_levels = self.config.get('scheduler.levels')
+        if not raw_levels:
+            return list(DEFAULT_LEVELS)
+
+        levels = []
+        for index, raw in enumerate(raw_levels):
+            levels.append(SchedulerLevel(
+                name=raw.get('name', f'level{index}'),
+                pose_stride=max(1, int(raw.get('pose_stride', 1))),
+                hand_interval=max(0, int(raw.get('hand_interval', 1))),
+                pose_model_complexity=raw.get('pose_model_complexity')
+            ))
+        return levels
+
+    @property
+    def current_level(self) -> SchedulerLevel:
+        """Currently active level"""
+        return self.levels[self.level]
+
+    def plan(self) -> FramePlan:
+        """
+        Select the work for the next frame
+
+        Returns:
+            FramePlan for the current level, reused by the next call
+        """
+        level = self.current_level
+        self._frame_index += 1
+        for name in self.DETECTORS:
+            self._frame_costs[name] = 0.0
+
+        run_hand = (
+            level.hand_interval > 0 and
+            self._frame_index % level.hand_interval == 0
+        )
+
+        plan = self._plan
+        plan.level = self.level
+        plan.name = level.name
+        plan.pose_stride = level.pose_stride
+        plan.run_hand = run_hand
+        return plan
+
+    def record_cost(self, detector: str, duration: float):
+        """
+        Record the measured cost of a detector on the current frame
+
+        Args:
+            detector: Detector name ('pose' or 'hand')
+            duration: Inference time in seconds
+        """
+        self._frame_costs[detector] = self._frame_costs.get(detector, 0.0) + duration
+
+        if self._skip_frames > 0:
+            return
+
+        key = (detector, self.level)
+        self._costs[key] = self._ewma(self._costs.get(key), duration)
+
+    def end_frame(self, duration: float) -> Optional[str]:
+        """
+        Record total frame time and decide whether to change level
+
+        Args:
+            duration: End-to-end processing time of the frame in seconds
+
+        Returns:
+            'degrade' or 'recover' if the level changed, otherwise None
+        """
+        if self._skip_frames > 0:
+            # First frame after a level change pays for model warm-up
+            self._skip_frames -= 1
+            return None
+
+        self._frame_cost = self._ewma(self._frame_cost, duration)
+        self._level_samples += 1
+        for name in self.DETECTORS:
+            share = self._frame_costs.get(name, 0.0) / duration if duration > 0 else 0.0
+            self._detector_share[name] = self._ewma(self._detector_share[name], share)
+
+        # Learn how much cheaper this level is than the one we left, while the
+        # exit measurement is still representative of current CPU pressure
+        if (self.level in self._exit_cost and
+                self._level_samples == self.degrade_after and self._frame_cost > 0):
+            self._level_ratio[self.level] = self._exit_cost.pop(self.level) / self._frame_cost
+
+        if not self.enabled:
+            return None
+
+        if self._frame_cost > self.budget:
+            self._over_count += 1
+            self._under_count = 0
+            if self._over_count >= self.degrade_after:
+                target = self._next_degrade_level()
+                if target is not None:
+                    return self._change_level(target, 'degrade')
+            return None
+
+        self._over_count = 0
+
+        if self.level == 0:
+            return None
+
+        predicted = self.predict_cost(self.level - 1)
+        if predicted is not None and predicted <= self.budget * self.recover_headroom:
+            self._under_count += 1
+            if self._under_count >= self.recover_after:
+                return self._change_level(self.level - 1, 'recover')
+        else:
+            self._under_count = 0
+
+        return None
+
+    def predict_cost(self, level: int) -> Optional[float]:
+        """
+        Predict the per-frame cost of the level just above the current one
+
+        Args:
+            level: Level index (only self.level - 1 can be predicted)
+
+        Returns:
+            Predicted seconds per frame, or None if not yet learned
+        """
+        if level != self.level - 1 or self._frame_cost is None:
+            return None
+
+        ratio = self._level_ratio.get(self.level)
+        if ratio is None:
+            return None
+
+        return self._frame_cost * ratio
+
+    def _next_degrade_level(self) -> Optional[int]:
+        """
+        Pick the next level that actually sheds measured work
+
+        Levels that only throttle hand detection are skipped while hands
+        contribute almost nothing to frame time (no one in the room).
+        """
+        current = self.current_level
+        hand_idle = self._detector_share['hand'] < 0.1
+
+        for index in range(self.level + 1, len(self.levels)):
+            candidate = self.levels[index]
+            pose_changes = (
+                candidate.pose_stride != current.pose_stride or
+                candidate.pose_model_complexity != current.pose_model_complexity
+            )
+            if pose_changes or not hand_idle:
+                return index
+
+        return None
+
+    def _change_level(self, new_level: int, direction: str) -> str:
+        """Switch level, log the decision and count it"""
+        old = self.current_level
+        frame_cost = self._frame_cost or 0.0
+
+        self.level = new_level
+        self.last_change_time = time.time()
+        self._over_count = 0
+        self._under_count = 0
+        self._frame_cost = None
+        self._level_samples = 0
+        self._skip_frames = 1
+
+        if direction == 'degrade':
+            self.degrade_count += 1
+            # When levels were skipped the level we left is at least as
+            # expensive as new_level - 1, so the learned ratio stays conservative
+            self._exit_cost[new_level] = frame_cost
+            self.logger.warning(
+                f"Scheduler degraded {old.name} -> {self.current_level.name}: "
+                f"frame cost {frame_cost * 1000:.1f}ms > budget {self.budget * 1000:.0f}ms"
+            )
+        else:
+            self.recover_count += 1
+            self.logger.info(
+                f"Scheduler recovered {old.name} -> {self.current_level.name}: "
+                f"frame cost {frame_cost * 1000:.1f}ms within budget {self.budget * 1000:.0f}ms"
+            )
+
+        if self.stats is not None:
+            self.stats.record_scheduler_change(direction == 'degrade')
+
+        return direction
+
+    def _ewma(self, previous: Optional[float], sample: float) -> float:
+        """Exponentially weighted moving average step"""
+        if previous is None:
+            return sample
+        return previous + self.smoothing * (sample - previous)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get scheduler status"""
+        predicted = self.predict_cost(self.level - 1) if self.level > 0 else None
+        return {
+            'enabled': self.enabled,
+            'level': self.level,
+            'level_name': self.current_level.name,
+            'budget_ms': round(self.budget * 1000, 1),
+            'frame_cost_ms': round((self._frame_cost or 0.0) * 1000, 2),
+            'predicted_recover_cost_ms': (
+                round(predicted * 1000, 2) if predicted is not None else None
+            ),
+            'degrades': self.degrade_count,
+            'recovers': self.recover_count,
+            'model_switch_failures': self.model_switch_failures,
+            'detector_cost_ms': {
+                f"{name}@{self.levels[level].name}": round(cost * 1000, 2)
+                for (name, level), cost in self._costs.items()
+            }
+        }
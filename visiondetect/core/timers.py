@@ -0,0 +1,256 @@
+"""
+Timer service module
+Hashed timer wheel owning light-off deadlines, cooldown expiries and
+gesture hold timeouts, firing on its own thread independent of frame rate
+"""
+
+import math
+import time
+from threading import Thread, Lock, Event
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+class Timer:
+    """A re-armable one-shot timer owned by a TimerService"""
+
+    __slots__ = ('name', 'callback', 'deadline', 'expiry_tick', 'due_tick', 'slot', 'service')
+
+    def __init__(self, service: 'TimerService', name: str, callback: Callable[[], Any]):
+        self.service = service
+        self.name = name
+        self.callback = callback
+        self.deadline = 0.0
+        # Tick of the slot holding the timer, and the tick it is really due;
+        # due_tick runs ahead after a re-arm pushed the deadline back
+        self.expiry_tick = 0
+        self.due_tick = 0
+        self.slot: Optional[Dict['Timer', None]] = None
+
+    @property
+    def active(self) -> bool:
+        """Check if the timer is armed and has not fired yet"""
+        return self.slot is not None
+
+    def arm(self, delay: float):
+        """(Re-)arm the timer to fire delay seconds from now"""
+        self.service.arm(self, delay)
+
+    def cancel(self):
+        """Disarm the timer"""
+        self.service.cancel(self)
+
+    def remaining(self) -> float:
+        """Seconds until the timer fires, or 0 if not armed"""
+        if self.slot is None:
+            return 0.0
+        return max(0.0, self.deadline - time.monotonic())
+
+
+class TimerService:
+    """Hashed timer wheel with O(1) arm, re-arm and cancel"""
+
+    def __init__(self, config: Optional[Any] = None):
+        """
+        Initialize timer service
+
+        Args:
+            config: Configuration object (uses global if None)
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+
+        self.resolution = max(0.001, self.config.get('timers.resolution', 0.05))
+        self.wheel_size = max(8, self.config.get('timers.wheel_size', 512))
+
+        # Each slot is an insertion-ordered dict used as a set, so a timer
+        # can be unlinked in O(1) when it is re-armed
+        self.slots: List[Dict[Timer, None]] = [{} for _ in range(self.wheel_size)]
+        self.origin = time.monotonic()
+        self.tick = 0
+        self.armed = 0
+
+        self.lock = Lock()
+        self.wake = Event()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+
+        self.fired = 0
+        self.rearms = 0
+        self.max_lateness = 0.0
+        self.callback_errors = 0
+
+    def create(self, name: str, callback: Callable[[], Any]) -> Timer:
+        """
+        Create an unarmed timer
+
+        Args:
+            name: Timer name used in logs
+            callback: Called on the timer thread when the timer fires; must not block
+
+        Returns:
+            Timer handle
+        """
+        return Timer(self, name, callback)
+
+    def schedule(self, name: str, delay: float, callback: Callable[[], Any]) -> Timer:
+        """
+        Create and arm a timer
+
+        Args:
+            name: Timer name used in logs
+            delay: Seconds from now
+            callback: Called on the timer thread when the timer fires
+
+        Returns:
+            Timer handle
+        """
+        timer = self.create(name, callback)
+        self.arm(timer, delay)
+        return timer
+
+    def arm(self, timer: Timer, delay: float):
+        """
+        (Re-)arm timer to fire delay seconds from now
+
+        Args:
+            timer: Timer handle
+            delay: Seconds from now
+        """
+        deadline = time.monotonic() + max(0.0, delay)
+        # Round up so a timer never fires before its deadline
+        expiry_tick = math.ceil((deadline - self.origin) / self.resolution)
+
+        with self.lock:
+            expiry_tick = max(expiry_tick, self.tick + 1)
+            timer.deadline = deadline
+            timer.due_tick = expiry_tick
+            if timer.slot is not None:
+                self.rearms += 1
+                if expiry_tick >= timer.expiry_tick:
+                    # Pushed back (re-armed every frame while someone is
+                    # present): stay in the slot, _collect moves it on later
+                    return
+                del timer.slot[timer]
+                self.armed -= 1
+            self._insert(timer, expiry_tick)
+            self.armed += 1
+
+        self.wake.set()
+
+    def _insert(self, timer: Timer, tick: int):
+        """Put timer into the slot of tick (lock held)"""
+        timer.expiry_tick = tick
+        timer.slot = self.slots[tick % self.wheel_size]
+        timer.slot[timer] = None
+
+    def cancel(self, timer: Timer):
+        """
+        Disarm timer if it is armed
+
+        Args:
+            timer: Timer handle
+        """
+        with self.lock:
+            if timer.slot is not None:
+                del timer.slot[timer]
+                timer.slot = None
+                self.armed -= 1
+
+    def start(self):
+        """Start timer thread"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, name="timers", daemon=True)
+        self.thread.start()
+        self.logger.info(
+            f"Timer service started ({self.wheel_size} slots x {self.resolution * 1000:.0f}ms)"
+        )
+
+    def stop(self):
+        """Stop timer thread; armed timers stay armed"""
+        self.stop_event.set()
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def _run(self):
+        """Advance the wheel every tick, sleeping while nothing is armed"""
+        while not self.stop_event.is_set():
+            if self.armed == 0:
+                self.wake.wait()
+                self.wake.clear()
+                continue
+
+            next_tick_time = self.origin + (self.tick + 1) * self.resolution
+            delay = next_tick_time - time.monotonic()
+            if delay > 0:
+                self.stop_event.wait(delay)
+            self.advance()
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Fire every timer whose tick has passed
+
+        Args:
+            now: Monotonic time to advance to (uses time.monotonic() if None)
+
+        Returns:
+            Number of timers fired
+        """
+        if now is None:
+            now = time.monotonic()
+        target = int((now - self.origin) / self.resolution)
+
+        due: List[Timer] = []
+        with self.lock:
+            if target - self.tick >= self.wheel_size:
+                # Fell more than a revolution behind; sweep every slot once
+                for slot in self.slots:
+                    self._collect(slot, target, due)
+                self.tick = target
+            while self.tick < target:
+                self.tick += 1
+                slot = self.slots[self.tick % self.wheel_size]
+                if slot:
+                    self._collect(slot, self.tick, due)
+
+        for timer in due:
+            self.max_lateness = max(self.max_lateness, now - timer.deadline)
+            try:
+                timer.callback()
+            except Exception as e:
+                self.callback_errors += 1
+                self.logger.error(f"Timer '{timer.name}' callback failed: {e}")
+
+        self.fired += len(due)
+        return len(due)
+
+    def _collect(self, slot: Dict[Timer, None], tick: int, due: List[Timer]):
+        """Move timers in slot that expire by tick into due (lock held)"""
+        expired = [timer for timer in slot if timer.expiry_tick <= tick]
+        for timer in expired:
+            del slot[timer]
+            if timer.due_tick > tick:
+                # Re-armed later since it was slotted
+                self._insert(timer, timer.due_tick)
+                continue
+            timer.slot = None
+            due.append(timer)
+            self.armed -= 1
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get timer service statistics"""
+        return {
+            'armed': self.armed,
+            'fired': self.fired,
+            'rearms': self.rearms,
+            'callback_errors': self.callback_errors,
+            'max_lateness_ms': round(self.max_lateness * 1000, 1),
+            'resolution_ms': round(self.resolution * 1000, 1)
+        }
@@ -0,0 +1,195 @@
+"""
+Stall watchdog module
+Tracks per-thread heartbeats and frame progress, and triggers in-place
+recovery when a component stops making progress
+"""
+
+import time
+from dataclasses import dataclass
+from threading import Thread, Lock, Event
+from typing import Any, Callable, Dict, Optional
+
+from ..core.config import get_config
+from ..utils.logger import get_logger
+
+
+@dataclass
+class WatchedComponent:
+    """A component supervised by the watchdog"""
+    name: str
+    timeout: float
+    recover: Callable[[], bool]
+    progress: Optional[Callable[[], int]] = None
+    last_beat: float = 0.0
+    last_progress: Optional[int] = None
+    active: bool = True
+    stalls: int = 0
+    recoveries: int = 0
+    failed_recoveries: int = 0
+
+
+class Watchdog:
+    """Detects stalled threads and runs their recovery callbacks"""
+
+    def __init__(self, config: Optional[Any] = None, stats: Optional[Any] = None):
+        """
+        Initialize watchdog
+
+        Args:
+            config: Configuration object (uses global if None)
+            stats: StatisticsManager used to count recoveries
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+        self.stats = stats
+
+        self.enabled = self.config.get('watchdog.enabled', True)
+        self.check_interval = self.config.get('watchdog.check_interval', 1.0)
+
+        self.components: Dict[str, WatchedComponent] = {}
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+
+    def register(
+        self,
+        name: str,
+        timeout: float,
+        recover: Callable[[], bool],
+        progress: Optional[Callable[[], int]] = None
+    ):
+        """
+        Supervise a component
+
+        Args:
+            name: Component name
+            timeout: Seconds without heartbeat or progress before a stall
+            recover: Callback that restores the component, returns success
+            progress: Optional counter that must keep increasing (e.g. frame sequence)
+        """
+        with self.lock:
+            self.components[name] = WatchedComponent(
+                name=name,
+                timeout=timeout,
+                recover=recover,
+                progress=progress,
+                last_beat=time.monotonic()
+            )
+
+    def beat(self, name: str):
+        """
+        Record a heartbeat from a component's thread
+
+        Args:
+            name: Component name
+        """
+        component = self.components.get(name)
+        if component is not None:
+            component.last_beat = time.monotonic()
+
+    def set_active(self, name: str, active: bool):
+        """
+        Pause or resume supervision of a component (e.g. camera released on purpose)
+
+        Args:
+            name: Component name
+            active: Whether stalls should be detected
+        """
+        with self.lock:
+            component = self.components.get(name)
+            if component is not None:
+                component.active = active
+                component.last_beat = time.monotonic()
+                component.last_progress = None
+
+    def start(self):
+        """Start watchdog thread"""
+        if not self.enabled or (self.thread and self.thread.is_alive()):
+            return
+
+        self.stop_event.clear()
+        now = time.monotonic()
+        with self.lock:
+            for component in self.components.values():
+                component.last_beat = now
+                component.last_progress = None
+
+        self.thread = Thread(target=self._watch_loop, name="watchdog", daemon=True)
+        self.thread.start()
+        self.logger.info(f"Watchdog started ({len(self.components)} components)")
+
+    def stop(self):
+        """Stop watchdog thread"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def _watch_loop(self):
+        """Periodically check every component"""
+        while not self.stop_event.wait(self.check_interval):
+            with self.lock:
+                components = list(self.components.values())
+
+            for component in components:
+                if component.active:
+                    self._check(component)
+
+    def _check(self, component: WatchedComponent):
+        """Check one component and recover it if stalled"""
+        now = time.monotonic()
+
+        if component.progress is not None:
+            try:
+                current = component.progress()
+            except Exception:
+                current = None
+
+            if current != component.last_progress:
+                component.last_progress = current
+                component.last_beat = now
+
+        idle = now - component.last_beat
+        if idle < component.timeout:
+            return
+
+        component.stalls += 1
+        self.logger.error(
+            f"Watchdog: '{component.name}' stalled for {idle:.1f}s, recovering in place"
+        )
+
+        try:
+            success = bool(component.recover())
+        except Exception as e:
+            self.logger.error(f"Watchdog: recovery of '{component.name}' raised: {e}")
+            success = False
+
+        if success:
+            component.recoveries += 1
+            self.logger.info(f"Watchdog: '{component.name}' recovered")
+        else:
+            component.failed_recoveries += 1
+            self.logger.error(f"Watchdog: recovery of '{component.name}' failed, will retry")
+
+        if self.stats is not None:
+            self.stats.record_recovery(component.name, success)
+
+        # Give the recovered component a full timeout before judging it again
+        component.last_beat = time.monotonic()
+        component.last_progress = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get watchdog status"""
+        now = time.monotonic()
+        with self.lock:
+            return {
+                name: {
+                    'active': c.active,
+                    'seconds_since_progress': round(now - c.last_beat, 2),
+                    'timeout': c.timeout,
+                    'stalls': c.stalls,
+                    'recoveries': c.recoveries,
+                    'failed_recoveries': c.failed_recoveries
+                }
+                for name, c in self.components.items()
+            }
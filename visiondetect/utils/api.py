@@ -4,12 +4,16 @@ Provides REST endpoints to query system status and statistics
 """
 
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import math
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 from typing import Optional
 import threading
 
 from ..utils.logger import get_logger
+from ..utils.metrics import MetricsExporter, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from ..utils.profiler import ProfilerBusy
 
 
 class APIHandler(BaseHTTPRequestHandler):
@@ -18,10 +22,13 @@ class APIHandler(BaseHTTPRequestHandler):
     # Reference to orchestrator (set by APIServer)
     orchestrator = None
     
+    # Shared metrics page cache (set by APIServer)
+    metrics = None
+    
     def log_message(self, format, *args):
         """Override to use our logger"""
         logger = get_logger()
-        logger.debug(f"{self.address_string()} - {format % args}")
+        logger.debug("%s - " + format, self.address_string(), *args)
     
     def _set_headers(self, status=200, content_type='application/json'):
         """Set response headers"""
@@ -58,6 +65,8 @@ class APIHandler(BaseHTTPRequestHandler):
         try:
             if path == '/' or path == '/api':
                 self._handle_root()
+            elif path == '/metrics':
+                self._handle_metrics()
             elif path == '/api/status':
                 self._handle_status()
             elif path == '/api/statistics':
@@ -66,6 +75,22 @@ class APIHandler(BaseHTTPRequestHandler):
                 self._handle_health()
             elif path == '/api/light':
                 self._handle_light_get()
+            elif path == '/api/wol':
+                self._handle_wol_get()
+            elif path == '/api/spans':
+                self._handle_spans()
+            elif path == '/api/history':
+                self._handle_history(parse_qs(parsed_path.query))
+            elif path == '/api/occupancy':
+                self._handle_occupancy(parse_qs(parsed_path.query))
+            elif path == '/api/profile':
+                self._handle_profile(parse_qs(parsed_path.query))
+            elif path == '/api/memory':
+                self._handle_memory_get()
+            elif path == '/api/memory/top':
+                self._handle_memory_top(parse_qs(parsed_path.query))
+            elif path == '/api/gpio':
+                self._handle_gpio_get(parse_qs(parsed_path.query))
             else:
                 self._send_error("Endpoint not found", 404)
         
@@ -97,6 +122,8 @@ class APIHandler(BaseHTTPRequestHandler):
                 self._handle_light_post(data)
             elif path == '/api/wol':
                 self._handle_wol_post(data)
+            elif path == '/api/memory':
+                self._handle_memory_post(data)
             else:
                 self._send_error("Endpoint not found", 404)
         
@@ -117,13 +144,36 @@ class APIHandler(BaseHTTPRequestHandler):
                 'GET /api/status': 'System status',
                 'GET /api/statistics': 'Statistics and metrics',
                 'GET /api/health': 'Health check',
+                'GET /metrics': 'OpenMetrics/Prometheus scrape page',
                 'GET /api/light': 'Get light state',
+                'GET /api/spans': 'Per-stage timing histograms (p50/p90/p99/max ms)',
+                'GET /api/history': 'Stored metric history (query: metric, start, end, resolution)',
+                'GET /api/occupancy': 'Hour-of-week occupancy heatmap and sessions (query: zone)',
+                'GET /api/profile': 'Sample thread stacks (query: seconds, rate, threads, format=collapsed|json)',
+                'GET /api/memory': 'RSS, Python heap and tracemalloc state',
+                'GET /api/memory/top': 'Allocation sites grown since the baseline (query: top, key=lineno|filename|traceback)',
+                'POST /api/memory': 'Control tracemalloc (body: {"tracing": true/false, "baseline": true, "frames": N})',
+                'GET /api/gpio': 'GPIO backend and recorded pin writes (query: pin, limit)',
                 'POST /api/light': 'Control light (body: {"state": true/false})',
-                'POST /api/wol': 'Trigger Wake-on-LAN'
+                'GET /api/wol': 'Wake-on-LAN targets and per-target cooldowns',
+                'POST /api/wol': 'Trigger Wake-on-LAN (body: {"targets": [names]}, default all)'
             }
         }
         self._send_json(info)
     
+    def _handle_metrics(self):
+        """Handle OpenMetrics scrape endpoint"""
+        if self.metrics is None:
+            self._send_error("Metrics not available", 503)
+            return
+        
+        page = self.metrics.get_page()
+        self.send_response(200)
+        self.send_header('Content-Type', METRICS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(page)))
+        self.end_headers()
+        self.wfile.write(page)
+    
     def _handle_status(self):
         """Handle status endpoint"""
         status = self.orchestrator.get_status()
@@ -172,10 +222,41 @@ class APIHandler(BaseHTTPRequestHandler):
             'data': {
                 'light_on': state,
                 'person_present': self.orchestrator.light_scheduler.person_present,
-                'time_until_off': self.orchestrator.light_scheduler.get_time_until_off()
+                'time_until_off': self.orchestrator.light_scheduler.get_time_until_off(),
+                'writer': self.orchestrator.light_controller.get_writer_stats(),
+                'transitions': self.orchestrator.light_controller.get_journal()
             }
         })
     
+    def _handle_gpio_get(self, query):
+        """Handle GET GPIO backend state"""
+        backend = self.orchestrator.light_controller.backend
+        if backend is None:
+            self._send_error("GPIO backend not initialized", 503)
+            return
+        
+        data = {'backend': backend.name}
+        
+        # Only the simulator records writes
+        if hasattr(backend, 'get_transitions'):
+            try:
+                pin = int(query['pin'][0]) if 'pin' in query else None
+                limit = int(query.get('limit', ['100'])[0])
+            except ValueError:
+                self._send_error("'pin' and 'limit' must be integers", 400)
+                return
+            if limit <= 0:
+                self._send_error("'limit' must be positive", 400)
+                return
+            data['total_writes'] = backend.count
+            data['levels'] = {str(p): level for p, level in backend.state.items()}
+            data['writes'] = backend.get_transitions(pin, limit)
+        
+        self._send_json({
+            'status': 'ok',
+            'data': data
+        })
+    
     def _handle_light_post(self, data):
         """Handle POST light control"""
         if 'state' not in data:
@@ -183,38 +264,226 @@ class APIHandler(BaseHTTPRequestHandler):
             return
         
         state = bool(data['state'])
-        success = self.orchestrator.light_controller.set_state(state)
+        queued = self.orchestrator.request_light(state)
+        
+        if queued:
+            self._send_json({
+                'status': 'ok',
+                'message': f"Light turn {'on' if state else 'off'} queued",
+                'data': {'light_on': state, 'queued': True}
+            }, 202)
+        else:
+            self._send_error("Light controller not ready", 503)
+    
+    def _handle_spans(self):
+        """Handle per-stage timing endpoint"""
+        self._send_json({
+            'status': 'ok',
+            'data': self.orchestrator.spans.get_status()
+        })
+    
+    def _handle_history(self, query):
+        """Handle statistics history query"""
+        history = self.orchestrator.history
         
-        if success:
+        if 'metric' not in query:
             self._send_json({
                 'status': 'ok',
-                'message': f"Light turned {'on' if state else 'off'}",
-                'data': {'light_on': state}
+                'data': history.get_status()
             })
+            return
+        
+        resolution = query.get('resolution', [None])[0]
+        
+        try:
+            end = float(query.get('end', [time.time()])[0])
+            start = float(query.get('start', [end - 86400])[0])
+            if not (math.isfinite(start) and math.isfinite(end)):
+                raise ValueError("'start' and 'end' must be finite")
+            data = history.query(query['metric'][0], start, end, resolution)
+        except KeyError as e:
+            self._send_error(str(e.args[0]), 404)
+            return
+        except (ValueError, OverflowError) as e:
+            self._send_error(str(e), 400)
+            return
+        
+        self._send_json({
+            'status': 'ok',
+            'data': data
+        })
+    
+    def _handle_occupancy(self, query):
+        """Handle occupancy analytics endpoint"""
+        occupancy = self.orchestrator.occupancy
+        
+        if 'zone' in query:
+            try:
+                data = occupancy.get_zone_status(query['zone'][0])
+            except KeyError as e:
+                self._send_error(str(e.args[0]), 404)
+                return
         else:
-            self._send_error("Failed to control light", 500)
+            data = occupancy.get_status()
+        
+        self._send_json({
+            'status': 'ok',
+            'data': data
+        })
+    
+    def _handle_profile(self, query):
+        """Handle on-demand sampling profile"""
+        try:
+            seconds = float(query.get('seconds', ['10'])[0])
+            rate = float(query['rate'][0]) if 'rate' in query else None
+        except ValueError:
+            self._send_error("'seconds' and 'rate' must be numbers", 400)
+            return
+        if not math.isfinite(seconds):
+            self._send_error("'seconds' must be finite", 400)
+            return
+        if rate is not None and not (math.isfinite(rate) and rate > 0):
+            self._send_error("'rate' must be positive and finite", 400)
+            return
+        threads = query['threads'][0].split(',') if 'threads' in query else None
+        
+        try:
+            result = self.orchestrator.profile(seconds, rate, threads)
+        except KeyError as e:
+            self._send_error(str(e.args[0]), 404)
+            return
+        except ValueError as e:
+            self._send_error(str(e), 400)
+            return
+        except ProfilerBusy as e:
+            self._send_error(str(e), 409)
+            return
+        
+        if query.get('format', ['collapsed'])[0] == 'json':
+            self._send_json({
+                'status': 'ok',
+                'data': result
+            })
+            return
+        
+        # Collapsed stacks feed straight into flamegraph.pl or speedscope
+        self._set_headers(200, 'text/plain; charset=utf-8')
+        self.wfile.write(result['stacks'].encode('utf-8'))
+    
+    def _handle_memory_get(self):
+        """Handle memory statistics endpoint"""
+        self._send_json({
+            'status': 'ok',
+            'data': self.orchestrator.memory.get_status()
+        })
+    
+    def _handle_memory_top(self, query):
+        """Handle tracemalloc diff against the baseline"""
+        try:
+            top = int(query.get('top', ['0'])[0]) or None
+        except ValueError:
+            self._send_error("'top' must be an integer", 400)
+            return
+        if top is not None and top < 0:
+            self._send_error("'top' must be positive", 400)
+            return
+        key = query.get('key', ['lineno'])[0]
+        
+        try:
+            data = self.orchestrator.memory.top_allocations(top, key)
+        except ValueError as e:
+            self._send_error(str(e), 400)
+            return
+        except RuntimeError as e:
+            self._send_error(f"{e}; enable it with POST /api/memory", 409)
+            return
+        
+        self._send_json({
+            'status': 'ok',
+            'data': data
+        })
+    
+    def _handle_memory_post(self, data):
+        """Handle tracemalloc control"""
+        memory = self.orchestrator.memory
+        
+        frames = data.get('frames')
+        if frames is not None and (
+            not isinstance(frames, int) or isinstance(frames, bool) or not 1 <= frames <= 65535
+        ):
+            self._send_error("'frames' must be an integer in 1-65535", 400)
+            return
+        
+        if 'tracing' in data:
+            if data['tracing']:
+                memory.start_tracing(frames)
+            else:
+                memory.stop_tracing()
+        
+        if data.get('baseline'):
+            try:
+                memory.take_baseline()
+            except RuntimeError as e:
+                self._send_error(str(e), 409)
+                return
+        
+        self._send_json({
+            'status': 'ok',
+            'data': memory.get_status()
+        })
+    
+    def _handle_wol_get(self):
+        """Handle GET WOL target status"""
+        self._send_json({
+            'status': 'ok',
+            'data': self.orchestrator.wol_notifier.get_status()
+        })
     
     def _handle_wol_post(self, data):
         """Handle POST WOL trigger"""
-        if self.orchestrator.wol_notifier.can_send():
-            success = self.orchestrator.wol_notifier.notify()
+        wol_notifier = self.orchestrator.wol_notifier
+        
+        targets = data.get('targets')
+        if 'target' in data:
+            targets = [data['target']]
+        
+        if targets is not None and (
+            not isinstance(targets, list) or not targets or
+            not all(isinstance(name, str) for name in targets)
+        ):
+            self._send_error("'targets' must be a non-empty list of target names", 400)
+            return
+        
+        try:
+            selected = wol_notifier.select_targets(targets)
+        except KeyError as e:
+            self._send_error(str(e.args[0]), 404)
+            return
+        
+        if any(target.cooldown_remaining() <= 0 for target in selected):
+            queued = self.orchestrator.request_wol(targets=targets)
             
-            if success:
+            if queued:
                 self._send_json({
                     'status': 'ok',
-                    'message': 'WOL packet sent',
-                    'data': {'sent': True}
-                })
+                    'message': 'WOL packet queued',
+                    'data': {'sent': False, 'queued': True}
+                }, 202)
             else:
-                self._send_error("Failed to send WOL packet", 500)
+                self._send_json({
+                    'status': 'ok',
+                    'message': 'WOL already pending',
+                    'data': {'sent': False, 'queued': False}
+                })
         else:
-            remaining = self.orchestrator.wol_notifier.get_cooldown_remaining()
+            remaining = {target.name: int(target.cooldown_remaining()) for target in selected}
             self._send_json({
                 'status': 'ok',
-                'message': f'WOL in cooldown, {remaining}s remaining',
+                'message': f'WOL in cooldown, {min(remaining.values(), default=0)}s remaining',
                 'data': {
                     'sent': False,
-                    'cooldown_remaining': remaining
+                    'cooldown_remaining': min(remaining.values(), default=0),
+                    'targets': remaining
                 }
             })
 
@@ -248,9 +517,14 @@ class APIServer:
         try:
             # Set orchestrator reference for handler
             APIHandler.orchestrator = self.orchestrator
+            APIHandler.metrics = MetricsExporter(
+                self.orchestrator,
+                self.orchestrator.config.get('performance.metrics_interval', 5.0)
+            )
             
-            # Create server
-            self.server = HTTPServer((self.host, self.port), APIHandler)
+            # Create server; a thread per request so a running profile
+            # doesn't hold up health checks and scrapes
+            self.server = ThreadingHTTPServer((self.host, self.port), APIHandler)
             
             # Start in thread
             self.running = True
@@ -0,0 +1,39 @@
+"""
+Reusable frame buffers
+Preallocated arrays the per-frame path converts into, so the steady state
+allocates nothing new while the frame shape stays the same
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class RGBBuffer:
+    """Contiguous RGB copy of BGR frames, reallocated only when the shape changes"""
+
+    def __init__(self):
+        """Initialize empty buffer"""
+        self.buffer: Optional[np.ndarray] = None
+        self.reallocations = 0
+
+    def convert(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Copy a BGR frame (any strides, e.g. a downscaled view) as RGB
+
+        MediaPipe copies its input into a contiguous image either way; with
+        a reversed-channel view that copy also allocates a temporary array
+        per frame, which converting into this buffer avoids.
+
+        Args:
+            frame: BGR image frame
+
+        Returns:
+            The buffer, overwritten by the next call
+        """
+        shape = frame.shape[:2] + (3,)
+        if self.buffer is None or self.buffer.shape != shape:
+            self.buffer = np.empty(shape, dtype=np.uint8)
+            self.reallocations += 1
+        np.copyto(self.buffer, frame[:, :, ::-1])
+        return self.buffer
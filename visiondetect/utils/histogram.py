@@ -0,0 +1,227 @@
+"""
+Streaming histogram utilities
+Log-bucketed latency histograms with O(1) recording, plus a rolling-window
+variant built from time slices
+"""
+
+import math
+import time
+from typing import Dict, List, Optional, Sequence
+
+
+# Sub-buckets per power of two; relative bucket width is 1/SUB_BUCKETS
+SUB_BUCKETS = 16
+
+# Covers 2^-24 s (~60 ns) to 2^16 s (~18 h); values outside are clamped
+MIN_EXPONENT = -23
+MAX_EXPONENT = 17
+NUM_BUCKETS = (MAX_EXPONENT - MIN_EXPONENT) * SUB_BUCKETS
+
+
+def bucket_index(value: float) -> int:
+    """Bucket holding value (seconds or any positive unit)"""
+    if value <= 0.0:
+        return 0
+    mantissa, exponent = math.frexp(value)
+    if exponent < MIN_EXPONENT:
+        return 0
+    if exponent >= MAX_EXPONENT:
+        return NUM_BUCKETS - 1
+    # mantissa is in [0.5, 1)
+    return (exponent - MIN_EXPONENT) * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Largest value that falls into bucket index"""
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub + 1) / (2 * SUB_BUCKETS), exponent + MIN_EXPONENT)
+
+
+def bucket_midpoint(index: int) -> float:
+    """Middle of bucket index, within 1/(2*SUB_BUCKETS) of any value in it"""
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return math.ldexp(0.5 + (sub + 0.5) / (2 * SUB_BUCKETS), exponent + MIN_EXPONENT)
+
+
+class LogHistogram:
+    """Fixed-memory log-bucketed histogram (percentiles within about 3%)"""
+
+    __slots__ = ('counts', 'count', 'total', 'max', 'min')
+
+    def __init__(self):
+        """Initialize an empty histogram"""
+        self.counts: List[int] = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min = math.inf
+
+    def record(self, value: float):
+        """Add one sample in O(1)"""
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < self.min:
+            self.min = value
+
+    def reset(self):
+        """Forget all samples, zeroing the buckets in place"""
+        counts = self.counts
+        for index in range(NUM_BUCKETS):
+            counts[index] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min = math.inf
+
+    def merge(self, other: 'LogHistogram'):
+        """Add other's samples into this histogram"""
+        if other.count == 0:
+            return
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.min = min(self.min, other.min)
+
+    def copy(self) -> 'LogHistogram':
+        """Independent copy of this histogram"""
+        clone = LogHistogram()
+        clone.merge(self)
+        return clone
+
+    def to_state(self) -> Dict[str, object]:
+        """JSON-serializable state with only the non-empty buckets"""
+        return {
+            'buckets': {str(i): c for i, c in enumerate(self.counts) if c},
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'min': self.min if self.count else None
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'LogHistogram':
+        """Rebuild a histogram saved with to_state()"""
+        histogram = cls()
+        for index, count in state.get('buckets', {}).items():
+            histogram.counts[int(index)] = count
+        histogram.count = state.get('count', 0)
+        histogram.total = state.get('total', 0.0)
+        histogram.max = state.get('max', 0.0)
+        histogram.min = state['min'] if state.get('min') is not None else math.inf
+        return histogram
+
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Samples at or below each bound, to bucket resolution
+
+        Args:
+            bounds: Ascending upper bounds
+
+        Returns:
+            One cumulative count per bound
+        """
+        result = []
+        seen = 0
+        index = 0
+        for bound in bounds:
+            last = bucket_index(bound)
+            while index <= last:
+                seen += self.counts[index]
+                index += 1
+            result.append(seen)
+        return result
+
+    @property
+    def mean(self) -> float:
+        """Mean of recorded samples"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile
+
+        Args:
+            q: Percentile in 0-100
+
+        Returns:
+            Midpoint of the bucket holding the percentile, clamped to min/max
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * q / 100.0))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(max(bucket_midpoint(index), self.min), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1000.0, digits: int = 2) -> Dict[str, float]:
+        """
+        Count, mean, p50/p90/p99 and max
+
+        Args:
+            scale: Multiplier applied to values (1000 turns seconds into ms)
+            digits: Rounding digits
+
+        Returns:
+            Dictionary of summary values
+        """
+        return {
+            'count': self.count,
+            'mean': round(self.mean * scale, digits),
+            'p50': round(self.percentile(50) * scale, digits),
+            'p90': round(self.percentile(90) * scale, digits),
+            'p99': round(self.percentile(99) * scale, digits),
+            'max': round(self.max * scale, digits)
+        }
+
+
+class RollingHistogram:
+    """Histogram over the last window_seconds, kept as a ring of time slices"""
+
+    def __init__(self, window_seconds: float = 60.0, slices: int = 6):
+        """
+        Initialize rolling histogram
+
+        Args:
+            window_seconds: Length of the window
+            slices: Number of slices; the window advances one slice at a time
+        """
+        self.slices = max(1, slices)
+        self.slice_seconds = window_seconds / self.slices
+        self.ring = [LogHistogram() for _ in range(self.slices)]
+        # Absolute slice number each ring entry currently holds
+        self.tags = [-1] * self.slices
+
+    def _slot_number(self, now: float) -> int:
+        """Absolute slice number of a monotonic time"""
+        return int(now / self.slice_seconds)
+
+    def record(self, value: float, now: Optional[float] = None):
+        """Add one sample (O(1); a stale slice is cleared when first reused)"""
+        slot = self._slot_number(time.monotonic() if now is None else now)
+        index = slot % self.slices
+        if self.tags[index] != slot:
+            self.ring[index].reset()
+            self.tags[index] = slot
+        self.ring[index].record(value)
+
+    def snapshot(self, now: Optional[float] = None) -> LogHistogram:
+        """
+        Merge the slices inside the window into one histogram
+
+        Never modifies the ring, so another thread may read while the
+        owning thread records.
+        """
+        slot = self._slot_number(time.monotonic() if now is None else now)
+        merged = LogHistogram()
+        for tag, histogram in zip(self.tags, self.ring):
+            if slot - self.slices < tag <= slot:
+                merged.merge(histogram)
+        return merged
@@ -0,0 +1,381 @@
+"""
+Statistics history module
+Persists periodic metric samples to a SQLite WAL database with incremental
+1-minute, 1-hour and 1-day rollups for fast range queries
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from threading import Thread, Lock, Event
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import get_config
+from .logger import get_logger
+
+
+# Rollup tables and bucket widths in seconds, finest first
+ROLLUPS = (('minute', 60), ('hour', 3600), ('day', 86400))
+
+# DetectionStats counters stored as per-sample deltas
+COUNTERS = {
+    'frames': 'total_frames',
+    'frames_with_person': 'frames_with_person',
+    'gestures': 'gesture_detections',
+    'wol_triggers': 'wol_triggers',
+    'light_on': 'light_on_count',
+    'light_off': 'light_off_count',
+    'errors': 'errors'
+}
+
+# PerformanceMonitor values stored as gauges
+PERFORMANCE_GAUGES = {
+    'capture_fps': 'capture_fps',
+    'processing_fps': 'processing_fps',
+    'processing_ms': 'avg_processing_time_ms',
+    'processing_p99_ms': 'p99_processing_time_ms'
+}
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS metrics ("
+    " id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL, kind TEXT NOT NULL)",
+    # Clustered on (metric, ts) so a range query reads contiguous pages
+    "CREATE TABLE IF NOT EXISTS samples ("
+    " metric INTEGER NOT NULL, ts INTEGER NOT NULL, value REAL NOT NULL,"
+    " PRIMARY KEY (metric, ts)) WITHOUT ROWID"
+] + [
+    f"CREATE TABLE IF NOT EXISTS rollup_{name} ("
+    " metric INTEGER NOT NULL, bucket INTEGER NOT NULL, count INTEGER NOT NULL,"
+    " sum REAL NOT NULL, min REAL NOT NULL, max REAL NOT NULL,"
+    " PRIMARY KEY (metric, bucket)) WITHOUT ROWID"
+    for name, _ in ROLLUPS
+]
+
+
+class HistoryStore:
+    """Background sampler writing statistics into an on-disk time series"""
+
+    def __init__(self, config: Optional[Any] = None, stats: Optional[Any] = None):
+        """
+        Initialize history store
+
+        Args:
+            config: Configuration object (uses global if None)
+            stats: StatisticsManager to sample
+        """
+        self.config = config or get_config()
+        self.logger = get_logger()
+        self.stats = stats
+
+        self.enabled = self.config.get('history.enabled', True)
+        self.path = Path(self.config.get('history.path', 'data/history.db'))
+        self.sample_interval = max(1.0, self.config.get('history.sample_interval', 10.0))
+        self.max_points = self.config.get('history.max_points', 500)
+        self.prune_interval = self.config.get('history.prune_interval', 3600.0)
+        self.retention_days = {
+            'raw': self.config.get('history.retention_days.raw', 7),
+            'minute': self.config.get('history.retention_days.minute', 90),
+            'hour': self.config.get('history.retention_days.hour', 730),
+            'day': self.config.get('history.retention_days.day', None)
+        }
+
+        self.gauges: Dict[str, Callable[[], float]] = {}
+        self.metric_ids: Dict[str, int] = {}
+        self.metric_kinds: Dict[str, str] = {}
+        self.last_counters: Dict[str, int] = {}
+
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = Lock()
+        self.stop_event = Event()
+        self.thread: Optional[Thread] = None
+
+        self.writes = 0
+        self.samples_written = 0
+        self.last_write_ms = 0.0
+        self.last_prune = 0.0
+        self.write_errors = 0
+
+    def add_gauge(self, name: str, read: Callable[[], float]):
+        """
+        Sample an extra gauge every interval
+
+        Args:
+            name: Metric name
+            read: Callable returning the current value
+        """
+        self.gauges[name] = read
+
+    def open(self) -> bool:
+        """
+        Open (or create) the database
+
+        Returns:
+            True if the database is usable
+        """
+        with self.lock:
+            if self.conn is not None:
+                return True
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                # WAL with NORMAL only syncs on checkpoint, sparing the SD card
+                conn.execute("PRAGMA synchronous=NORMAL")
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.commit()
+                self.conn = conn
+                self._load_metrics()
+            except sqlite3.Error as e:
+                self.logger.error(f"Cannot open history database {self.path}: {e}")
+                return False
+
+        self.logger.info(f"History database: {self.path} ({len(self.metric_ids)} metrics)")
+        return True
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def start(self):
+        """Start sampling thread"""
+        if not self.enabled or (self.thread and self.thread.is_alive()):
+            return
+        if not self.open():
+            return
+
+        self.last_counters = self._read_counters()
+        self.stop_event.clear()
+        self.thread = Thread(target=self._sample_loop, name="history", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling thread, writing one last sample"""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=5.0)
+        self.thread = None
+        self.sample()
+        self.close()
+
+    def _sample_loop(self):
+        """Write one sample per interval"""
+        while not self.stop_event.wait(self.sample_interval):
+            self.sample()
+
+    def _read_counters(self) -> Dict[str, int]:
+        """Current DetectionStats counter totals"""
+        if self.stats is None:
+            return {}
+        detection = self.stats.get_detection_stats()
+        return {name: getattr(detection, field) for name, field in COUNTERS.items()}
+
+    def _collect(self) -> List[Tuple[str, str, float]]:
+        """Gather (name, kind, value) of every metric for this sample"""
+        values = []
+        counters = self._read_counters()
+        for name, total in counters.items():
+            # A smaller total means the statistics were reset; count from zero
+            previous = self.last_counters.get(name, 0)
+            values.append((name, 'counter', total - previous if total >= previous else total))
+        self.last_counters = counters
+
+        if self.stats is not None:
+            performance = self.stats.performance.get_stats()
+            for name, key in PERFORMANCE_GAUGES.items():
+                values.append((name, 'gauge', performance[key]))
+
+        for name, read in self.gauges.items():
+            try:
+                values.append((name, 'gauge', float(read())))
+            except Exception as e:
+                self.logger.debug("History gauge '%s' failed: %s", name, e)
+        return values
+
+    def _load_metrics(self):
+        """Read registered metric ids (lock held)"""
+        self.metric_ids = {}
+        self.metric_kinds = {}
+        for metric_id, name, kind in self.conn.execute("SELECT id, name, kind FROM metrics"):
+            self.metric_ids[name] = metric_id
+            self.metric_kinds[name] = kind
+
+    def _metric_id(self, name: str, kind: str) -> int:
+        """Id of a metric, registering it on first use (lock held)"""
+        metric_id = self.metric_ids.get(name)
+        if metric_id is None:
+            cursor = self.conn.execute("INSERT INTO metrics (name, kind) VALUES (?, ?)", (name, kind))
+            metric_id = self.metric_ids[name] = cursor.lastrowid
+            self.metric_kinds[name] = kind
+        return metric_id
+
+    def sample(self, now: Optional[float] = None) -> bool:
+        """
+        Write one sample of every metric and fold it into the rollups
+
+        Args:
+            now: Unix timestamp of the sample (uses current time if None)
+
+        Returns:
+            True if the sample was written
+        """
+        now = time.time() if now is None else now
+        values = self._collect()
+        ts = int(now)
+
+        start = time.perf_counter()
+        with self.lock:
+            if self.conn is None:
+                return False
+            try:
+                with self.conn:
+                    rows = [(self._metric_id(name, kind), kind, value) for name, kind, value in values]
+                    # A second sample in the same second (e.g. from stop()) adds
+                    # its counter delta instead of replacing the first one
+                    self.conn.executemany(
+                        "INSERT INTO samples (metric, ts, value) VALUES (?, ?, ?)"
+                        " ON CONFLICT (metric, ts) DO UPDATE SET value ="
+                        " CASE WHEN ? = 'counter' THEN value + excluded.value ELSE excluded.value END",
+                        [(metric_id, ts, value, kind) for metric_id, kind, value in rows]
+                    )
+                    for table, width in ROLLUPS:
+                        bucket = ts - ts % width
+                        self.conn.executemany(
+                            f"INSERT INTO rollup_{table} (metric, bucket, count, sum, min, max)"
+                            " VALUES (?, ?, 1, ?, ?, ?)"
+                            " ON CONFLICT (metric, bucket) DO UPDATE SET"
+                            " count = count + 1, sum = sum + excluded.sum,"
+                            " min = min(min, excluded.min), max = max(max, excluded.max)",
+                            [(metric_id, bucket, value, value, value) for metric_id, _, value in rows]
+                        )
+                    if now - self.last_prune >= self.prune_interval:
+                        self._prune(now)
+            except sqlite3.Error as e:
+                self.write_errors += 1
+                self.logger.error(f"History write failed: {e}")
+                # Metrics registered in the rolled-back transaction are gone
+                self._load_metrics()
+                return False
+
+            self.writes += 1
+            self.samples_written += len(rows)
+            self.last_write_ms = (time.perf_counter() - start) * 1000
+        return True
+
+    def _prune(self, now: float):
+        """Delete rows older than each table's retention (lock held)"""
+        self.last_prune = now
+        tables = [('samples', 'ts', 'raw')] + [(f'rollup_{name}', 'bucket', name) for name, _ in ROLLUPS]
+        for table, column, retention in tables:
+            days = self.retention_days.get(retention)
+            if not days:
+                continue
+            cutoff = int(now - days * 86400)
+            # Per-metric deletes stay on the primary key instead of scanning the table
+            for metric_id in self.metric_ids.values():
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE metric = ? AND {column} < ?",
+                    (metric_id, cutoff)
+                )
+
+    def choose_resolution(self, start: float, end: float) -> str:
+        """
+        Finest resolution that keeps a range within max_points and retention
+
+        Args:
+            start: Range start (unix seconds)
+            end: Range end (unix seconds)
+
+        Returns:
+            'raw', 'minute', 'hour' or 'day'
+        """
+        span = max(0.0, end - start)
+        age = time.time() - start
+        candidates = [('raw', self.sample_interval)] + list(ROLLUPS)
+        for name, width in candidates:
+            days = self.retention_days.get(name)
+            if days and age > days * 86400:
+                continue
+            if span / width <= self.max_points:
+                return name
+        return 'day'
+
+    def query(
+        self,
+        metric: str,
+        start: float,
+        end: float,
+        resolution: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Read a metric over a time range
+
+        Args:
+            metric: Metric name
+            start: Range start (unix seconds)
+            end: Range end (unix seconds)
+            resolution: 'raw', 'minute', 'hour', 'day' or None to pick automatically
+
+        Returns:
+            Dictionary with kind, resolution and points; raw points are
+            [ts, value], rollup points are [bucket, count, sum, min, max]
+
+        Raises:
+            KeyError: Unknown metric
+            ValueError: Unknown resolution
+        """
+        resolution = resolution or self.choose_resolution(start, end)
+        tables = {name: f'rollup_{name}' for name, _ in ROLLUPS}
+        if resolution != 'raw' and resolution not in tables:
+            raise ValueError(f"Unknown resolution '{resolution}'")
+
+        with self.lock:
+            if self.conn is None:
+                raise KeyError("History database not open")
+            metric_id = self.metric_ids.get(metric)
+            if metric_id is None:
+                raise KeyError(f"Unknown metric '{metric}'")
+
+            if resolution == 'raw':
+                rows = self.conn.execute(
+                    "SELECT ts, value FROM samples WHERE metric = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (metric_id, int(start), int(end))
+                ).fetchall()
+            else:
+                width = dict(ROLLUPS)[resolution]
+                first = int(start) - int(start) % width
+                rows = self.conn.execute(
+                    f"SELECT bucket, count, sum, min, max FROM {tables[resolution]}"
+                    " WHERE metric = ? AND bucket BETWEEN ? AND ? ORDER BY bucket",
+                    (metric_id, first, int(end))
+                ).fetchall()
+
+        return {
+            'metric': metric,
+            'kind': self.metric_kinds[metric],
+            'resolution': resolution,
+            'start': int(start),
+            'end': int(end),
+            'points': [list(row) for row in rows]
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get database and writer status"""
+        size = self.path.stat().st_size if self.path.exists() else 0
+        return {
+            'enabled': self.enabled,
+            'path': str(self.path),
+            'open': self.conn is not None,
+            'size_bytes': size,
+            'sample_interval': self.sample_interval,
+            'writes': self.writes,
+            'samples_written': self.samples_written,
+            'write_errors': self.write_errors,
+            'last_write_ms': round(self.last_write_ms, 2),
+            'retention_days': dict(self.retention_days),
+            'metrics': {name: self.metric_kinds[name] for name in sorted(self.metric_ids)}
+        }
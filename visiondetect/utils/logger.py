@@ -1,24 +1,58 @@
 """
 Logging utility module
-Provides structured logging with file and console output
+Provides structured logging with file and console output; callers format
+and enqueue records, a background listener does the writing
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
+class DroppingQueueHandler(QueueHandler):
+    """Enqueues records without blocking, counting those dropped while the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Initialize handler
+
+        Args:
+            log_queue: Bounded queue read by the listener
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        """Put the record on the queue, or drop it if the queue is full"""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogListener(QueueListener):
+    """Queue listener that drains every queued record before stopping"""
+
+    def enqueue_sentinel(self):
+        """Wait for room instead of failing when the queue is full"""
+        self.queue.put(self._sentinel)
+
+
 class Logger:
-    """Custom logger with file and console handlers"""
+    """Custom logger with file and console handlers fed through a bounded queue"""
     
     def __init__(
         self,
         name: str,
         log_dir: str = "LOG",
         log_level: str = "INFO",
-        console_output: bool = True
+        console_output: bool = True,
+        queue_size: int = 10000
     ):
         """
         Initialize logger
@@ -28,9 +62,12 @@ class Logger:
             log_dir: Directory for log files
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
             console_output: Whether to output to console
+            queue_size: Records buffered for the writer thread; more are dropped
         """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(getattr(logging, log_level.upper()))
+        self.queue_handler: Optional[DroppingQueueHandler] = None
+        self.listener: Optional[LogListener] = None
         
         # Avoid adding handlers multiple times
         if self.logger.handlers:
@@ -53,48 +90,102 @@ class Logger:
         
         # File handler for all logs
         all_log_file = log_path / f"visiondorm_{datetime.now().strftime('%Y%m%d')}.log"
+        handlers: List[logging.Handler] = []
         file_handler = logging.FileHandler(all_log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
-        self.logger.addHandler(file_handler)
+        handlers.append(file_handler)
         
         # File handler for errors only
         error_log_file = log_path / f"visiondorm_error_{datetime.now().strftime('%Y%m%d')}.log"
         error_handler = logging.FileHandler(error_log_file, encoding='utf-8')
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(detailed_formatter)
-        self.logger.addHandler(error_handler)
+        handlers.append(error_handler)
         
         # Console handler
         if console_output:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(simple_formatter)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
+        
+        # Callers only enqueue; file and console I/O (slow on SD cards)
+        # happens on the listener thread
+        log_queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.queue_handler = DroppingQueueHandler(log_queue)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = LogListener(log_queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+    
+    # Messages take %-style args, formatted only if the level is enabled:
+    # logger.debug("Score %.2f", score) costs one level check when DEBUG is off
+    # (checked here, before building the call into logging). stacklevel=2
+    # reports the caller, not this wrapper, as funcName:lineno.
     
-    def debug(self, message: str, **kwargs):
+    def debug(self, message: str, *args, **kwargs):
         """Log debug message"""
-        self.logger.debug(message, **kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, stacklevel=2, **kwargs)
     
-    def info(self, message: str, **kwargs):
+    def info(self, message: str, *args, **kwargs):
         """Log info message"""
-        self.logger.info(message, **kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, stacklevel=2, **kwargs)
     
-    def warning(self, message: str, **kwargs):
+    def warning(self, message: str, *args, **kwargs):
         """Log warning message"""
-        self.logger.warning(message, **kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, stacklevel=2, **kwargs)
     
-    def error(self, message: str, **kwargs):
+    def error(self, message: str, *args, **kwargs):
         """Log error message"""
-        self.logger.error(message, **kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, stacklevel=2, **kwargs)
     
-    def critical(self, message: str, **kwargs):
+    def critical(self, message: str, *args, **kwargs):
         """Log critical message"""
-        self.logger.critical(message, **kwargs)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical(message, *args, stacklevel=2, **kwargs)
     
-    def exception(self, message: str, **kwargs):
+    def exception(self, message: str, *args, **kwargs):
         """Log exception with traceback"""
-        self.logger.exception(message, **kwargs)
+        self.logger.exception(message, *args, stacklevel=2, **kwargs)
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Check if messages of a level would be logged
+        
+        Guards building expensive log arguments:
+        ``if logger.is_enabled_for(logging.DEBUG): logger.debug(...)``
+        """
+        return self.logger.isEnabledFor(level)
+    
+    @property
+    def dropped(self) -> int:
+        """Records dropped because the queue was full"""
+        return self.queue_handler.dropped if self.queue_handler is not None else 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, capacity and drop count"""
+        if self.queue_handler is None:
+            return {'queued': 0, 'capacity': 0, 'dropped': 0}
+        log_queue = self.queue_handler.queue
+        return {
+            'queued': log_queue.qsize(),
+            'capacity': log_queue.maxsize,
+            'dropped': self.queue_handler.dropped
+        }
+    
+    def close(self):
+        """Write every queued record and stop the listener thread"""
+        if self.listener is None:
+            return
+        listener, self.listener = self.listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
 
 # Global logger instance
@@ -104,7 +195,8 @@ _logger_instance: Optional[Logger] = None
 def get_logger(
     name: str = "VisionDetect",
     log_dir: str = "LOG",
-    log_level: str = "INFO"
+    log_level: str = "INFO",
+    queue_size: int = 10000
 ) -> Logger:
     """
     Get global logger instance
@@ -113,6 +205,7 @@ def get_logger(
         name: Logger name (only used on first call)
         log_dir: Log directory (only used on first call)
         log_level: Log level (only used on first call)
+        queue_size: Records buffered for the writer thread (only used on first call)
         
     Returns:
         Logger instance
@@ -120,6 +213,6 @@ def get_logger(
     global _logger_instance
     
     if _logger_instance is None:
-        _logger_instance = Logger(name, log_dir, log_level)
+        _logger_instance = Logger(name, log_dir, log_level, queue_size=queue_size)
     
     return _logger_instance
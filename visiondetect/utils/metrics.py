@@ -0,0 +1,254 @@
+"""
+OpenMetrics exporter
+Renders statistics, latency histograms, light state and WOL cooldowns as an
+OpenMetrics text page, cached for one scrape interval
+"""
+
+import math
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence
+
+from .histogram import LogHistogram
+
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BOUNDS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# DetectionStats counters exported as visiondetect_<name>_total
+DETECTION_COUNTERS = {
+    'total_frames': ('frames', 'Frames read by the processing loop'),
+    'frames_with_person': ('frames_with_person', 'Frames with a person detected'),
+    'frames_without_person': ('frames_without_person', 'Frames without a person'),
+    'gesture_detections': ('gesture_detections', 'Gestures detected'),
+    'wol_triggers': ('wol_triggers', 'Wake-on-LAN triggers'),
+    'light_on_count': ('light_on_transitions', 'Light turn-on transitions'),
+    'light_off_count': ('light_off_transitions', 'Light turn-off transitions'),
+    'errors': ('errors', 'Processing errors'),
+    'scheduler_degrades': ('scheduler_degrades', 'Detector scheduler degrade decisions'),
+    'scheduler_recovers': ('scheduler_recovers', 'Detector scheduler recover decisions'),
+    'idle_entries': ('idle_entries', 'Entries into deep idle'),
+    'idle_resumes': ('idle_resumes', 'Resumes from deep idle')
+}
+
+# Per-label DetectionStats counters: stats key -> (metric, label, help)
+LABELED_COUNTERS = {
+    'recoveries': ('recoveries', 'component', 'Successful in-place recoveries'),
+    'failed_recoveries': ('failed_recoveries', 'component', 'Failed in-place recoveries'),
+    'wake_confirmed': ('wake_confirmed', 'target', 'WOL targets that answered after waking'),
+    'wake_timeouts': ('wake_timeouts', 'target', 'WOL targets that did not answer in time')
+}
+
+FRAME_COUNTERS = {
+    'captured': 'Frames captured by the camera',
+    'delivered': 'Frames handed to the processing thread',
+    'processed': 'Frames that ran the full pipeline',
+    'dropped_stale': 'Frames overwritten before processing',
+    'gated': 'Frames skipped by the idle motion gate',
+    'duplicates': 'Frames delivered twice'
+}
+
+
+def format_value(value: float) -> str:
+    """Format a sample value"""
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
+
+
+def escape_label(value: Any) -> str:
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsPage:
+    """Builds an OpenMetrics text page one metric family at a time"""
+
+    def __init__(self, prefix: str = 'visiondetect'):
+        """
+        Initialize page
+
+        Args:
+            prefix: Prefix of every metric name
+        """
+        self.prefix = prefix
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str) -> str:
+        """Write the TYPE and HELP lines of a family and return its full name"""
+        full = f'{self.prefix}_{name}'
+        self.lines.append(f'# TYPE {full} {kind}')
+        self.lines.append(f'# HELP {full} {help_text}')
+        return full
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None):
+        """Write one sample line"""
+        if labels:
+            rendered = ','.join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+            self.lines.append(f'{name}{{{rendered}}} {format_value(value)}')
+        else:
+            self.lines.append(f'{name} {format_value(value)}')
+
+    def counter(self, name: str, help_text: str, value: float):
+        """Write an unlabeled counter family"""
+        full = self.family(name, 'counter', help_text)
+        self.sample(f'{full}_total', value)
+
+    def gauge(self, name: str, help_text: str, value: float):
+        """Write an unlabeled gauge family"""
+        full = self.family(name, 'gauge', help_text)
+        self.sample(full, value)
+
+    def histogram_samples(
+        self,
+        full: str,
+        histogram: LogHistogram,
+        labels: Optional[Dict[str, Any]] = None,
+        bounds: Sequence[float] = LATENCY_BOUNDS
+    ):
+        """Write bucket, count and sum samples of one histogram"""
+        labels = labels or {}
+        for bound, count in zip(bounds, histogram.cumulative_counts(bounds)):
+            self.sample(f'{full}_bucket', count, {**labels, 'le': format_value(float(bound))})
+        self.sample(f'{full}_bucket', histogram.count, {**labels, 'le': '+Inf'})
+        self.sample(f'{full}_count', histogram.count, labels)
+        self.sample(f'{full}_sum', histogram.total, labels)
+
+    def render(self) -> str:
+        """Finish the page"""
+        return '\n'.join(self.lines + ['# EOF']) + '\n'
+
+
+class MetricsExporter:
+    """Serves a rendered metrics page, re-rendered at most once per interval"""
+
+    def __init__(self, orchestrator, interval: float = 5.0):
+        """
+        Initialize exporter
+
+        Args:
+            orchestrator: SmartDormOrchestrator instance
+            interval: Seconds a rendered page is served before re-rendering
+        """
+        self.orchestrator = orchestrator
+        self.interval = interval
+
+        self.lock = Lock()
+        self.page = b''
+        self.rendered_at = -math.inf
+        self.renders = 0
+        self.scrapes = 0
+        self.render_seconds = 0.0
+
+    def get_page(self) -> bytes:
+        """
+        Get the current page
+
+        Concurrent scrapers wait on the lock for the one render in flight
+        instead of rendering again.
+
+        Returns:
+            Encoded OpenMetrics text
+        """
+        with self.lock:
+            self.scrapes += 1
+            now = time.monotonic()
+            if now - self.rendered_at >= self.interval:
+                start = time.perf_counter()
+                self.page = self.render().encode('utf-8')
+                self.render_seconds = time.perf_counter() - start
+                self.rendered_at = now
+                self.renders += 1
+            return self.page
+
+    def render(self) -> str:
+        """Render a fresh page from the orchestrator"""
+        page = MetricsPage()
+        self._render_statistics(page)
+        self._render_histograms(page)
+        self._render_lights(page)
+        self._render_wol(page)
+
+        page.counter('metrics_renders', 'Metrics page renders', self.renders + 1)
+        page.counter('metrics_scrapes', 'Metrics page requests', self.scrapes)
+        page.gauge('metrics_render_seconds', 'Duration of the previous render', self.render_seconds)
+        return page.render()
+
+    def _render_statistics(self, page: MetricsPage):
+        """DetectionStats and frame accounting counters"""
+        stats = self.orchestrator.stats
+        detection = stats.get_detection_stats().to_dict()
+        frames = stats.get_frames().to_dict()
+
+        page.gauge('uptime_seconds', 'Seconds since statistics started', detection['uptime_seconds'])
+        memory = stats.get_memory()
+        page.gauge('resident_memory_bytes', 'Process resident set size', memory.rss_bytes)
+        page.gauge('python_allocated_blocks', 'Python heap blocks currently allocated', memory.python_blocks)
+        page.gauge('running', 'Processing loop is running', bool(self.orchestrator.running))
+        page.counter('log_records_dropped', 'Log records dropped because the log queue was full',
+                     self.orchestrator.logger.dropped)
+
+        for key, (name, help_text) in DETECTION_COUNTERS.items():
+            page.counter(name, help_text, detection[key])
+
+        for key, (name, label, help_text) in LABELED_COUNTERS.items():
+            full = page.family(name, 'counter', help_text)
+            for value, count in sorted(detection[key].items()):
+                page.sample(f'{full}_total', count, {label: value})
+
+        full = page.family('pipeline_frames', 'counter', 'Frame accounting between capture and processing')
+        for key, help_text in FRAME_COUNTERS.items():
+            page.sample(f'{full}_total', frames[key], {'outcome': key})
+
+    def _render_histograms(self, page: MetricsPage):
+        """Frame latency and per-stage span histograms"""
+        histograms = self.orchestrator.stats.performance.get_histograms()
+        full = page.family('frame_seconds', 'histogram', 'Capture and processing time per frame')
+        for phase, histogram in histograms.items():
+            page.histogram_samples(full, histogram, {'phase': phase})
+
+        stages = self.orchestrator.spans.snapshot()
+        full = page.family('stage_seconds', 'histogram', 'Pipeline stage durations from timing spans')
+        for stage, histogram in stages.items():
+            page.histogram_samples(full, histogram, {'stage': stage})
+
+    def _render_lights(self, page: MetricsPage):
+        """Per-zone light state"""
+        zones = self.orchestrator.light_zones.zones
+        families = (
+            ('light_on', 'Light is on', lambda zone: zone.controller.get_state()),
+            ('light_brightness', 'Brightness used while on (0-1)', lambda zone: zone.controller.brightness),
+            ('person_present', 'Person present in the zone', lambda zone: zone.present),
+            ('light_off_in_seconds', 'Seconds until the light turns off',
+             lambda zone: zone.scheduler.get_time_until_off())
+        )
+        for name, help_text, read in families:
+            full = page.family(name, 'gauge', help_text)
+            for zone in zones:
+                page.sample(full, read(zone), {'zone': zone.name})
+
+    def _render_wol(self, page: MetricsPage):
+        """Per-target Wake-on-LAN cooldowns and send counts"""
+        targets = list(self.orchestrator.wol_notifier.targets.values())
+        families = (
+            ('wol_cooldown_remaining_seconds', 'gauge', 'Seconds until the target can be woken again',
+             lambda target: max(0.0, target.cooldown_remaining())),
+            ('wol_sends', 'counter', 'Magic packets sent', lambda target: target.sends),
+            ('wol_failures', 'counter', 'Failed magic packet sends', lambda target: target.failures)
+        )
+        for name, kind, help_text, read in families:
+            full = page.family(name, kind, help_text)
+            sample_name = f'{full}_total' if kind == 'counter' else full
+            for target in targets:
+                page.sample(sample_name, read(target), {'target': target.name})
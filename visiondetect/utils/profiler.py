@@ -0,0 +1,159 @@
+"""
+Sampling profiler module
+In-process stack sampler built on sys._current_frames that records
+collapsed stacks of selected threads for flame graphs; nothing runs
+between profiles
+"""
+
+import math
+import os
+import sys
+import time
+from collections import Counter
+from threading import Lock, Thread
+from typing import Any, Dict, Optional
+
+
+# Faster sampling only measures the sampler itself
+MAX_RATE_HZ = 1000.0
+
+def frame_label(code) -> str:
+    """Label of a code object as 'function (dir/file.py:line)'"""
+    directory, filename = os.path.split(code.co_filename)
+    return f"{code.co_name} ({os.path.basename(directory)}/{filename}:{code.co_firstlineno})"
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+class SamplingProfiler:
+    """Samples the stacks of named threads at a fixed rate for a fixed time"""
+
+    def __init__(self, rate_hz: float = 100.0, max_seconds: float = 60.0):
+        """
+        Initialize profiler
+
+        Args:
+            rate_hz: Default samples per second
+            max_seconds: Longest profile allowed
+        """
+        self.rate_hz = rate_hz
+        self.max_seconds = max_seconds
+        self.lock = Lock()
+        self.runs = 0
+
+    def profile(
+        self,
+        threads: Dict[str, Optional[Thread]],
+        seconds: float,
+        rate_hz: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Sample threads in the calling thread for the given time
+
+        The sampler needs the GIL, so it sees threads where they release it:
+        time inside GIL-releasing native code (inference, camera reads) is
+        attributed to the Python frame that called it.
+
+        Args:
+            threads: Thread objects keyed by the name used as the stack root
+            seconds: Profile duration (capped at max_seconds)
+            rate_hz: Samples per second (uses the default if None, capped at MAX_RATE_HZ)
+
+        Returns:
+            Dictionary with sample counts, sampling cost and collapsed stacks
+
+        Raises:
+            ValueError: seconds or rate_hz is not a finite number, or rate_hz <= 0
+            ProfilerBusy: Another profile is running
+        """
+        rate_hz = self.rate_hz if rate_hz is None else rate_hz
+        if not math.isfinite(seconds):
+            raise ValueError("'seconds' must be a finite number")
+        if not math.isfinite(rate_hz) or rate_hz <= 0:
+            raise ValueError("'rate' must be a positive finite number")
+
+        if not self.lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running")
+
+        try:
+            return self._run(
+                threads,
+                min(max(seconds, 0.0), self.max_seconds),
+                min(rate_hz, MAX_RATE_HZ)
+            )
+        finally:
+            self.lock.release()
+
+    def _run(self, threads: Dict[str, Optional[Thread]], seconds: float, rate_hz: float) -> Dict[str, Any]:
+        """Sampling loop"""
+        targets = {
+            thread.ident: name
+            for name, thread in threads.items()
+            if thread is not None and thread.ident is not None and thread.is_alive()
+        }
+        interval = 1.0 / rate_hz
+        stacks: Counter = Counter()
+        per_thread: Counter = Counter()
+        labels: Dict[Any, str] = {}
+        ticks = 0
+        missed = 0
+        sampling_time = 0.0
+
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while next_tick < deadline and targets:
+            sample_start = time.perf_counter()
+            frames = sys._current_frames()
+            for ident, name in targets.items():
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = frame_label(code)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(name)
+                stacks[tuple(reversed(stack))] += 1
+                per_thread[name] += 1
+            # Drop our references so sampled frames can be freed
+            del frames
+            ticks += 1
+            sampling_time += time.perf_counter() - sample_start
+
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind; skip the ticks we missed instead of bursting
+                skipped = int(-delay / interval)
+                missed += skipped
+                next_tick += skipped * interval
+
+        self.runs += 1
+        elapsed = time.perf_counter() - start
+        return {
+            'seconds': round(elapsed, 3),
+            'rate_hz': rate_hz,
+            'ticks': ticks,
+            'missed_ticks': missed,
+            'threads': {name: per_thread.get(name, 0) for name in threads},
+            'sample_cost_us': round(sampling_time / ticks * 1e6, 1) if ticks else 0.0,
+            'stacks': self.collapse(stacks)
+        }
+
+    @staticmethod
+    def collapse(stacks: Counter) -> str:
+        """Render stacks as collapsed lines ('root;outer;inner count'), most frequent first"""
+        return ''.join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in sorted(stacks.items(), key=lambda item: (-item[1], item[0]))
+        )
+
@@ -0,0 +1,47 @@
+"""
+Per-thread shard utilities
+Give every writing thread its own counters or histograms so the hot path
+updates them without locks; readers aggregate all shards on demand
+"""
+
+import threading
+from typing import Any, Callable, List
+
+
+class ThreadShards:
+    """One shard per writing thread, created by factory on first use"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Initialize shard set
+
+        Args:
+            factory: Builds an empty shard
+        """
+        self.factory = factory
+        self.local = threading.local()
+        self.shards: List[Any] = []
+        # Only taken when a thread writes for the first time and by readers
+        self.lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Shard of the calling thread; only this thread may write to it"""
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.factory()
+            with self.lock:
+                self.shards.append(shard)
+            self.local.shard = shard
+            return shard
+
+    def all(self) -> List[Any]:
+        """Every shard, for aggregation; values may be a write behind"""
+        with self.lock:
+            return list(self.shards)
+
+    def reset(self):
+        """Drop every shard; threads get fresh ones on their next write"""
+        with self.lock:
+            self.shards = []
+            self.local = threading.local()
@@ -0,0 +1,204 @@
+"""
+Timing span utilities
+Context manager and decorator that time pipeline stages into per-stage
+latency histograms, costing one attribute check when disabled
+"""
+
+import functools
+import time
+from typing import Any, Callable, Dict
+
+from .histogram import LogHistogram, RollingHistogram
+from .shards import ThreadShards
+
+
+class _NullSpan:
+    """Span returned while recording is disabled"""
+
+    __slots__ = ()
+    duration = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times the enclosed block and records it into one stage"""
+
+    __slots__ = ('stage', 'start', 'duration')
+
+    def __init__(self, stage: 'StageTimings'):
+        """
+        Initialize span
+
+        Args:
+            stage: Histograms receiving the duration
+        """
+        self.stage = stage
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duration = time.perf_counter() - self.start
+        self.stage.record(self.duration)
+        return False
+
+
+class StageTimings:
+    """Lifetime and rolling-window histograms of one stage"""
+
+    __slots__ = ('lifetime', 'window', 'span')
+
+    def __init__(self, window_seconds: float):
+        """
+        Initialize stage histograms
+
+        Args:
+            window_seconds: Length of the rolling window
+        """
+        self.lifetime = LogHistogram()
+        self.window = RollingHistogram(window_seconds)
+        # One reusable span per stage and thread; stages do not nest in themselves
+        self.span = Span(self)
+
+    def record(self, duration: float):
+        """Add one duration to both histograms"""
+        self.lifetime.record(duration)
+        self.window.record(duration)
+
+
+class SpanRecorder:
+    """Collects per-stage timing histograms"""
+
+    def __init__(self, enabled: bool = True, window_seconds: float = 60.0):
+        """
+        Initialize span recorder
+
+        Args:
+            enabled: Record spans; when False span() returns a shared no-op
+            window_seconds: Length of the rolling window
+        """
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        # Per-thread {stage name: StageTimings}; recording takes no lock
+        self.shards = ThreadShards(dict)
+
+    def span(self, name: str):
+        """
+        Time a block: ``with spans.span('pose.inference'): ...``
+
+        Args:
+            name: Stage name
+
+        Returns:
+            Context manager exposing .duration after the block, reused by
+            the next span of the same name on this thread
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return self._stage(name).span
+
+    def record(self, name: str, duration: float):
+        """
+        Record an externally measured stage duration
+
+        Args:
+            name: Stage name
+            duration: Seconds
+        """
+        if not self.enabled:
+            return
+        self._stage(name).record(duration)
+
+    def _stage(self, name: str) -> StageTimings:
+        """Calling thread's histograms of a stage, created on first use"""
+        stages = self.shards.get()
+        stage = stages.get(name)
+        if stage is None:
+            stage = stages[name] = StageTimings(self.window_seconds)
+        return stage
+
+    def reset(self):
+        """Forget all stages"""
+        self.shards.reset()
+
+    def _merged(self) -> Dict[str, Any]:
+        """Merge every thread's histograms per stage into (lifetime, window) pairs"""
+        merged: Dict[str, Any] = {}
+        now = time.monotonic()
+        for stages in self.shards.all():
+            # tuple() copies atomically even if the owner adds a stage meanwhile
+            for name, stage in tuple(stages.items()):
+                pair = merged.get(name)
+                if pair is None:
+                    pair = merged[name] = (LogHistogram(), LogHistogram())
+                pair[0].merge(stage.lifetime)
+                pair[1].merge(stage.window.snapshot(now))
+        return dict(sorted(merged.items()))
+
+    def snapshot(self) -> Dict[str, LogHistogram]:
+        """Copy the lifetime histogram of every stage"""
+        return {name: lifetime for name, (lifetime, _) in self._merged().items()}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-stage window and lifetime summaries in milliseconds"""
+        return {
+            name: {
+                'window': window.summary(digits=3),
+                'lifetime': lifetime.summary(digits=3)
+            }
+            for name, (lifetime, window) in self._merged().items()
+        }
+
+
+# Global span recorder instance
+_spans_instance = None
+
+
+def get_spans() -> SpanRecorder:
+    """Get global span recorder instance"""
+    global _spans_instance
+    if _spans_instance is None:
+        _spans_instance = SpanRecorder()
+    return _spans_instance
+
+
+def span(name: str):
+    """Time a block on the global recorder"""
+    return get_spans().span(name)
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator timing every call of a function as stage name
+
+    Args:
+        name: Stage name
+
+    Returns:
+        Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = get_spans()
+            if not recorder.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -4,11 +4,18 @@ Tracks system performance and detection statistics
 """
 
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List
-from collections import deque
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional
 from threading import Lock
 
+from .histogram import LogHistogram, RollingHistogram
+from .shards import ThreadShards
+
+
+# Per-frame counters kept in per-thread shards instead of under the lock
+HOT_DETECTION_COUNTERS = ('total_frames', 'frames_with_person', 'frames_without_person')
+HOT_FRAME_COUNTERS = ('delivered', 'processed', 'dropped_stale', 'gated', 'duplicates')
+
 
 @dataclass
 class DetectionStats:
@@ -21,6 +28,14 @@ class DetectionStats:
     light_on_count: int = 0
     light_off_count: int = 0
     errors: int = 0
+    scheduler_degrades: int = 0
+    scheduler_recovers: int = 0
+    recoveries: Dict[str, int] = field(default_factory=dict)
+    failed_recoveries: Dict[str, int] = field(default_factory=dict)
+    idle_entries: int = 0
+    idle_resumes: int = 0
+    wake_confirmed: Dict[str, int] = field(default_factory=dict)
+    wake_timeouts: Dict[str, int] = field(default_factory=dict)
     start_time: float = field(default_factory=time.time)
     
     @property
@@ -46,24 +61,156 @@ class DetectionStats:
             'light_on_count': self.light_on_count,
             'light_off_count': self.light_off_count,
             'errors': self.errors,
+            'scheduler_degrades': self.scheduler_degrades,
+            'scheduler_recovers': self.scheduler_recovers,
+            'recoveries': dict(self.recoveries),
+            'failed_recoveries': dict(self.failed_recoveries),
+            'idle_entries': self.idle_entries,
+            'idle_resumes': self.idle_resumes,
+            'wake_confirmed': dict(self.wake_confirmed),
+            'wake_timeouts': dict(self.wake_timeouts),
             'uptime_seconds': self.uptime_seconds,
             'person_detection_rate': self.person_detection_rate
         }
 
 
+@dataclass
+class FrameAccounting:
+    """Per-frame accounting between the capture and processing threads"""
+    delivered: int = 0
+    processed: int = 0
+    dropped_stale: int = 0
+    gated: int = 0
+    duplicates: int = 0
+    last_seq: int = 0
+    capture_source: Optional[Callable[[], int]] = None
+    
+    @property
+    def captured(self) -> int:
+        """Frames captured by the camera (read from the capture source)"""
+        if self.capture_source is None:
+            return 0
+        return self.capture_source()
+    
+    def record_delivery(self, counts: Dict[str, int], seq: int, gated: bool = False):
+        """
+        Account for a frame handed to the processing thread
+        
+        Args:
+            counts: Counter shard of the calling thread
+            seq: Capture sequence number of the frame
+            gated: Frame will not run the full pipeline (e.g. idle motion watch)
+        """
+        counts['delivered'] += 1
+        
+        if seq == self.last_seq:
+            counts['duplicates'] += 1
+        elif seq > self.last_seq:
+            # Frames captured in between were overwritten before anyone saw them
+            skipped = seq - self.last_seq - 1
+            if gated:
+                counts['gated'] += skipped
+            else:
+                counts['dropped_stale'] += skipped
+        
+        if gated:
+            counts['gated'] += 1
+        self.last_seq = seq
+    
+    def to_dict(self) -> Dict:
+        """Convert accounting to dictionary"""
+        captured = self.captured
+        return {
+            'captured': captured,
+            'delivered': self.delivered,
+            'processed': self.processed,
+            'dropped_stale': self.dropped_stale,
+            'gated': self.gated,
+            'duplicates': self.duplicates,
+            'processed_ratio': round(self.processed / captured, 3) if captured else 0.0
+        }
+
+
+@dataclass
+class MemoryStats:
+    """Process memory samples"""
+    rss_bytes: int = 0
+    rss_start: int = 0
+    rss_peak: int = 0
+    python_blocks: int = 0
+    traced_bytes: Optional[int] = None
+    samples: int = 0
+    first_sample: float = 0.0
+    last_sample: float = 0.0
+    
+    def record(self, rss_bytes: int, python_blocks: int, traced_bytes: Optional[int], now: float):
+        """Add one sample"""
+        if self.samples == 0:
+            self.rss_start = rss_bytes
+            self.first_sample = now
+        self.rss_bytes = rss_bytes
+        self.rss_peak = max(self.rss_peak, rss_bytes)
+        self.python_blocks = python_blocks
+        self.traced_bytes = traced_bytes
+        self.samples += 1
+        self.last_sample = now
+    
+    @property
+    def rss_growth_per_hour(self) -> float:
+        """Average RSS growth in bytes per hour since the first sample"""
+        hours = (self.last_sample - self.first_sample) / 3600
+        if hours <= 0:
+            return 0.0
+        return (self.rss_bytes - self.rss_start) / hours
+    
+    def to_dict(self) -> Dict:
+        """Convert memory statistics to dictionary"""
+        mib = 1024 * 1024
+        return {
+            'rss_mb': round(self.rss_bytes / mib, 2),
+            'rss_start_mb': round(self.rss_start / mib, 2),
+            'rss_peak_mb': round(self.rss_peak / mib, 2),
+            'rss_growth_mb_per_hour': round(self.rss_growth_per_hour / mib, 3),
+            'python_blocks': self.python_blocks,
+            'traced_mb': round(self.traced_bytes / mib, 2) if self.traced_bytes is not None else None,
+            'samples': self.samples
+        }
+
+
+class PerformanceShard:
+    """Lifetime and rolling-window histograms written by one thread"""
+    
+    __slots__ = ('frame_times', 'processing_times', 'frame_window', 'processing_window')
+    
+    def __init__(self, window_seconds: float, slices: int):
+        """
+        Initialize shard histograms
+        
+        Args:
+            window_seconds: Length of the rolling window
+            slices: Time slices the rolling window advances by
+        """
+        self.frame_times = LogHistogram()
+        self.processing_times = LogHistogram()
+        self.frame_window = RollingHistogram(window_seconds, slices)
+        self.processing_window = RollingHistogram(window_seconds, slices)
+
+
 class PerformanceMonitor:
     """Monitor and track system performance metrics"""
     
-    def __init__(self, window_size: int = 100):
+    def __init__(self, window_seconds: float = 60.0, slices: int = 6):
         """
         Initialize performance monitor
         
         Args:
-            window_size: Number of samples to keep for moving averages
+            window_seconds: Length of the rolling window
+            slices: Time slices the rolling window advances by
         """
-        self.window_size = window_size
-        self.frame_times = deque(maxlen=window_size)
-        self.processing_times = deque(maxlen=window_size)
+        self.window_seconds = window_seconds
+        # Lifetime and rolling-window histograms per metric and writing
+        # thread; O(1) to record and no lock on the hot path
+        self.shards = ThreadShards(lambda: PerformanceShard(window_seconds, slices))
         self.lock = Lock()
         
         self.last_fps_report = time.time()
@@ -71,14 +218,34 @@ class PerformanceMonitor:
     
     def record_frame_time(self, duration: float):
         """Record time taken to capture a frame"""
-        with self.lock:
-            self.frame_times.append(duration)
+        shard = self.shards.get()
+        shard.frame_times.record(duration)
+        shard.frame_window.record(duration)
     
     def record_processing_time(self, duration: float):
         """Record time taken to process a frame"""
-        with self.lock:
-            self.processing_times.append(duration)
-            self.frames_since_report += 1
+        shard = self.shards.get()
+        shard.processing_times.record(duration)
+        shard.processing_window.record(duration)
+        self.frames_since_report += 1
+    
+    def _merge(self, metric: str, window: bool) -> LogHistogram:
+        """
+        Merge one histogram across all writing threads
+        
+        Args:
+            metric: 'processing' or 'capture'
+            window: Merge the rolling window instead of the lifetime histogram
+        """
+        merged = LogHistogram()
+        now = time.monotonic()
+        for shard in self.shards.all():
+            if metric == 'capture':
+                source = shard.frame_window if window else shard.frame_times
+            else:
+                source = shard.processing_window if window else shard.processing_times
+            merged.merge(source.snapshot(now) if window else source)
+        return merged
     
     def get_fps(self, window: str = "capture") -> float:
         """
@@ -88,26 +255,40 @@ class PerformanceMonitor:
             window: 'capture' for capture FPS, 'processing' for processing FPS
             
         Returns:
-            Current FPS
+            Current FPS (inverse of the mean time over the rolling window)
         """
-        with self.lock:
-            times = self.frame_times if window == "capture" else self.processing_times
-            
-            if len(times) < 2:
-                return 0.0
-            
-            avg_time = sum(times) / len(times)
-            if avg_time <= 0:
-                return 0.0
-            
-            return 1.0 / avg_time
+        snapshot = self._merge('capture' if window == "capture" else 'processing', window=True)
+        
+        if snapshot.count < 2 or snapshot.mean <= 0:
+            return 0.0
+        return 1.0 / snapshot.mean
     
     def get_average_processing_time(self) -> float:
-        """Get average processing time in milliseconds"""
-        with self.lock:
-            if not self.processing_times:
-                return 0.0
-            return (sum(self.processing_times) / len(self.processing_times)) * 1000
+        """Get average processing time over the rolling window in milliseconds"""
+        return self._merge('processing', window=True).mean * 1000
+    
+    def get_latency_summary(self, metric: str = 'processing') -> Dict:
+        """
+        Get p50/p90/p99/max of a metric in milliseconds
+        
+        Args:
+            metric: 'processing' or 'capture'
+            
+        Returns:
+            Dictionary with 'window' and 'lifetime' summaries
+        """
+        metric = 'capture' if metric == 'capture' else 'processing'
+        return {
+            'window': self._merge(metric, window=True).summary(),
+            'lifetime': self._merge(metric, window=False).summary()
+        }
+    
+    def get_histograms(self) -> Dict[str, LogHistogram]:
+        """Copy the lifetime capture and processing histograms (seconds)"""
+        return {
+            'capture': self._merge('capture', window=False),
+            'processing': self._merge('processing', window=False)
+        }
     
     def should_report_fps(self, interval: float = 5.0) -> bool:
         """
@@ -129,11 +310,20 @@ class PerformanceMonitor:
     
     def get_stats(self) -> Dict:
         """Get performance statistics"""
+        processing = self.get_latency_summary('processing')
+        processing_fps = (
+            1000.0 / processing['window']['mean']
+            if processing['window']['count'] >= 2 and processing['window']['mean'] > 0 else 0.0
+        )
         return {
             'capture_fps': round(self.get_fps('capture'), 2),
-            'processing_fps': round(self.get_fps('processing'), 2),
-            'avg_processing_time_ms': round(self.get_average_processing_time(), 2),
-            'frames_in_window': len(self.processing_times)
+            'processing_fps': round(processing_fps, 2),
+            'avg_processing_time_ms': processing['window']['mean'],
+            'p99_processing_time_ms': processing['window']['p99'],
+            'frames_in_window': processing['window']['count'],
+            'window_seconds': self.window_seconds,
+            'processing_time_ms': processing,
+            'capture_time_ms': self.get_latency_summary('capture')
         }
 
 
@@ -143,20 +333,42 @@ class StatisticsManager:
     def __init__(self):
         self.detection_stats = DetectionStats()
         self.performance = PerformanceMonitor()
+        self.frames = FrameAccounting()
+        self.memory = MemoryStats()
+        # Guards the rarely updated counters; per-frame ones live in shards
         self.lock = Lock()
+        self.counters = ThreadShards(
+            lambda: dict.fromkeys(HOT_DETECTION_COUNTERS + HOT_FRAME_COUNTERS, 0)
+        )
+    
+    def set_capture_source(self, source: Callable[[], int]):
+        """
+        Set the callable returning the number of captured frames
+        
+        Args:
+            source: Callable returning the camera frame sequence number
+        """
+        self.frames.capture_source = source
+        self.frames.last_seq = source()
+    
+    def record_frame_delivered(self, seq: int, gated: bool = False):
+        """Record a frame handed from capture to processing"""
+        self.frames.record_delivery(self.counters.get(), seq, gated)
+    
+    def record_frame_processed(self):
+        """Record a frame that ran through the full pipeline"""
+        self.counters.get()['processed'] += 1
     
     def increment_total_frames(self):
         """Increment total frame count"""
-        with self.lock:
-            self.detection_stats.total_frames += 1
+        self.counters.get()['total_frames'] += 1
     
     def record_person_detected(self, detected: bool):
         """Record person detection result"""
-        with self.lock:
-            if detected:
-                self.detection_stats.frames_with_person += 1
-            else:
-                self.detection_stats.frames_without_person += 1
+        if detected:
+            self.counters.get()['frames_with_person'] += 1
+        else:
+            self.counters.get()['frames_without_person'] += 1
     
     def record_gesture_detection(self):
         """Record gesture detection"""
@@ -176,19 +388,91 @@ class StatisticsManager:
             else:
                 self.detection_stats.light_off_count += 1
     
+    def record_scheduler_change(self, degraded: bool):
+        """Record detector scheduler degrade or recover decision"""
+        with self.lock:
+            if degraded:
+                self.detection_stats.scheduler_degrades += 1
+            else:
+                self.detection_stats.scheduler_recovers += 1
+    
+    def record_recovery(self, component: str, success: bool = True):
+        """Record an in-place recovery attempt of a stalled component"""
+        with self.lock:
+            counts = (
+                self.detection_stats.recoveries if success
+                else self.detection_stats.failed_recoveries
+            )
+            counts[component] = counts.get(component, 0) + 1
+    
+    def record_wake_confirmation(self, target: str, awake: bool):
+        """Record whether a WOL target answered after being woken"""
+        with self.lock:
+            counts = (
+                self.detection_stats.wake_confirmed if awake
+                else self.detection_stats.wake_timeouts
+            )
+            counts[target] = counts.get(target, 0) + 1
+    
+    def record_idle_transition(self, entered: bool):
+        """Record entering or leaving deep idle"""
+        with self.lock:
+            if entered:
+                self.detection_stats.idle_entries += 1
+            else:
+                self.detection_stats.idle_resumes += 1
+    
+    def record_memory(self, rss_bytes: int, python_blocks: int, traced_bytes: Optional[int] = None):
+        """Record a process memory sample"""
+        with self.lock:
+            self.memory.record(rss_bytes, python_blocks, traced_bytes, time.time())
+    
     def record_error(self):
         """Record error"""
         with self.lock:
             self.detection_stats.errors += 1
     
+    def _counter_totals(self) -> Dict[str, int]:
+        """Sum the per-thread counter shards"""
+        totals = dict.fromkeys(HOT_DETECTION_COUNTERS + HOT_FRAME_COUNTERS, 0)
+        for shard in self.counters.all():
+            for name, value in shard.items():
+                totals[name] += value
+        return totals
+    
+    def get_detection_stats(self) -> DetectionStats:
+        """Get a consistent copy of the detection statistics"""
+        totals = self._counter_totals()
+        with self.lock:
+            stats = self.detection_stats
+            snapshot = replace(
+                stats,
+                recoveries=dict(stats.recoveries),
+                failed_recoveries=dict(stats.failed_recoveries),
+                wake_confirmed=dict(stats.wake_confirmed),
+                wake_timeouts=dict(stats.wake_timeouts),
+                **{name: totals[name] for name in HOT_DETECTION_COUNTERS}
+            )
+        return snapshot
+    
+    def get_frames(self) -> FrameAccounting:
+        """Get a copy of the frame accounting"""
+        totals = self._counter_totals()
+        return replace(self.frames, **{name: totals[name] for name in HOT_FRAME_COUNTERS})
+    
+    def get_memory(self) -> MemoryStats:
+        """Get a copy of the memory statistics"""
+        with self.lock:
+            return replace(self.memory)
+    
     def get_summary(self) -> Dict:
         """Get complete statistics summary"""
-        with self.lock:
-            summary = {
-                'detection': self.detection_stats.to_dict(),
-                'performance': self.performance.get_stats()
-            }
-        return summary
+        return {
+            'detection': self.get_detection_stats().to_dict(),
+            'frames': self.get_frames().to_dict(),
+            'performance': self.performance.get_stats(),
+            'memory': self.get_memory().to_dict()
+        }
 
 
 # Global statistics instance